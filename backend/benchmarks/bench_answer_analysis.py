@@ -0,0 +1,104 @@
+"""
+Benchmark: vectorized answer analysis vs. the per-answer screening loop
+
+Generates synthetic question/answer batches (good answers, short ones,
+junk and echoed questions) and times AnswerAnalyzer.analyze against the
+original per-answer loop from the feedback path, checking that both give
+the same verdicts.
+
+Usage (from backend/):
+    python -m benchmarks.bench_answer_analysis
+    python -m benchmarks.bench_answer_analysis --sizes 5 100 10000 --repeat 50
+"""
+import time
+import random
+import argparse
+import statistics
+from services.answer_analysis import AnswerAnalyzer, AnswerVerdict
+
+QUESTIONS = [
+    "Tell me about a time you had to work with a difficult team member.",
+    "How would you design a caching layer for a high traffic API?",
+    "What is your greatest strength as an engineer?",
+    "How do you prioritize work when deadlines conflict?",
+]
+SENTENCES = [
+    "In my last role I owned the billing service.",
+    "We were missing our latency targets during peak hours.",
+    "I profiled the hot paths and found repeated database lookups.",
+    "Adding a read-through cache cut p95 latency by forty percent.",
+    "I shared the results with the team and wrote a runbook.",
+    "Um, like, I basically just tried to fix it.",
+]
+
+
+def legacy_verdicts(questions, answers):
+    """The screening loop as it was written inline in the feedback path"""
+    verdicts = []
+    for question, answer in zip(questions, answers):
+        answer = answer.lower().strip()
+        question = question.lower().strip()
+        if (answer in ['asdasdasdasd', 'test', 'testing', 'asdf', 'qwerty', '123', 'abc'] or
+            len(answer) < 3 or
+            answer.isdigit() or
+            (len(answer) > 10 and len(question) > 10 and
+             len(set(answer.split()) & set(question.split())) > len(answer.split()) * 0.6)):
+            verdicts.append(AnswerVerdict.NONSENSICAL)
+        elif (len(answer.split()) < 5 or
+              (answer.count('.') == 0 and len(answer.split()) < 20) or
+              answer in ['uh', 'um', 'yes', 'no', 'ok', 'sure'] or
+              (len(answer.split()) < 10 and answer.endswith('for example'))):
+            verdicts.append(AnswerVerdict.POOR)
+        else:
+            verdicts.append(AnswerVerdict.OK)
+    return verdicts
+
+
+def make_batch(size: int, rng: random.Random):
+    questions, answers = [], []
+    for _ in range(size):
+        question = rng.choice(QUESTIONS)
+        kind = rng.random()
+        if kind < 0.7:
+            answer = " ".join(rng.sample(SENTENCES, rng.randint(2, 5)))
+        elif kind < 0.8:
+            answer = rng.choice(["test", "asdf", "123", "ok", "um"])
+        elif kind < 0.9:
+            answer = question
+        else:
+            answer = "I would use caching for example"
+        questions.append(question)
+        answers.append(answer)
+    return questions, answers
+
+
+def time_call(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 200, 2000, 20000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"{'answers':>8} {'loop us':>10} {'vector us':>10} {'speedup':>8} {'verdicts differ':>16}")
+    for size in args.sizes:
+        questions, answers = make_batch(size, rng)
+        loop_us = time_call(lambda: legacy_verdicts(questions, answers), args.repeat)
+        vector_us = time_call(lambda: AnswerAnalyzer.analyze(questions, answers), args.repeat)
+        differ = sum(
+            a != b for a, b in zip(legacy_verdicts(questions, answers), AnswerAnalyzer.analyze(questions, answers).verdicts)
+        )
+        print(f"{size:>8} {loop_us:>10.0f} {vector_us:>10.0f} {loop_us / vector_us:>7.1f}x {differ:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Benchmark: latency and parse failures with model routing off vs. on
+
+Replays a mix of interview traffic (resume extraction, short and long
+question sets, answer scoring, short and long feedback) against the stub
+backend configured with one latency and malformed-output rate per model,
+so each Gemini tier is simulated locally. Every scenario runs once with
+all calls on the default model and once through the router.
+
+Scenarios:
+    tiers      light/standard/strong differ only in latency
+    flaky      the light tier often returns cut-off JSON, so the router
+               should move light call sites up a tier
+    slow       the strong tier runs close to the feedback budget, so the
+               router should move long feedback down a tier
+
+Usage (from backend/):
+    python -m benchmarks.bench_model_router
+    python -m benchmarks.bench_model_router --requests 600 --rate 60 --scenario flaky
+"""
+import io
+import os
+import time
+import random
+import asyncio
+import argparse
+import contextlib
+from collections import defaultdict
+
+LIGHT, STANDARD, STRONG = "gemini-2.0-flash-lite", "gemini-2.0-flash", "gemini-2.5-flash"
+
+# scenario -> (model -> (latency_ms, malformed_rate), feedback budget in seconds)
+SCENARIOS = {
+    "tiers": ({LIGHT: (400, 0.02), STANDARD: (1000, 0.02), STRONG: (2200, 0.01)}, 30.0),
+    "flaky": ({LIGHT: (400, 0.6), STANDARD: (1000, 0.02), STRONG: (2200, 0.01)}, 30.0),
+    "slow": ({LIGHT: (400, 0.02), STANDARD: (1000, 0.02), STRONG: (2600, 0.01)}, 3.0),
+}
+
+FILLER = "Candidate background: built payment APIs in Python and Go, ran Kafka pipelines on Kubernetes. "
+
+
+def question_prompt(n: int, long: bool) -> str:
+    return (f"Request {n}. Generate {8 if long else 5} interview questions. Focus on technical questions "
+            f"appropriate for medium difficulty.\n" + FILLER * (70 if long else 20))
+
+
+def feedback_prompt(n: int, long: bool) -> str:
+    answers = "".join(f"Question {i + 1}: Describe a project.\nAnswer: {FILLER * 6}\n"
+                      for i in range(10 if long else 3))
+    return f"Request {n}. Evaluate this interview.\n{answers}"
+
+
+def resume_prompt(n: int) -> str:
+    return f"Request {n}. Extract fields from this resume for candidate{n}@example.com.\n{FILLER * 8}"
+
+
+def scoring_prompt(n: int) -> str:
+    return f'Request {n}. Score this answer. "question_index": {n % 10}\n{FILLER * 4}'
+
+
+def build_workload(requests: int, rate: float, rng: random.Random):
+    """(arrival offset, label, call site, prompt, container) per request"""
+    # Imported after the environment is set up so module-level config picks it up
+    from services.llm_service import LLMCallSite
+
+    kinds = [
+        ("resume", LLMCallSite.RESUME_ANALYSIS, resume_prompt, '{', 3),
+        ("questions_short", LLMCallSite.QUESTION_GENERATION, lambda n: question_prompt(n, False), '[', 3),
+        ("questions_long", LLMCallSite.QUESTION_GENERATION, lambda n: question_prompt(n, True), '[', 1),
+        ("scoring", LLMCallSite.ANSWER_SCORING, scoring_prompt, '{', 4),
+        ("feedback_short", LLMCallSite.FEEDBACK, lambda n: feedback_prompt(n, False), '{', 1),
+        ("feedback_long", LLMCallSite.FEEDBACK, lambda n: feedback_prompt(n, True), '{', 1),
+    ]
+    weights = [kind[-1] for kind in kinds]
+    workload, t = [], 0.0
+    for n in range(requests):
+        label, call_site, prompt, container, _ = rng.choices(kinds, weights)[0]
+        workload.append((t, label, call_site, prompt(n), container))
+        t += rng.expovariate(rate)
+    return workload
+
+
+def require_value(value):
+    if not value:
+        raise ValueError("Empty JSON value")
+    return value
+
+
+async def run(workload, feedback_budget: float):
+    from services.llm_service import llm_service, LLMCallSite
+
+    latencies, failures = defaultdict(list), defaultdict(int)
+
+    async def one(delay, label, call_site, prompt, container):
+        await asyncio.sleep(delay)
+        timeout = feedback_budget if call_site == LLMCallSite.FEEDBACK else None
+        start = time.perf_counter()
+        try:
+            await llm_service.generate_json(prompt, call_site, container, convert=require_value,
+                                            require_complete=True, timeout=timeout)
+        except Exception:
+            # The app would serve its fallback here
+            failures[label] += 1
+            return
+        latencies[label].append(time.perf_counter() - start)
+
+    await asyncio.gather(*[one(*request) for request in workload])
+    return latencies, failures
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--rate", type=float, default=40.0, help="Mean arrivals per second (Poisson)")
+    parser.add_argument("--scenario", choices=[*SCENARIOS, "all"], default="all")
+    parser.add_argument("--output-ms-per-1k", type=float, default=100, help="Stub latency per 1000 response chars")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ["LLM_PROVIDER"] = "stub"
+    os.environ["LLM_STUB_LATENCY_DISTRIBUTION"] = "lognormal"
+    os.environ["LLM_LOG_CALLS"] = "false"
+    os.environ["PROMPT_LOG_USAGE"] = "false"
+    os.environ["LLM_MAX_CONCURRENCY"] = "64"
+    os.environ["LLM_MODEL_LIGHT"], os.environ["LLM_MODEL_STANDARD"], os.environ["LLM_MODEL_STRONG"] = \
+        LIGHT, STANDARD, STRONG
+
+    # Imported after the environment is set up so module-level config picks it up
+    from services.llm_service import llm_service
+    from services.circuit_breaker import CircuitBreaker
+    from services.llm_providers import StubProvider
+    from services.model_router import ModelRouter
+
+    scenarios = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    print(f"{args.requests} calls per run, ~{args.rate:.0f}/s arrivals, "
+          f"stub + {args.output_ms_per_1k:.0f} ms/1k response chars")
+
+    for scenario in scenarios:
+        tiers, feedback_budget = SCENARIOS[scenario]
+        print()
+        print(f"Scenario '{scenario}': " + ", ".join(
+            f"{model} {latency:.0f} ms/{rate:.0%} malformed" for model, (latency, rate) in tiers.items()
+        ) + f"; feedback budget {feedback_budget:.0f} s")
+        print(f"{'routing':<8} {'call':<16} {'calls':>6} {'p50 ms':>8} {'p95 ms':>8} {'failed':>7}  models")
+
+        for label, enabled in (("off", False), ("on", True)):
+            workload = build_workload(args.requests, args.rate, random.Random(args.seed))
+            llm_service.breaker = CircuitBreaker("llm")
+            llm_service.router = ModelRouter(enabled=enabled, default_model=STANDARD)
+            provider = StubProvider(output_ms_per_1k_chars=args.output_ms_per_1k, seed=args.seed, tiers=tiers)
+            llm_service._provider = provider
+            # The services log every call; keep the benchmark output readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                latencies, failures = asyncio.run(run(workload, feedback_budget))
+
+            routing = llm_service.router.get_stats()
+            for kind in sorted({request[1] for request in workload}):
+                call_site = next(request[2] for request in workload if request[1] == kind)
+                routed = routing['call_sites'].get(call_site, {})
+                models = ", ".join(f"{model.replace('gemini-', '')}:{stats['routed']}"
+                                   for model, stats in sorted(routed.items()) if stats['routed'])
+                samples = latencies[kind]
+                print(f"{label:<8} {kind:<16} {len(samples) + failures[kind]:>6} {percentile(samples, 50):>8.0f} "
+                      f"{percentile(samples, 95):>8.0f} {failures[kind]:>7}  {models or STANDARD}")
+            print(f"{label:<8} {'total':<16} provider calls {provider.calls}, "
+                  f"escalated {routing['escalated']}, de-escalated {routing['deescalated']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark: question index retrieval latency vs. LLM question generation
+
+Builds throwaway indexes of increasing size from synthetic questions and
+measures insert throughput and retrieval latency. If GEMINI_API_KEY is set,
+live generation of the same number of questions is timed for comparison;
+otherwise the --llm-seconds reference value is used.
+
+Usage (from backend/):
+    python -m benchmarks.bench_question_index
+    python -m benchmarks.bench_question_index --sizes 1000 10000 --queries 200
+"""
+import os
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import statistics
+from dotenv import load_dotenv
+from models.interview_settings import InterviewSettings, Question
+from services.question_index import QuestionIndex, QuestionIndexConfig
+
+JOB_TITLES = [
+    "Backend Engineer", "Frontend Developer", "Data Scientist", "DevOps Engineer",
+    "Product Manager", "QA Engineer", "Mobile Developer", "Security Analyst",
+    "Machine Learning Engineer", "Site Reliability Engineer"
+]
+TOPICS = [
+    "caching", "database indexing", "API design", "incident response", "code review",
+    "testing strategy", "CI/CD pipelines", "observability", "data modeling", "scalability",
+    "accessibility", "performance profiling", "threat modeling", "feature flags", "migrations"
+]
+TEMPLATES = [
+    "How would you approach {topic} for a {title} role on a growing product?",
+    "What trade-offs do you consider when making decisions about {topic}?",
+    "Describe how you would troubleshoot a production issue related to {topic}.",
+    "Which tools would you use for {topic} and why?",
+    "How do you explain {topic} decisions to non-technical stakeholders?"
+]
+TYPES = ["Technical", "Behavioral", "Mixed"]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def build_index(directory: str, size: int, rng: random.Random) -> float:
+    """Fill a fresh index with `size` synthetic questions, returning inserts/second"""
+    index = QuestionIndex(directory, QuestionIndexConfig.DIM)
+    batch_size = 50
+    start = time.perf_counter()
+    for batch_start in range(0, size, batch_size):
+        settings = InterviewSettings(
+            job_title=rng.choice(JOB_TITLES),
+            interview_type=rng.choice(TYPES),
+            difficulty=rng.choice(DIFFICULTIES)
+        )
+        questions = [
+            Question(
+                id=i + 1,
+                question=f"{rng.choice(TEMPLATES).format(topic=rng.choice(TOPICS), title=settings.job_title)} (variant {batch_start + i})",
+                question_type=settings.interview_type,
+                difficulty=settings.difficulty
+            )
+            for i in range(min(batch_size, size - batch_start))
+        ]
+        index.add(questions, settings, dedupe=False)
+    return size / (time.perf_counter() - start)
+
+
+def bench_retrieval(directory: str, queries: int, questions_per_set: int, rng: random.Random):
+    """Time retrieve() on a freshly opened (memory-mapped) index"""
+    index = QuestionIndex(directory, QuestionIndexConfig.DIM)
+    len(index)  # Load outside the timed loop
+    latencies, found = [], []
+    for _ in range(queries):
+        settings = InterviewSettings(
+            job_title=rng.choice(JOB_TITLES),
+            job_description=f"Experience with {rng.choice(TOPICS)} and {rng.choice(TOPICS)}",
+            interview_type=rng.choice(TYPES),
+            difficulty=rng.choice(DIFFICULTIES),
+            number_of_questions=questions_per_set
+        )
+        start = time.perf_counter()
+        retrieved = index.retrieve(settings)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found.append(len(retrieved))
+    return latencies, statistics.mean(found)
+
+
+async def time_llm(questions_per_set: int, runs: int):
+    # Imported lazily so the benchmark runs without API access
+    from services.gemini_ai_service import GeminiAIService
+
+    settings = InterviewSettings(job_title="Backend Engineer", interview_type="Technical",
+                                 number_of_questions=questions_per_set)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await GeminiAIService._request_questions(settings)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--questions", type=int, default=5, help="Questions per generated set")
+    parser.add_argument("--llm-runs", type=int, default=3)
+    parser.add_argument("--llm-seconds", type=float, default=4.0,
+                        help="Reference LLM latency used when GEMINI_API_KEY is not set")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    load_dotenv()
+    QuestionIndexConfig.ENABLED = True
+    rng = random.Random(args.seed)
+
+    if os.getenv("GEMINI_API_KEY"):
+        llm_seconds = asyncio.run(time_llm(args.questions, args.llm_runs))
+        llm_label = f"measured median of {args.llm_runs} Gemini calls"
+    else:
+        llm_seconds = args.llm_seconds
+        llm_label = "reference value, GEMINI_API_KEY not set"
+
+    print(f"Vector dim: {QuestionIndexConfig.DIM}, queries per size: {args.queries}")
+    print(f"LLM generation of {args.questions} questions: {llm_seconds * 1000:.0f} ms ({llm_label})")
+    print()
+    print(f"{'size':>8} {'insert/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'found':>6} {'speedup':>9}")
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            insert_rate = build_index(directory, size, rng)
+            latencies, found = bench_retrieval(directory, args.queries, args.questions, rng)
+        p50 = percentile(latencies, 50)
+        print(f"{size:>8} {insert_rate:>10.0f} {p50:>8.2f} {percentile(latencies, 95):>8.2f} "
+              f"{percentile(latencies, 99):>8.2f} {found:>6.1f} {llm_seconds * 1000 / p50:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
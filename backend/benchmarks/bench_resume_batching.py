@@ -0,0 +1,116 @@
+"""
+Benchmark: resume analysis throughput and latency with micro-batching on vs. off
+
+Replays a burst of resume uploads against the stub LLM backend, once with
+every analysis as its own call and once through the micro-batcher. The stub
+adds latency per response character, so batched calls pay for their larger
+output, and a semaphore caps concurrent calls to model the provider's
+concurrency/rate limit, which is what batching actually relieves.
+
+Usage (from backend/):
+    python -m benchmarks.bench_resume_batching
+    python -m benchmarks.bench_resume_batching --requests 200 --rate 40 --max-concurrent-calls 4
+"""
+import io
+import os
+import time
+import random
+import asyncio
+import argparse
+import contextlib
+
+RESUME = """Jordan Example
+jordan{n}@example.com | Toronto, ON
+Senior Software Engineer at Example Corp (2019 - present)
+Led a team of five building payment APIs in Python and Go on Kubernetes.
+Software Engineer at Startup Inc (2016 - 2019)
+Built data pipelines with Kafka and PostgreSQL.
+B.Sc. Computer Science, University of Toronto
+Skills: Python, Go, PostgreSQL, Kafka, Kubernetes, AWS
+"""
+
+
+class LimitedProvider:
+    """Wraps a provider so at most `limit` calls run at once"""
+
+    def __init__(self, inner, limit: int):
+        self.inner = inner
+        self.name = inner.name
+        self._semaphore = asyncio.Semaphore(limit)
+
+    def is_configured(self) -> bool:
+        return True
+
+    async def generate(self, prompt, call_site, model_name, timeout):
+        async with self._semaphore:
+            return await self.inner.generate(prompt, call_site, model_name, timeout)
+
+
+async def run(batcher, requests: int, rate: float, rng: random.Random):
+    async def one(n: int, delay: float):
+        await asyncio.sleep(delay)
+        return await batcher.analyze(RESUME.format(n=n))
+
+    arrivals, t = [], 0.0
+    for _ in range(requests):
+        arrivals.append(t)
+        t += rng.expovariate(rate)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[one(n, delay) for n, delay in enumerate(arrivals)], return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    failures = sum(isinstance(r, Exception) for r in results)
+    return elapsed, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=25.0, help="Mean arrivals per second (Poisson)")
+    parser.add_argument("--latency-ms", type=float, default=1200, help="Stub base latency per call")
+    parser.add_argument("--output-ms-per-1k", type=float, default=400, help="Stub latency per 1000 response chars")
+    parser.add_argument("--max-concurrent-calls", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--wait-ms", type=float, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ["LLM_PROVIDER"] = "stub"
+    os.environ["LLM_STUB_LATENCY_DISTRIBUTION"] = "fixed"
+    os.environ["PROMPT_LOG_USAGE"] = "false"
+    # Measure queueing, not the latency budgets cutting slow calls off
+    os.environ["LLM_TIMEOUT_RESUME"] = os.environ["LLM_TIMEOUT_RESUME_BATCH"] = "600"
+
+    # Imported after the environment is set up so module-level config picks it up
+    from services.llm_service import llm_service
+    from services.circuit_breaker import CircuitBreaker
+    from services.llm_providers import StubProvider
+    from services.resume_batcher import ResumeBatcher
+
+    rows = []
+    for label, enabled in (("off", False), ("on", True)):
+        batcher = ResumeBatcher(enabled=enabled, max_batch_size=args.batch_size, max_wait_ms=args.wait_ms)
+        llm_service.breaker = CircuitBreaker("llm")
+        llm_service._provider = LimitedProvider(
+            StubProvider(latency_ms=args.latency_ms, output_ms_per_1k_chars=args.output_ms_per_1k, seed=args.seed),
+            args.max_concurrent_calls
+        )
+        # The services log every call; keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed, failures = asyncio.run(run(batcher, args.requests, args.rate, random.Random(args.seed)))
+        stats = batcher.get_stats()
+        mode = stats[ResumeBatcher.BATCHED if enabled else ResumeBatcher.DIRECT]
+        rows.append((label, elapsed, failures, stats, mode))
+
+    print(f"{args.requests} resume analyses, ~{args.rate:.0f}/s arrivals, stub {args.latency_ms:.0f} ms "
+          f"+ {args.output_ms_per_1k:.0f} ms/1k chars, {args.max_concurrent_calls} concurrent calls max")
+    print(f"Batch size <= {args.batch_size}, wait <= {args.wait_ms:.0f} ms")
+    print()
+    print(f"{'batching':<9} {'wall s':>7} {'req/s':>7} {'calls':>6} {'avg batch':>10} {'p50 ms':>8} {'p95 ms':>8} {'failed':>7}")
+    for label, elapsed, failures, stats, mode in rows:
+        print(f"{label:<9} {elapsed:>7.2f} {args.requests / elapsed:>7.1f} {stats['llm_calls']:>6} "
+              f"{stats['avg_batch_size'] or 1:>10.1f} {mode['p50_ms']:>8.0f} {mode['p95_ms']:>8.0f} {failures:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: concurrent resume uploads with extraction inline vs. in the process pool
+
+Fires a burst of concurrent uploads (a mix of small and large PDFs and
+DOCX files) at the extraction path, once parsing inline on the event loop
+as the upload route used to, and once through the process pool for each
+worker count. Alongside throughput it measures event-loop lag: how late a
+10 ms ticker wakes up while the uploads are being parsed, which is what
+every other request on the server waits through.
+
+A final run sends an oversized PDF with a small CPU budget to show that
+the worker gives up on it while the other uploads complete.
+
+Usage (from backend/):
+    python -m benchmarks.bench_resume_extraction
+    python -m benchmarks.bench_resume_extraction --uploads 64 --workers 1 2 4 --large-pages 200
+"""
+import io
+import os
+import time
+import asyncio
+import argparse
+import contextlib
+from benchmarks.resume_corpus import make_pdf, make_docx
+from services.resume_extraction import ResumeExtractor, ExtractionTimeoutError
+
+
+def build_uploads(count: int, large_pages: int):
+    small_pdf, large_pdf = make_pdf(2), make_pdf(large_pages)
+    docx = make_docx(80, tables=2)
+    kinds = [("resume.pdf", small_pdf), ("resume.docx", docx), ("resume.pdf", small_pdf), ("long.pdf", large_pdf)]
+    return [kinds[i % len(kinds)] for i in range(count)]
+
+
+async def run(extractor: ResumeExtractor, uploads):
+    lag = {"max": 0.0, "total": 0.0, "ticks": 0}
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            late = time.perf_counter() - start - 0.01
+            lag["max"] = max(lag["max"], late)
+            lag["total"] += late
+            lag["ticks"] += 1
+
+    async def one(content, filename):
+        try:
+            return await extractor.extract(content, filename)
+        except ExtractionTimeoutError:
+            return None
+
+    ticking = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    results = await asyncio.gather(*[one(content, name) for name, content in uploads])
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ticking
+    return elapsed, results, lag
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=32)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, os.cpu_count() or 1}))
+    parser.add_argument("--large-pages", type=int, default=100, help="Pages in the large PDF")
+    parser.add_argument("--pathological-pages", type=int, default=2000,
+                        help="Pages in the PDF sent with a 1 s CPU budget")
+    args = parser.parse_args()
+
+    uploads = build_uploads(args.uploads, args.large_pages)
+    total_mb = sum(len(content) for _, content in uploads) / 1e6
+    print(f"{args.uploads} concurrent uploads ({total_mb:.1f} MB, large PDF {args.large_pages} pages), "
+          f"{os.cpu_count()} CPUs")
+    print()
+    print(f"{'mode':<12} {'wall s':>7} {'docs/s':>7} {'docs/s/core':>12} {'max lag ms':>11} {'avg lag ms':>11}")
+
+    runs = [("inline", ResumeExtractor(enabled=False))]
+    runs += [(f"pool x{n}", ResumeExtractor(enabled=True, workers=n)) for n in args.workers]
+    for label, extractor in runs:
+        extractor.start()
+        # Spawning workers is a startup cost, not a per-upload one
+        asyncio.run(run(extractor, uploads[:extractor.workers]))
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed, results, lag = asyncio.run(run(extractor, uploads))
+        extractor.shutdown()
+        cores = min(extractor.workers, os.cpu_count() or 1) if extractor.enabled else 1
+        avg_lag = lag["total"] / lag["ticks"] * 1000 if lag["ticks"] else 0.0
+        print(f"{label:<12} {elapsed:>7.2f} {len(uploads) / elapsed:>7.1f} {len(uploads) / elapsed / cores:>12.1f} "
+              f"{lag['max'] * 1000:>11.0f} {avg_lag:>11.1f}")
+
+    print()
+    extractor = ResumeExtractor(enabled=True, workers=max(args.workers), cpu_seconds=1)
+    extractor.start()
+    pathological = [("huge.pdf", make_pdf(args.pathological_pages))] + uploads[:8]
+    elapsed, results, lag = asyncio.run(run(extractor, pathological))
+    extractor.shutdown()
+    stats = extractor.get_stats()
+    print(f"{args.pathological_pages}-page PDF with a 1 s CPU budget plus 8 normal uploads: "
+          f"{elapsed:.2f} s, {stats['extracted']} extracted, {stats['cpu_timeouts']} CPU timeouts, "
+          f"{stats['wall_timeouts']} wall-clock timeouts, max lag {lag['max'] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
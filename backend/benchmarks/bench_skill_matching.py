@@ -0,0 +1,128 @@
+"""
+Benchmark: per-document cost of taxonomy skill matching vs. LLM extraction
+
+Scans synthetic resumes of several sizes, together with a job description,
+three ways:
+  - the compiled Aho-Corasick matcher (resume and job description in one pass)
+  - a regex search per taxonomy name, which is what matching without a
+    compiled automaton costs as the taxonomy grows
+  - the LLM resume analysis that used to supply skills and technologies
+
+The LLM runs against the stub backend with a fixed latency by default, so
+its numbers are the simulated round trip; pass --provider gemini (with
+GEMINI_API_KEY set) to time real calls. Prompt tokens are reported as the
+per-document cost the matcher avoids.
+
+Usage (from backend/):
+    python -m benchmarks.bench_skill_matching
+    python -m benchmarks.bench_skill_matching --repeat 20 --latency-ms 2500
+    python -m benchmarks.bench_skill_matching --provider gemini --llm-repeat 3
+"""
+import io
+import os
+import re
+import time
+import asyncio
+import argparse
+import statistics
+import contextlib
+from benchmarks.resume_corpus import resume_lines
+
+JOB_DESCRIPTION = """
+We are hiring a Senior Backend Engineer to build payment services in Python and Go.
+You will design REST APIs and microservices on AWS with Kubernetes and Terraform,
+own PostgreSQL and Redis performance, and run event pipelines on Kafka.
+Experience with CI/CD (GitHub Actions), observability (Prometheus, Grafana) and
+mentoring engineers is a plus. Strong communication and system design skills required.
+"""
+
+
+def regex_matcher(entries):
+    """One compiled pattern per taxonomy name and alias, searched one after another"""
+    patterns = []
+    for name, _, aliases in entries:
+        for alias in [name] + aliases:
+            exact = alias.startswith("=")
+            words = re.split(r"[\s/-]+", alias.lstrip("="))
+            body = r"[\s/-]+".join(re.escape(word) for word in words if word)
+            if body:
+                patterns.append((name, re.compile(rf"(?<![\w.]){body}(?![\w+#])", 0 if exact else re.IGNORECASE)))
+
+    def match(text: str):
+        return list(dict.fromkeys(name for name, pattern in patterns if pattern.search(text)))
+    return match
+
+
+def timed(fn, repeat: int):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, result
+
+
+async def llm_time(request_analysis, text: str, repeat: int):
+    times, analysis = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        analysis = await request_analysis(text)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, analysis
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50, help="Runs per document for the local matchers")
+    parser.add_argument("--llm-repeat", type=int, default=3, help="Runs per document for the LLM")
+    parser.add_argument("--provider", choices=("stub", "gemini"), default="stub")
+    parser.add_argument("--latency-ms", type=float, default=1500, help="Stub latency per call")
+    args = parser.parse_args()
+
+    os.environ["LLM_PROVIDER"] = args.provider
+    os.environ["LLM_STUB_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["LLM_STUB_LATENCY_DISTRIBUTION"] = "fixed"
+    os.environ["LLM_LOG_CALLS"] = "false"
+    os.environ["PROMPT_LOG_USAGE"] = "false"
+
+    # Imported after the environment is set up so module-level config picks it up
+    from config.prompts import AIPrompts
+    from services.llm_service import LLMCallSite
+    from services.resume_service import ResumeService
+    from services.prompt_compiler import prompt_compiler, PromptSection, count_tokens
+    from services.skill_taxonomy import SkillMatcher, parse_taxonomy, SkillTaxonomyConfig
+
+    matcher = SkillMatcher(enabled=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        matcher.load()
+    with open(SkillTaxonomyConfig.PATH, encoding="utf-8") as file:
+        _, entries = parse_taxonomy(file)
+    naive = regex_matcher(entries)
+    stats = matcher.get_stats()
+    print(f"Taxonomy {stats['version']}: {stats['skills']} skills, {stats['patterns']} patterns, "
+          f"compiled in {stats['compile_ms']} ms; LLM provider: {args.provider}"
+          + (f" ({args.latency_ms:.0f} ms simulated)" if args.provider == "stub" else ""))
+    print()
+    print(f"{'resume':<12} {'KB':>5} {'automaton ms':>13} {'regex ms':>9} {'LLM ms':>9} {'LLM tokens':>11} "
+          f"{'skills':>7} {'regex':>6} {'LLM':>5}")
+
+    for lines in (40, 120, 400, 1500):
+        resume = "\n".join(resume_lines(lines, seed=lines))
+        documents = {"resume": resume, "job_description": JOB_DESCRIPTION}
+        matcher_ms, matches = timed(lambda: matcher.match_documents(documents), args.repeat)
+        regex_ms, regex_found = timed(lambda: (naive(resume), naive(JOB_DESCRIPTION))[0], args.repeat)
+        found = matcher.canonical_skills(matches["resume"])
+
+        # The services log every call; keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            llm_ms, analysis = asyncio.run(llm_time(ResumeService._request_analysis, resume, args.llm_repeat))
+        llm_found = (analysis.get("skills") or []) + (analysis.get("technologies") or [])
+        with contextlib.redirect_stdout(io.StringIO()):
+            sections = prompt_compiler.compile(LLMCallSite.RESUME_ANALYSIS, [PromptSection("resume", resume)])
+        prompt_tokens = count_tokens(AIPrompts.RESUME_ANALYSIS.format(resume_text=sections["resume"]))
+        print(f"{lines:>5} lines {len(resume) / 1024:>5.1f} {matcher_ms:>13.3f} {regex_ms:>9.3f} {llm_ms:>9.0f} "
+              f"{prompt_tokens:>11} {len(found):>7} {len(regex_found):>6} {len(llm_found):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: resume text extraction engine vs. the original extractors
+
+Runs every document of the synthetic corpus (small, large and
+pathological PDFs and DOCX files) through the original extraction code
+(string concatenation per page/paragraph, python-docx DOM, tables
+skipped) and the current engine (joined parts, streamed DOCX XML with
+tables), and reports time and characters extracted by each.
+
+Then times the large PDFs through the process pool with page-range
+parallelism off and on, to show what splitting pages across idle
+workers buys on this machine.
+
+Usage (from backend/):
+    python -m benchmarks.bench_text_extraction
+    python -m benchmarks.bench_text_extraction --repeat 5 --workers 4
+"""
+import io
+import os
+import time
+import asyncio
+import argparse
+import statistics
+import PyPDF2
+from docx import Document
+from benchmarks.resume_corpus import corpus
+from services.resume_extraction import ResumeExtractor, extract_text
+
+
+def legacy_extract(file_content: bytes, filename: str) -> str:
+    """The extractors as they were in ResumeService"""
+    if filename.lower().endswith('.pdf'):
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+        text = ""
+        for page in pdf_reader.pages:
+            text += page.extract_text() + "\n"
+        return text.strip()
+    doc = Document(io.BytesIO(file_content))
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text.strip()
+
+
+def timed(fn, repeat: int):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, result
+
+
+async def pool_time(extractor: ResumeExtractor, content: bytes, filename: str, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await extractor.extract(content, filename)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=max(2, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    documents = corpus()
+    print(f"{'document':<32} {'KB':>6} {'legacy ms':>10} {'engine ms':>10} {'speedup':>8} "
+          f"{'legacy chars':>13} {'engine chars':>13}")
+    for name, filename, content in documents:
+        legacy_ms, legacy_text = timed(lambda: legacy_extract(content, filename), args.repeat)
+        engine_ms, engine_text = timed(lambda: extract_text(content, filename), args.repeat)
+        print(f"{name:<32} {len(content) / 1024:>6.0f} {legacy_ms:>10.1f} {engine_ms:>10.1f} "
+              f"{legacy_ms / engine_ms:>7.1f}x {len(legacy_text):>13} {len(engine_text):>13}")
+
+    print()
+    print(f"Page-parallel PDF extraction, {args.workers} workers, {os.cpu_count()} CPUs")
+    print(f"{'document':<32} {'serial ms':>10} {'parallel ms':>12}")
+    serial = ResumeExtractor(enabled=True, workers=args.workers, parallel_min_bytes=1 << 62)
+    parallel = ResumeExtractor(enabled=True, workers=args.workers, parallel_min_bytes=0)
+    for extractor in (serial, parallel):
+        extractor.start()
+    try:
+        for name, filename, content in documents:
+            if not filename.endswith('.pdf') or len(content) < 256 * 1024:
+                continue
+            # First run pays for the workers' imports
+            asyncio.run(pool_time(serial, content, filename, 1))
+            asyncio.run(pool_time(parallel, content, filename, 1))
+            serial_ms = asyncio.run(pool_time(serial, content, filename, args.repeat))
+            parallel_ms = asyncio.run(pool_time(parallel, content, filename, args.repeat))
+            print(f"{name:<32} {serial_ms:>10.1f} {parallel_ms:>12.1f}")
+    finally:
+        serial.shutdown()
+        parallel.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Load test: the interview API against the stub LLM backend
+
+Runs the FastAPI app in-process with LLM_PROVIDER=stub, so no quota is
+spent and no network is needed. Virtual users each generate questions,
+submit answers and request feedback while a probe polls /api/health, which
+shows whether slow LLM calls hold up cheap endpoints.
+
+Usage (from backend/):
+    python -m benchmarks.load_test_llm --users 50 --latency-ms 1500
+    python -m benchmarks.load_test_llm --users 100 --failure-rate 0.1 --distribution uniform
+"""
+import os
+import time
+import random
+import asyncio
+import argparse
+from collections import defaultdict
+
+ANSWER = (
+    "In my last role I led the migration of our billing service to a queue-based design. "
+    "I measured the bottlenecks first, split the work into small releases and cut p95 latency by 40 percent."
+)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+
+async def virtual_user(client, user_id: int, questions: int, timings, errors):
+    async def timed(name, method, url, **kwargs):
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        timings[name].append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            errors[name] += 1
+        return response
+
+    settings = {
+        "job_title": random.choice(["Backend Engineer", "Data Analyst", "Product Manager"]),
+        "interview_type": random.choice(["Technical", "Behavioral", "Mixed"]),
+        "number_of_questions": questions
+    }
+    response = await timed("generate-questions", "POST", "/api/generate-questions",
+                           json={"settings": settings, "skip_cache": user_id % 2 == 0})
+    for question in response.json().get("questions", []):
+        await timed("submit-answer", "POST", "/api/submit-answer",
+                    json={"question": question["question"], "answer": ANSWER})
+    await timed("get-feedback", "GET", "/api/get-feedback")
+
+
+async def health_probe(client, stop: asyncio.Event, timings):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/api/health")
+        timings["health (probe)"].append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.05)
+
+
+async def run(args):
+    # Imported after the environment is set up so module-level config picks it up
+    import httpx
+    from main import app
+    from middleware.rate_limiter import limiter
+
+    limiter.enabled = False
+    timings, errors = defaultdict(list), defaultdict(int)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+        stop = asyncio.Event()
+        probe = asyncio.create_task(health_probe(client, stop, timings))
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(args.users)
+
+        async def limited(user_id):
+            async with semaphore:
+                await virtual_user(client, user_id, args.questions, timings, errors)
+
+        await asyncio.gather(*[limited(i) for i in range(args.sessions or args.users)])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+    return timings, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50, help="Concurrent virtual users")
+    parser.add_argument("--sessions", type=int, default=0, help="Total sessions to run (default: one per user)")
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=1500)
+    parser.add_argument("--distribution", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ["LLM_PROVIDER"] = "stub"
+    os.environ["LLM_STUB_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["LLM_STUB_LATENCY_DISTRIBUTION"] = args.distribution
+    os.environ["LLM_STUB_FAILURE_RATE"] = str(args.failure_rate)
+    os.environ["LLM_STUB_SEED"] = str(args.seed)
+    random.seed(args.seed)
+
+    timings, errors, elapsed = asyncio.run(run(args))
+    sessions = args.sessions or args.users
+
+    print(f"{sessions} sessions, {args.users} concurrent, stub latency {args.latency_ms:.0f} ms "
+          f"({args.distribution}), failure rate {args.failure_rate:.0%}")
+    print(f"Wall time {elapsed:.2f}s, {sessions / elapsed:.1f} sessions/s")
+    print()
+    print(f"{'endpoint':<20} {'count':>6} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, values in timings.items():
+        print(f"{name:<20} {len(values):>6} {errors[name]:>6} {percentile(values, 50):>9.1f} "
+              f"{percentile(values, 95):>9.1f} {percentile(values, 99):>9.1f} {max(values):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
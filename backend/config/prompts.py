@@ -178,6 +178,33 @@ class AIPrompts:
     Be RUTHLESS - if an answer is weak, incomplete, or vague, score it 1-3. Don't be generous!
     """
     
+    # Per-answer scoring prompt (used by the background scoring pipeline)
+    ANSWER_SCORING = """
+    You are an expert interview coach. Score ONE interview answer.
+    
+    Job Position: {job_title} at {company_name}
+    Job Level: {job_level}
+    Interview Type: {interview_type}
+    Difficulty: {difficulty}
+    
+    Question {question_number}: {question}
+    Answer: {answer}
+    
+    Return ONLY a JSON object with this exact format (no other text):
+    {{
+        "question_index": {question_index},
+        "score": 7,
+        "feedback": "One or two sentences on the quality of this answer",
+        "suggestions": ["Specific, actionable suggestion"],
+        "category_scores": {{"communication": 7, "technical": null, "problem_solving": 6, "behavioral": 7}},
+        "strength": {{"title": "Short title", "description": "What the answer did well"}},
+        "weakness": {{"title": "Short title", "description": "What the answer lacked", "suggestion": "How to fix it"}}
+    }}
+    
+    Scores are 1-10. Use null for categories this question does not exercise,
+    and null for strength or weakness if there is nothing meaningful to say.
+    """
+    
     # Resume Analysis Prompts
     RESUME_ANALYSIS = """
     Analyze this resume and extract key information in JSON format. Be thorough and accurate.
@@ -211,6 +238,73 @@ class AIPrompts:
     Be accurate and don't make up information that isn't clearly stated.
     """
     
+    RESUME_ANALYSIS_BATCH = """
+    Analyze each of the following resumes independently and extract key information in JSON format.
+    Be thorough and accurate, and never mix information between resumes.
+    
+    {documents}
+    
+    Return ONLY a JSON object (no other text) with one entry per resume, keyed by its document id:
+    {{
+        "<document id>": {{
+            "name": "Full name of the candidate",
+            "email": "Email address if found",
+            "phone": "Phone number if found",
+            "location": "City, State/Country if found",
+            "summary": "Professional summary or objective (2-3 sentences)",
+            "experience_years": "Total years of professional experience (number)",
+            "current_role": "Current or most recent job title",
+            "current_company": "Current or most recent company",
+            "education": "Highest degree and institution",
+            "skills": ["list", "of", "key", "technical", "skills"],
+            "technologies": ["list", "of", "programming", "languages", "and", "tools"],
+            "industries": ["list", "of", "industries", "worked", "in"],
+            "achievements": ["list", "of", "key", "achievements", "or", "accomplishments"],
+            "certifications": ["list", "of", "certifications", "if", "any"],
+            "languages": ["list", "of", "spoken", "languages", "if", "any"],
+            "experience_level": "entry/mid/senior/executive based on years and roles",
+            "key_strengths": ["list", "of", "main", "professional", "strengths"],
+            "career_progression": "Brief description of career growth and progression"
+        }}
+    }}
+    
+    If information is not available, use null or empty arrays as appropriate.
+    Be accurate and don't make up information that isn't clearly stated.
+    """
+    
+    RESUME_HIGHLIGHTS = """
+    The factual details of this resume have already been extracted:
+    {profile}
+    
+    Resume Text:
+    {resume_text}
+    
+    Write the subjective parts of the candidate's profile and return ONLY a JSON object (no other text):
+    {{
+        "summary": "Professional summary (2-3 sentences)",
+        "key_strengths": ["list", "of", "main", "professional", "strengths"],
+        "career_progression": "Brief description of career growth and progression"
+    }}
+    
+    Base every statement on the resume; don't make up information that isn't clearly stated.
+    """
+    
+    # Continuation of a JSON response that was cut off and could not be repaired
+    JSON_CONTINUATION = """
+    Your response to the request below was cut off before the JSON was complete.
+    
+    <request>
+    {prompt}
+    </request>
+    
+    <partial_response>
+    {partial}
+    </partial_response>
+    
+    Continue the JSON exactly where the partial response stops. Return ONLY the remaining
+    characters: do not repeat any of the partial response, and add no explanation or markdown.
+    """
+    
     # Fallback Questions
     FALLBACK_QUESTIONS = {
         "Technical": [
@@ -1,46 +1,59 @@
-from typing import List, Dict
+import uuid
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from datetime import datetime
 from models.answer import Answer
 from models.interview_settings import InterviewSettings, QuestionGenerationRequest, Question
-from models.feedback import InterviewFeedback, FeedbackItem
+from models.feedback import InterviewFeedback, FeedbackItem, CategoryScores
 from services.gemini_ai_service import GeminiAIService
 from services.resume_service import ResumeService
+from services.answer_scoring import answer_scoring, AnswerScoringConfig
+from services.feedback_speculation import feedback_speculator, FeedbackSpeculationConfig
 
 # Temporary storage
 user_answers: List[dict] = []
 interview_sessions: List[dict] = []
 current_session: dict = {}
 
-def generate_questions(request: QuestionGenerationRequest) -> List[Question]:
+async def _ensure_ai_summary(request: QuestionGenerationRequest) -> None:
+    """Analyze the resume first if we have resume text but no AI summary"""
+    if request.resume_text and not request.settings.ai_summary:
+        print("No AI summary found, analyzing resume...")
+        try:
+            _, ai_summary = await ResumeService.analyze_and_summarize(request.resume_text)
+            request.settings.ai_summary = ai_summary
+            print(f"Resume analysis completed. AI Summary length: {len(ai_summary)}")
+        except Exception as e:
+            print(f"Error analyzing resume: {e}")
+            # Continue without AI summary
+
+def _start_session(settings: InterviewSettings, questions: List[Question]) -> None:
+    """Store the current session for later use"""
+    global current_session
+    answer_scoring.cancel_session(current_session.get("session_id"))
+    feedback_speculator.cancel_session(current_session.get("session_id"))
+    current_session = {
+        "session_id": uuid.uuid4().hex,
+        "settings": settings.dict(),
+        "questions": [q.dict() for q in questions],
+        "start_time": datetime.utcnow().isoformat(),
+        "answers": []
+    }
+
+async def generate_questions(request: QuestionGenerationRequest) -> List[Question]:
     """Generate AI-powered custom interview questions"""
     try:
         print(f"Generating questions with settings: {request.settings.dict()}")
         print(f"Resume text length: {len(request.resume_text) if request.resume_text else 0}")
         print(f"AI Summary: {request.settings.ai_summary[:100] if request.settings.ai_summary else 'None'}...")
         
-        # If we have resume text but no AI summary, analyze the resume first
-        if request.resume_text and not request.settings.ai_summary:
-            print("No AI summary found, analyzing resume...")
-            try:
-                analysis = ResumeService.analyze_resume_with_ai(request.resume_text)
-                ai_summary = ResumeService.generate_resume_summary_for_ai(request.resume_text, analysis)
-                request.settings.ai_summary = ai_summary
-                print(f"Resume analysis completed. AI Summary length: {len(ai_summary)}")
-            except Exception as e:
-                print(f"Error analyzing resume: {e}")
-                # Continue without AI summary
+        await _ensure_ai_summary(request)
         
         # Generate questions using Gemini AI service
-        questions = GeminiAIService.generate_questions(request.settings, request.resume_text)
+        questions = await GeminiAIService.generate_questions(
+            request.settings, request.resume_text, use_cache=not request.skip_cache
+        )
         
-        # Store current session for later use
-        global current_session
-        current_session = {
-            "settings": request.settings.dict(),
-            "questions": [q.dict() for q in questions],
-            "start_time": datetime.utcnow().isoformat(),
-            "answers": []
-        }
+        _start_session(request.settings, questions)
         
         return questions
     except Exception as e:
@@ -48,6 +61,20 @@ def generate_questions(request: QuestionGenerationRequest) -> List[Question]:
         # Fallback to basic questions
         return GeminiAIService._get_fallback_questions(request.settings)
 
+async def stream_questions(request: QuestionGenerationRequest) -> AsyncIterator[Question]:
+    """Generate interview questions, yielding each one as soon as it is ready"""
+    print(f"Streaming questions with settings: {request.settings.dict()}")
+    await _ensure_ai_summary(request)
+    
+    questions = []
+    async for question in GeminiAIService.stream_questions(
+        request.settings, request.resume_text, use_cache=not request.skip_cache
+    ):
+        questions.append(question)
+        yield question
+    
+    _start_session(request.settings, questions)
+
 def submit_answer(answer: Answer):
     """Submit an answer and store it in the current session"""
     answer_data = answer.dict()
@@ -62,11 +89,102 @@ def submit_answer(answer: Answer):
         if "answers" not in current_session:
             current_session["answers"] = []
         current_session["answers"].append(answer_data)
+        
+        # Grade this answer now so get_feedback only has to aggregate
+        if AnswerScoringConfig.ENABLED and current_session.get("session_id"):
+            index = len(current_session["answers"]) - 1
+            questions = current_session.get("questions", [])
+            question_text = questions[index]["question"] if index < len(questions) else answer.question
+            answer_scoring.schedule(
+                current_session["session_id"], index, question_text, answer.answer,
+                InterviewSettings(**current_session.get("settings", {}))
+            )
+        
+        # The user asks for feedback right after the last answer, so start on it now
+        questions = current_session.get("questions", [])
+        if (FeedbackSpeculationConfig.ENABLED and current_session.get("session_id")
+                and questions and len(current_session["answers"]) >= len(questions)):
+            session_id = current_session["session_id"]
+            questions_and_answers = _session_questions_and_answers()
+            settings = InterviewSettings(**current_session.get("settings", {}))
+            feedback_speculator.start(
+                session_id, questions_and_answers, settings,
+                lambda: _generate_feedback(session_id, questions_and_answers, settings)
+            )
     
     print(f"Answer submitted. Total answers in session: {len(current_session.get('answers', []))}")
     return {"message": "Answer submitted successfully.", "total_answers": len(user_answers)}
 
-def get_feedback() -> InterviewFeedback:
+def _no_answers_feedback() -> InterviewFeedback:
+    """Specific feedback for an interview with no answers provided"""
+    return InterviewFeedback(
+        overall_score=2,
+        question_scores=[],
+        category_scores=CategoryScores(communication=2, technical=1, problem_solving=1, behavioral=1),
+        strengths=[
+            FeedbackItem(
+                category="strength",
+                title="Interview Participation",
+                description="You completed the interview process, which shows commitment to the opportunity",
+                suggestion=None
+            )
+        ],
+        weaknesses=[
+            FeedbackItem(
+                category="weakness",
+                title="No Responses Provided",
+                description="You did not provide any answers to the interview questions, making it impossible to assess your qualifications",
+                suggestion="Practice answering interview questions and ensure you provide responses during the actual interview"
+            )
+        ],
+        improvements=[
+            FeedbackItem(
+                category="improvement",
+                title="Complete Interview Responses",
+                description="It's essential to answer all interview questions to demonstrate your knowledge and suitability for the role",
+                suggestion="Prepare answers in advance and practice responding to common interview questions in your field"
+            )
+        ],
+        summary="No interview responses were provided, making it impossible to evaluate your qualifications. Please ensure you answer all questions in future interviews to give employers a chance to assess your fit for the role."
+    )
+
+def _session_questions_and_answers() -> List[Dict]:
+    """Pair each answer in the current session with its question"""
+    questions_and_answers = []
+    questions = current_session.get("questions", [])
+    answers = current_session.get("answers", [])
+    
+    for i, answer in enumerate(answers):
+        question_text = questions[i]["question"] if i < len(questions) else "Unknown question"
+        questions_and_answers.append({
+            "question": question_text,
+            "answer": answer["answer"]
+        })
+    
+    return questions_and_answers
+
+async def _aggregate_scored_feedback(session_id: Optional[str], questions_and_answers: List[Dict], settings: InterviewSettings) -> Optional[InterviewFeedback]:
+    """Build feedback from answers scored in the background, or None if some could not be scored"""
+    screened_feedback = GeminiAIService._screen_answers(questions_and_answers)
+    if screened_feedback:
+        return screened_feedback
+    
+    scores = await answer_scoring.collect(session_id, questions_and_answers, settings)
+    if scores is None:
+        print("Some answers could not be scored, falling back to full feedback generation")
+        return None
+    return answer_scoring.aggregate(scores)
+
+async def _generate_feedback(session_id: Optional[str], questions_and_answers: List[Dict], settings: InterviewSettings) -> InterviewFeedback:
+    """Aggregate background scores when enabled, otherwise (or if incomplete) ask Gemini for full feedback"""
+    feedback = None
+    if AnswerScoringConfig.ENABLED:
+        feedback = await _aggregate_scored_feedback(session_id, questions_and_answers, settings)
+    if feedback is None:
+        feedback = await GeminiAIService.generate_feedback(questions_and_answers, settings)
+    return feedback
+
+async def get_feedback() -> InterviewFeedback:
     """Generate AI-powered feedback based on interview responses"""
     global current_session
     
@@ -75,48 +193,11 @@ def get_feedback() -> InterviewFeedback:
     print(f"Session questions count: {len(current_session.get('questions', [])) if current_session else 0}")
     
     if not current_session or not current_session.get("answers"):
-        # Return a specific feedback for no answers provided
-        return InterviewFeedback(
-            overall_score=2,
-            strengths=[
-                FeedbackItem(
-                    category="strength",
-                    title="Interview Participation",
-                    description="You completed the interview process, which shows commitment to the opportunity",
-                    suggestion=None
-                )
-            ],
-            weaknesses=[
-                FeedbackItem(
-                    category="weakness",
-                    title="No Responses Provided",
-                    description="You did not provide any answers to the interview questions, making it impossible to assess your qualifications",
-                    suggestion="Practice answering interview questions and ensure you provide responses during the actual interview"
-                )
-            ],
-            improvements=[
-                FeedbackItem(
-                    category="improvement",
-                    title="Complete Interview Responses",
-                    description="It's essential to answer all interview questions to demonstrate your knowledge and suitability for the role",
-                    suggestion="Prepare answers in advance and practice responding to common interview questions in your field"
-                )
-            ],
-            summary="No interview responses were provided, making it impossible to evaluate your qualifications. Please ensure you answer all questions in future interviews to give employers a chance to assess your fit for the role."
-        )
+        return _no_answers_feedback()
     
     try:
         # Prepare questions and answers for feedback generation
-        questions_and_answers = []
-        questions = current_session.get("questions", [])
-        answers = current_session.get("answers", [])
-        
-        for i, answer in enumerate(answers):
-            question_text = questions[i]["question"] if i < len(questions) else "Unknown question"
-            questions_and_answers.append({
-                "question": question_text,
-                "answer": answer["answer"]
-            })
+        questions_and_answers = _session_questions_and_answers()
         
         # Create settings object for feedback generation
         settings_data = current_session.get("settings", {})
@@ -125,7 +206,10 @@ def get_feedback() -> InterviewFeedback:
         # Generate feedback using Gemini AI
         print(f"Generating feedback for {len(questions_and_answers)} questions")
         print(f"Settings: {settings.dict()}")
-        feedback = GeminiAIService.generate_feedback(questions_and_answers, settings)
+        session_id = current_session.get("session_id")
+        feedback = await feedback_speculator.take(session_id, questions_and_answers, settings)
+        if feedback is None:
+            feedback = await _generate_feedback(session_id, questions_and_answers, settings)
         
         # Store feedback in session
         current_session["feedback"] = feedback.dict()
@@ -136,6 +220,37 @@ def get_feedback() -> InterviewFeedback:
         print(f"Error generating feedback: {e}")
         return GeminiAIService._get_fallback_feedback()
 
+async def stream_feedback() -> AsyncIterator[Tuple[str, Any]]:
+    """Generate feedback, yielding (section, data) pairs as each section is ready"""
+    global current_session
+    
+    if not current_session or not current_session.get("answers"):
+        yield "feedback", _no_answers_feedback()
+        return
+    
+    session = current_session
+    questions_and_answers = _session_questions_and_answers()
+    settings = InterviewSettings(**session.get("settings", {}))
+    
+    print(f"Streaming feedback for {len(questions_and_answers)} questions")
+    feedback = await feedback_speculator.take(session.get("session_id"), questions_and_answers, settings)
+    if feedback:
+        session["feedback"] = feedback.dict()
+        yield "feedback", feedback
+        return
+    
+    if AnswerScoringConfig.ENABLED:
+        feedback = await _aggregate_scored_feedback(session.get("session_id"), questions_and_answers, settings)
+        if feedback:
+            session["feedback"] = feedback.dict()
+            yield "feedback", feedback
+            return
+    
+    async for section, data in GeminiAIService.stream_feedback(questions_and_answers, settings):
+        if section == "feedback":
+            session["feedback"] = data.dict()
+        yield section, data
+
 def get_all_answers():
     return user_answers
 
@@ -147,6 +262,8 @@ def get_current_session():
 def start_new_session():
     """Start a new interview session"""
     global current_session
+    answer_scoring.cancel_session(current_session.get("session_id"))
+    feedback_speculator.cancel_session(current_session.get("session_id"))
     current_session = {}
     return {"message": "New session started"}
 
@@ -69,5 +69,23 @@ class InterviewHistory(Base):
     # Relationships
     user = relationship("User", back_populates="interviews")
 
+class ResumeAnalysisCache(Base):
+    """Extracted text, AI analysis and summary of a resume, keyed by its normalized text"""
+    __tablename__ = "resume_analysis_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    text_hash = Column(String(64), unique=True, index=True, nullable=False)  # SHA-256 of the normalized text
+    resume_text = Column(Text, nullable=False)
+    ai_analysis = Column(JSON, nullable=False)
+    ai_summary = Column(Text, nullable=False)
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_access = Column(DateTime, default=datetime.utcnow, index=True)
 
-
+class ResumeFileCache(Base):
+    """Maps the SHA-256 of an uploaded file to the analysis of the text it contains"""
+    __tablename__ = "resume_file_cache"
+    
+    content_hash = Column(String(64), primary_key=True)
+    text_hash = Column(String(64), index=True, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
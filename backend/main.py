@@ -6,9 +6,16 @@ from fastapi.responses import JSONResponse
 from routers import interview, health, auth, user_history, tts
 from middleware.rate_limiter import limiter, RateLimitExceeded, rate_limit_handler
 from middleware.session_cleanup import session_manager
+from middleware.file_security import UploadSizeLimitMiddleware
 from middleware.logging_config import logger
 from database.config import engine, Base
 from database import models as _db_models  # ensure models are imported
+from services.model_registry import model_registry
+from services.llm_service import llm_service
+from services.llm_providers import GeminiProvider
+from services.question_pool import question_pool, parse_prewarm_combinations, QuestionPoolConfig
+from services.resume_extraction import resume_extractor
+from services.skill_taxonomy import skill_matcher
 
 # Load environment variables from .env file
 load_dotenv()
@@ -46,6 +53,9 @@ raw_origins = os.getenv(
 ).split(",")
 allowed_origins = [origin.strip().rstrip("/") for origin in raw_origins if origin.strip()]
 
+# Cut off oversized uploads before their body is parsed (added first so CORS wraps its 413s)
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # CORS - Secure configuration
 app.add_middleware(
     CORSMiddleware,
@@ -75,8 +85,23 @@ async def startup_event():
         logger.info("Database tables are ensured (create_all)")
     except Exception as e:
         logger.error(f"Database initialization error: {e}")
+    logger.info(f"LLM provider: {llm_service.provider.name}")
+    # Build Gemini model handles once so requests don't pay setup cost
+    if llm_service.provider.name == "gemini":
+        try:
+            model_registry.warm_up(llm_service.router.models(), GeminiProvider.generation_configs())
+            logger.info("Gemini model registry warmed up")
+        except Exception as e:
+            logger.warning(f"Gemini model registry warm-up skipped: {e}")
+    # Start filling the generic question pools in the background
+    question_pool.prewarm(parse_prewarm_combinations(QuestionPoolConfig.PREWARM))
+    # Spawn the resume parsing workers now rather than on the first upload
+    resume_extractor.start()
+    # Compile the skill taxonomy once instead of on the first resume
+    skill_matcher.load()
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("MockMate API shutting down...")
+    resume_extractor.shutdown()
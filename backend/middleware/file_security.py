@@ -1,54 +1,242 @@
 """File upload security middleware"""
+import os
+import json
+import hashlib
+import tempfile
 from fastapi import HTTPException, UploadFile
-from typing import Set
+from typing import Dict, Optional, Set, Tuple, Union
 
 class FileSecurityConfig:
     # Max file size: 10MB
     MAX_FILE_SIZE = 10 * 1024 * 1024
-    
+
     # Allowed MIME types
     ALLOWED_MIME_TYPES: Set[str] = {
         'application/pdf',
         'application/vnd.openxmlformats-officedocument.wordprocessingml.document',  # .docx
-        'application/msword'  # .doc
     }
-    
-    # Allowed file extensions
-    ALLOWED_EXTENSIONS: Set[str] = {'.pdf', '.doc', '.docx'}
-
-async def validate_upload_file(file: UploadFile) -> None:
-    """Validate uploaded file for security"""
-    
-    # Check file size
-    file_content = await file.read()
-    file_size = len(file_content)
-    
-    if file_size > FileSecurityConfig.MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File too large. Maximum size is {FileSecurityConfig.MAX_FILE_SIZE / (1024*1024)}MB"
-        )
-    
-    if file_size == 0:
-        raise HTTPException(status_code=400, detail="Empty file uploaded")
-    
+
+    # Allowed file extensions (legacy binary .doc files can't be parsed, so they are refused here)
+    ALLOWED_EXTENSIONS: Set[str] = {'.pdf', '.docx'}
+
+    # Signatures the file must start with, per extension
+    MAGIC_BYTES: Dict[str, Tuple[bytes, ...]] = {
+        '.pdf': (b'%PDF-',),
+        '.docx': (b'PK\x03\x04',),  # ZIP container
+    }
+
+    # Bytes read from the upload at a time
+    CHUNK_SIZE = 64 * 1024
+
+    # Uploads larger than this are spooled to a temp file instead of held in memory
+    SPOOL_THRESHOLD = int(os.getenv("UPLOAD_SPOOL_THRESHOLD_BYTES", str(1024 * 1024)))
+
+    # Request bodies on these paths are cut off once they pass the file size limit
+    # plus room for the multipart framing
+    UPLOAD_PATHS: Set[str] = {'/api/upload-resume'}
+    MULTIPART_OVERHEAD = 64 * 1024
+
+def _too_large_detail() -> str:
+    return f"File too large. Maximum size is {FileSecurityConfig.MAX_FILE_SIZE / (1024*1024)}MB"
+
+class UploadedDocument:
+    """
+    A validated upload, held in memory or spooled to a temp file.
+
+    Small uploads live in one bytearray; past SPOOL_THRESHOLD the chunks
+    are written to a temp file instead. The SHA-256 is computed as the
+    chunks arrive, and the text extractors get the bytearray or the temp
+    file's path (see source) and read the file back themselves. Close it
+    (or use it as a context manager) to release the buffer and delete the
+    temp file.
+    """
+
+    def __init__(self, filename: str, content_type: str):
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        self._buffer: Optional[bytearray] = bytearray()
+        self._spool_path: Optional[str] = None
+        self._spool = None
+
+    def _write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        self._sha256.update(chunk)
+        if self._spool is None and self.size > FileSecurityConfig.SPOOL_THRESHOLD:
+            fd, self._spool_path = tempfile.mkstemp(prefix="mockmate-upload-")
+            self._spool = os.fdopen(fd, 'wb')
+            self._spool.write(self._buffer)
+            self._buffer = None
+        if self._spool is not None:
+            self._spool.write(chunk)
+        else:
+            self._buffer += chunk
+
+    def _finish(self) -> None:
+        if self._spool is not None:
+            self._spool.close()
+
+    @property
+    def sha256(self) -> str:
+        """Hex SHA-256 of the file, computed while it was streamed in"""
+        return self._sha256.hexdigest()
+
+    @property
+    def source(self) -> Union[bytearray, str]:
+        """What the text extractors take: the in-memory bytes, or the spool file's path"""
+        return self._spool_path if self._spool_path is not None else self._buffer
+
+    def close(self) -> None:
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        if self._spool_path is not None:
+            try:
+                os.remove(self._spool_path)
+            except OSError:
+                pass
+            self._spool_path = None
+        self._buffer = None
+
+    def __enter__(self) -> "UploadedDocument":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+async def validate_upload_file(file: UploadFile) -> UploadedDocument:
+    """
+    Validate uploaded file for security while reading it in chunks.
+
+    Type checks that need no content run first. The file is then streamed:
+    its first bytes must carry the signature of its extension, and reading
+    stops with a 413 as soon as it passes the size limit.
+
+    Returns:
+        UploadedDocument: The validated file; the caller must close it
+
+    Raises:
+        HTTPException: 400 for a disallowed, mislabeled or empty file, 413 for an oversized one
+    """
+
     # Check MIME type
     if file.content_type not in FileSecurityConfig.ALLOWED_MIME_TYPES:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid file type. Allowed types: PDF, DOC, DOCX"
+            detail="Invalid file type. Allowed types: PDF, DOCX"
         )
-    
+
     # Check file extension
-    if not any(file.filename.lower().endswith(ext) for ext in FileSecurityConfig.ALLOWED_EXTENSIONS):
+    extension = os.path.splitext((file.filename or '').lower())[1]
+    if extension not in FileSecurityConfig.ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
-            detail="Invalid file extension. Only PDF, DOC, and DOCX files are allowed"
+            detail="Invalid file extension. Only PDF and DOCX files are allowed"
         )
-    
+
+    document = UploadedDocument(file.filename, file.content_type)
+    signatures = FileSecurityConfig.MAGIC_BYTES[extension]
+    head_size = max(len(signature) for signature in signatures)
+    head = b""
+    try:
+        while True:
+            chunk = await file.read(FileSecurityConfig.CHUNK_SIZE)
+            if not chunk:
+                break
+
+            # Check the content matches the extension as soon as its first bytes arrive
+            if len(head) < head_size:
+                head += chunk[:head_size - len(head)]
+                if len(head) == head_size and not head.startswith(signatures):
+                    raise HTTPException(status_code=400, detail="File content does not match its extension")
+
+            document._write(chunk)
+
+            # Check file size
+            if document.size > FileSecurityConfig.MAX_FILE_SIZE:
+                raise HTTPException(status_code=413, detail=_too_large_detail())
+        document._finish()
+
+        if document.size == 0:
+            raise HTTPException(status_code=400, detail="Empty file uploaded")
+        if not head.startswith(signatures):
+            raise HTTPException(status_code=400, detail="File content does not match its extension")
+    except BaseException:
+        document.close()
+        raise
+
     # Reset file pointer for further processing
     await file.seek(0)
-    
-    return file_content
 
+    return document
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects oversized upload requests before their body is parsed.
+
+    The multipart parser reads the whole body before the route runs, so the
+    route's own size check comes too late to stop a flood of huge uploads.
+    This answers 413 straight away when Content-Length is over the limit,
+    and otherwise counts body bytes as they arrive and cuts the request off
+    once it passes the limit.
+    """
+
+    def __init__(self, app, paths: Set[str] = None, max_bytes: int = None):
+        self.app = app
+        self.paths = paths or FileSecurityConfig.UPLOAD_PATHS
+        self.max_bytes = max_bytes or FileSecurityConfig.MAX_FILE_SIZE + FileSecurityConfig.MULTIPART_OVERHEAD
+
+    @staticmethod
+    async def _reject(send) -> None:
+        body = json.dumps({"detail": _too_large_detail()}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+        cut_off = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, cut_off
+            if cut_off:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    cut_off = True
+                    if not response_started:
+                        await self._reject(send)
+                    # Looks like the client went away, so the app stops reading
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if cut_off:
+                # The 413 has already been sent
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not cut_off:
+                raise
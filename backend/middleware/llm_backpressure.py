@@ -0,0 +1,24 @@
+"""Load shedding for LLM-backed routes"""
+from fastapi import HTTPException
+from services.llm_service import llm_service
+from services.llm_dispatcher import LLMOverloadedError
+
+
+def require_llm_capacity(priority: int):
+    """
+    Route dependency that refuses requests while the LLM queue is too deep.
+
+    Shedding at the door returns 503 with a Retry-After header in
+    microseconds, instead of accepting work that would wait out its latency
+    budget in the queue and then serve a fallback anyway.
+    """
+    async def check_capacity() -> None:
+        try:
+            llm_service.dispatcher.check(priority)
+        except LLMOverloadedError as e:
+            raise HTTPException(
+                status_code=503,
+                detail="The AI service is busy. Please try again shortly.",
+                headers={"Retry-After": str(e.retry_after)}
+            )
+    return check_capacity
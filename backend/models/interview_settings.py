@@ -16,6 +16,7 @@ class InterviewSettings(BaseModel):
 class QuestionGenerationRequest(BaseModel):
     settings: InterviewSettings
     resume_text: Optional[str] = None
+    skip_cache: bool = False  # Always generate fresh questions
 
 class Question(BaseModel):
     id: int
@@ -1,7 +1,21 @@
 """Health check endpoint for monitoring"""
+import asyncio
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 from datetime import datetime
-import os
+from services.model_registry import model_registry
+from services.question_cache import question_cache
+from services.answer_scoring import answer_scoring
+from services.llm_service import llm_service
+from services.llm_metrics import llm_metrics
+from services.question_pool import question_pool
+from services.question_index import question_index
+from services.prompt_compiler import prompt_compiler
+from services.resume_batcher import resume_batcher
+from services.feedback_speculation import feedback_speculator
+from services.resume_extraction import resume_extractor
+from services.resume_cache import resume_cache
+from services.skill_taxonomy import skill_matcher
 
 router = APIRouter(prefix="/api")
 
@@ -13,9 +27,36 @@ async def health_check():
         "timestamp": datetime.now().isoformat(),
         "service": "MockMate API",
         "version": "1.0.0",
-        "ai_configured": bool(os.getenv("GEMINI_API_KEY"))
+        "ai_configured": llm_service.is_configured(),
+        "llm_provider": llm_service.provider.name,
+        "llm_circuit": llm_service.breaker.get_stats()
     }
 
+@router.get("/health/llm")
+async def llm_health():
+    """LLM client statistics for monitoring"""
+    return {
+        "model_registry": model_registry.get_stats(),
+        "llm": llm_service.get_stats(),
+        "llm_calls": llm_metrics.get_stats(),
+        "coalescing": llm_service.single_flight.get_stats(),
+        "prompt_tokens": prompt_compiler.get_stats(),
+        "question_cache": question_cache.get_stats(),
+        "question_pool": question_pool.get_stats(),
+        "question_index": question_index.get_stats(),
+        "answer_scoring": answer_scoring.get_stats(),
+        "resume_batching": resume_batcher.get_stats(),
+        "feedback_speculation": feedback_speculator.get_stats(),
+        "resume_extraction": resume_extractor.get_stats(),
+        "resume_cache": await asyncio.to_thread(resume_cache.get_stats),
+        "skill_taxonomy": skill_matcher.get_stats()
+    }
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """LLM call histograms in the Prometheus text format, for scraping"""
+    return PlainTextResponse(llm_metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @router.get("/")
 async def root():
     """Root endpoint"""
@@ -1,28 +1,59 @@
-from fastapi import APIRouter, Query, UploadFile, File, Form, Request
-from typing import List
+import json
+import asyncio
+from fastapi import APIRouter, Query, UploadFile, File, Form, Request, Depends
+from fastapi.responses import StreamingResponse
+from typing import List, Any
 from pydantic import BaseModel
 from models.answer import Answer
 from models.interview_settings import QuestionGenerationRequest, InterviewSettings
 from controllers.interview_controller import (
-    generate_questions, submit_answer, get_feedback, 
+    generate_questions, stream_questions, submit_answer, get_feedback, stream_feedback,
     get_all_answers, get_current_session, start_new_session
 )
 from services.resume_service import ResumeService
+from services.resume_cache import resume_cache
 from middleware.file_security import validate_upload_file
 from middleware.rate_limiter import limiter
+from middleware.llm_backpressure import require_llm_capacity
+from services.llm_dispatcher import LLMPriority
 
 router = APIRouter(prefix="/api")
 
-@router.post("/generate-questions")
+def _sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"  # Stop proxies from buffering the stream
+}
+
+@router.post("/generate-questions", dependencies=[Depends(require_llm_capacity(LLMPriority.QUESTIONS))])
 @limiter.limit("10/minute")
 async def route_generate_questions(
     question_request: QuestionGenerationRequest,
     request: Request
 ):
     """Generate AI-powered custom interview questions"""
-    return {"questions": generate_questions(question_request)}
+    return {"questions": await generate_questions(question_request)}
+
+@router.post("/generate-questions/stream", dependencies=[Depends(require_llm_capacity(LLMPriority.QUESTIONS))])
+@limiter.limit("10/minute")
+async def route_stream_questions(
+    question_request: QuestionGenerationRequest,
+    request: Request
+):
+    """Stream generated questions as Server-Sent Events, one event per question"""
+    async def event_stream():
+        count = 0
+        async for question in stream_questions(question_request):
+            count += 1
+            yield _sse_event("question", question.dict())
+        yield _sse_event("done", {"count": count})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
 
-@router.post("/upload-resume")
+@router.post("/upload-resume", dependencies=[Depends(require_llm_capacity(LLMPriority.QUESTIONS))])
 @limiter.limit("5/minute")
 async def route_upload_resume(
     request: Request,
@@ -33,19 +64,24 @@ async def route_upload_resume(
         print(f"Uploading file: {file.filename}, content type: {file.content_type}")
         
         # Validate file security
-        file_content = await validate_upload_file(file)
-        print(f"File size: {len(file_content)} bytes")
-        
-        resume_text = ResumeService.extract_text_from_upload(file_content, file.filename)
+        with await validate_upload_file(file) as document:
+            print(f"File size: {document.size} bytes")
+            content_hash = document.sha256
+            
+            # The same file uploaded before: no parsing and no LLM call
+            cached = await asyncio.to_thread(resume_cache.get_by_content, content_hash)
+            if cached:
+                print("Resume file seen before, using cached analysis")
+                return {"success": True, **cached}
+            
+            resume_text = await ResumeService.extract_text_from_upload_async(document.source, file.filename)
         print(f"Extracted text length: {len(resume_text) if resume_text else 0}")
         
         if resume_text:
             print("Starting AI analysis...")
             # Use AI to analyze the resume
-            analysis = ResumeService.analyze_resume_with_ai(resume_text)
+            analysis, ai_summary = await ResumeService.analyze_and_summarize(resume_text, content_hash)
             print(f"Analysis completed. Keys: {list(analysis.keys()) if analysis else 'None'}")
-            
-            ai_summary = ResumeService.generate_resume_summary_for_ai(resume_text, analysis)
             print(f"AI summary length: {len(ai_summary)}")
             
             return {
@@ -66,10 +102,25 @@ async def route_upload_resume(
 async def route_submit_answer(answer: Answer, request: Request):
     return submit_answer(answer)
 
-@router.get("/get-feedback")
+@router.get("/get-feedback", dependencies=[Depends(require_llm_capacity(LLMPriority.FEEDBACK))])
 @limiter.limit("10/minute")
 async def route_get_feedback(request: Request):
-    return get_feedback()
+    return await get_feedback()
+
+@router.get("/get-feedback/stream", dependencies=[Depends(require_llm_capacity(LLMPriority.FEEDBACK))])
+@limiter.limit("10/minute")
+async def route_stream_feedback(request: Request):
+    """
+    Stream feedback as Server-Sent Events.
+
+    One event is sent per feedback section as soon as it is parsed. The final
+    'feedback' event carries the complete, validated InterviewFeedback.
+    """
+    async def event_stream():
+        async for section, data in stream_feedback():
+            yield _sse_event(section, data.dict() if section == "feedback" else data)
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 @router.get("/answers")
 @limiter.limit("30/minute")
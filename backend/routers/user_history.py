@@ -8,6 +8,7 @@ from datetime import datetime
 from database.config import get_db
 from database.models import User, InterviewHistory, SavedResume
 from auth.security import get_current_user
+from services.answer_analysis import AnswerAnalyzer
 from middleware.rate_limiter import limiter
 
 router = APIRouter(prefix="/api/user", tags=["user"])
@@ -163,7 +164,8 @@ async def get_user_stats(
             "best_score": 0,
             "recent_trend": "N/A",
             "interviews_by_type": {},
-            "score_progression": []
+            "score_progression": [],
+            "answer_quality": {"answers": 0}
         }
     
     # Calculate stats
@@ -195,13 +197,22 @@ async def get_user_stats(
         "interview_type": i.interview_type
     } for i in interviews[-10:] if i.overall_score]
     
+    # Answer quality across all saved interviews, analyzed as one batch
+    questions, answers = [], []
+    for interview in interviews:
+        pairs = list(zip(interview.questions or [], interview.answers or []))
+        questions.extend(q for q, _ in pairs)
+        answers.extend(a or "" for _, a in pairs)
+    answer_quality = AnswerAnalyzer.analyze(questions, answers).summary()
+    
     return {
         "total_interviews": len(interviews),
         "average_score": round(avg_score, 1),
         "best_score": round(best_score, 1),
         "recent_trend": trend,
         "interviews_by_type": by_type,
-        "score_progression": score_progression
+        "score_progression": score_progression,
+        "answer_quality": answer_quality
     }
 
 @router.delete("/interview/{interview_id}")
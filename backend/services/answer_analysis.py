@@ -0,0 +1,171 @@
+"""Vectorized answer-quality features and verdicts shared by feedback, scoring and analytics"""
+from typing import Dict, List
+import numpy as np
+
+
+class AnswerVerdict:
+    """Per-answer screening outcomes"""
+    OK = "ok"
+    POOR = "poor"                  # Too short or incomplete to grade meaningfully
+    NONSENSICAL = "nonsensical"    # Junk, keyboard mashing or the question repeated back
+
+
+# Built once at import instead of on every screen
+JUNK_ANSWERS = frozenset(['asdasdasdasd', 'test', 'testing', 'asdf', 'qwerty', '123', 'abc'])
+ONE_WORD_ANSWERS = frozenset(['uh', 'um', 'yes', 'no', 'ok', 'sure'])
+FILLER_WORDS = frozenset(['um', 'uh', 'umm', 'uhh', 'er', 'ah', 'like', 'basically', 'literally',
+                          'actually', 'so', 'well', 'right', 'just', 'kinda', 'sorta'])
+
+# Share of an answer's words found in the question above which it counts as an echo
+ECHO_THRESHOLD = 0.6
+
+
+class AnswerBatchAnalysis:
+    """Features and verdicts for a batch of answers, one array entry per answer"""
+
+    def __init__(self, word_counts: np.ndarray, sentence_counts: np.ndarray, char_counts: np.ndarray,
+                 echo_overlap: np.ndarray, filler_ratio: np.ndarray, verdicts: np.ndarray):
+        self.word_counts = word_counts
+        self.sentence_counts = sentence_counts
+        self.char_counts = char_counts
+        self.echo_overlap = echo_overlap
+        self.filler_ratio = filler_ratio
+        self.verdicts = verdicts
+
+    def __len__(self) -> int:
+        return len(self.verdicts)
+
+    @property
+    def has_nonsensical(self) -> bool:
+        return bool(np.any(self.verdicts == AnswerVerdict.NONSENSICAL))
+
+    @property
+    def has_poor(self) -> bool:
+        return bool(np.any(self.verdicts == AnswerVerdict.POOR))
+
+    def to_dicts(self) -> List[Dict]:
+        """Per-answer features as plain dicts (for JSON responses)"""
+        return [
+            {
+                'verdict': str(verdict),
+                'word_count': int(words),
+                'sentence_count': int(sentences),
+                'echo_overlap': round(float(echo), 3),
+                'filler_ratio': round(float(filler), 3)
+            }
+            for verdict, words, sentences, echo, filler in zip(
+                self.verdicts, self.word_counts, self.sentence_counts, self.echo_overlap, self.filler_ratio
+            )
+        ]
+
+    def summary(self) -> Dict:
+        """Aggregate features across the batch"""
+        if not len(self):
+            return {'answers': 0}
+        return {
+            'answers': len(self),
+            'avg_word_count': round(float(self.word_counts.mean()), 1),
+            'avg_sentence_count': round(float(self.sentence_counts.mean()), 1),
+            'avg_filler_ratio': round(float(self.filler_ratio.mean()), 3),
+            'poor_share': round(float(np.mean(self.verdicts == AnswerVerdict.POOR)), 3),
+            'nonsensical_share': round(float(np.mean(self.verdicts == AnswerVerdict.NONSENSICAL)), 3)
+        }
+
+
+class AnswerAnalyzer:
+    """
+    Computes answer-quality features for a whole batch at once.
+
+    Each answer is lowercased and split exactly once, and each distinct
+    question once per batch. That single pass writes raw counts into one
+    flat array; ratios and verdict rules are then evaluated with NumPy over
+    the whole batch. Word overlap and filler counts use C-level set
+    operations, which measured faster than hashing words into NumPy arrays
+    for answers of interview length.
+    """
+
+    # Columns of the raw count matrix
+    _WORDS, _CHARS, _SENTENCES, _ECHO, _FILLERS, _QUESTION_CHARS, _FLAGS = range(7)
+    _JUNK_FLAG, _ONE_WORD_FLAG, _FOR_EXAMPLE_FLAG = 1, 2, 4
+
+    @staticmethod
+    def _raw_counts(questions: List[str], answers: List[str]) -> np.ndarray:
+        question_cache: Dict[str, tuple] = {}
+        values = []
+        append = values.append
+        for question, answer in zip(questions, answers):
+            text = answer.lower().strip()
+            words = text.split()
+            cached = question_cache.get(question)
+            if cached is None:
+                question_text = question.lower().strip()
+                cached = question_cache[question] = (frozenset(question_text.split()), len(question_text))
+            question_words, question_chars = cached
+
+            append(len(words))
+            append(len(text))
+            append(text.count('.') + text.count('!') + text.count('?'))
+            append(len(question_words.intersection(words)))
+            append(sum(map(FILLER_WORDS.__contains__, words)) if not FILLER_WORDS.isdisjoint(words) else 0)
+            append(question_chars)
+            append((AnswerAnalyzer._JUNK_FLAG if text in JUNK_ANSWERS or text.isdigit() else 0)
+                   | (AnswerAnalyzer._ONE_WORD_FLAG if text in ONE_WORD_ANSWERS else 0)
+                   | (AnswerAnalyzer._FOR_EXAMPLE_FLAG if text.endswith('for example') else 0))
+        return np.array(values, dtype=np.int64).reshape(len(answers), 7)
+
+    @staticmethod
+    def analyze(questions: List[str], answers: List[str]) -> AnswerBatchAnalysis:
+        """
+        Analyze answers against the questions they respond to.
+
+        Args:
+            questions: Question text per answer
+            answers: Answer text, same length as questions
+
+        Returns:
+            AnswerBatchAnalysis with features and a verdict per answer
+        """
+        counts = AnswerAnalyzer._raw_counts(questions, answers)
+        word_counts = counts[:, AnswerAnalyzer._WORDS]
+        char_counts = counts[:, AnswerAnalyzer._CHARS]
+        sentence_counts = counts[:, AnswerAnalyzer._SENTENCES]
+        echo_words = counts[:, AnswerAnalyzer._ECHO]
+        question_chars = counts[:, AnswerAnalyzer._QUESTION_CHARS]
+        flags = counts[:, AnswerAnalyzer._FLAGS]
+
+        safe_counts = np.maximum(word_counts, 1)
+        echo_overlap = echo_words / safe_counts
+        filler_ratio = counts[:, AnswerAnalyzer._FILLERS] / safe_counts
+
+        nonsensical = (
+            (flags & AnswerAnalyzer._JUNK_FLAG).astype(bool)
+            | (char_counts < 3)
+            # Repeating the question back
+            | ((char_counts > 10) & (question_chars > 10) & (echo_words > word_counts * ECHO_THRESHOLD))
+        )
+        poor = (
+            (word_counts < 5)
+            | ((sentence_counts == 0) & (word_counts < 20))
+            | (flags & AnswerAnalyzer._ONE_WORD_FLAG).astype(bool)
+            | ((word_counts < 10) & (flags & AnswerAnalyzer._FOR_EXAMPLE_FLAG).astype(bool))
+        )
+
+        verdicts = np.where(nonsensical, AnswerVerdict.NONSENSICAL,
+                            np.where(poor, AnswerVerdict.POOR, AnswerVerdict.OK))
+
+        return AnswerBatchAnalysis(
+            word_counts=word_counts,
+            sentence_counts=sentence_counts,
+            char_counts=char_counts,
+            echo_overlap=echo_overlap,
+            filler_ratio=filler_ratio,
+            verdicts=verdicts
+        )
+
+    @staticmethod
+    def analyze_pairs(questions_and_answers: List[Dict]) -> AnswerBatchAnalysis:
+        """Analyze a list of {'question': ..., 'answer': ...} dicts"""
+        return AnswerAnalyzer.analyze(
+            [qa['question'] for qa in questions_and_answers],
+            [qa['answer'] for qa in questions_and_answers]
+        )
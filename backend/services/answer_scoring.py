@@ -0,0 +1,251 @@
+"""Background scoring of each answer as soon as it is submitted"""
+import os
+import math
+import asyncio
+from statistics import mean
+from typing import Dict, List, Optional
+from models.interview_settings import InterviewSettings
+from models.feedback import InterviewFeedback, FeedbackItem, QuestionScore, CategoryScores
+from config.prompts import AIPrompts
+from services.llm_service import llm_service, LLMCallSite
+from services.prompt_compiler import prompt_compiler, PromptSection, PromptCompilerConfig
+from services.answer_analysis import AnswerAnalyzer, AnswerVerdict
+from services.llm_dispatcher import llm_priority, LLMPriority
+
+
+class AnswerScoringConfig:
+    # Score answers in the background at submit time instead of all at once at the end
+    ENABLED = os.getenv("ANSWER_SCORING_ENABLED", "false").lower() == "true"
+
+    # How long get_feedback waits for scoring still in flight (seconds)
+    AWAIT_TIMEOUT = float(os.getenv("ANSWER_SCORING_AWAIT_TIMEOUT", "20"))
+
+    # Max strengths / weaknesses / improvements in aggregated feedback
+    MAX_ITEMS = 3
+
+    CATEGORIES = ("communication", "technical", "problem_solving", "behavioral")
+
+
+class AnswerScoringPipeline:
+    """
+    Scores each answer into a QuestionScore right after it is submitted.
+
+    Scores are kept per session, so get_feedback only has to aggregate
+    answers that were already graded while the interview was in progress.
+    """
+
+    def __init__(self):
+        # session_id -> question index -> scoring task
+        self._tasks: Dict[str, Dict[int, asyncio.Task]] = {}
+        self.scored: int = 0
+        self.failed: int = 0
+        self.skipped: int = 0
+
+    @staticmethod
+    async def score_answer(question: str, answer: str, index: int, settings: InterviewSettings) -> Dict:
+        """Score a single answer with the LLM and return the parsed JSON"""
+        sections = prompt_compiler.compile(LLMCallSite.ANSWER_SCORING, [
+            PromptSection("question", question, priority=2, max_tokens=PromptCompilerConfig.QUESTION_MAX_TOKENS),
+            PromptSection("answer", answer, priority=1, strategy=PromptSection.HEAD_TAIL, min_tokens=60),
+        ])
+        prompt = AIPrompts.ANSWER_SCORING.format(
+            job_title=settings.job_title,
+            company_name=settings.company_name,
+            job_level=settings.job_level,
+            interview_type=settings.interview_type,
+            difficulty=settings.difficulty,
+            question_number=index + 1,
+            question_index=index,
+            question=sections["question"],
+            answer=sections["answer"]
+        )
+        def to_score(scored: Dict) -> Dict:
+            if not isinstance(scored, dict):
+                raise ValueError("Answer score response is not a JSON object")
+            scored["question_index"] = index
+            # Validate the part that becomes a QuestionScore; a malformed one raises and is scored again
+            fields = ("question_index", "score", "feedback", "suggestions")
+            scored.update(QuestionScore(**{k: scored.get(k) for k in fields}).dict())
+            # The rest only feeds the aggregate, so malformed parts are dropped rather than re-scored
+            scored["strength"] = AnswerScoringPipeline._feedback_item(scored.get("strength"))
+            scored["weakness"] = AnswerScoringPipeline._feedback_item(scored.get("weakness"))
+            scored["category_scores"] = AnswerScoringPipeline._category_scores(scored.get("category_scores"))
+            return scored
+
+        return await llm_service.generate_json(prompt, LLMCallSite.ANSWER_SCORING, '{', convert=to_score)
+
+    @staticmethod
+    def _feedback_item(item) -> Optional[Dict]:
+        """A strength or weakness with a non-empty title and description, or None"""
+        if not isinstance(item, dict):
+            return None
+        title, description, suggestion = item.get("title"), item.get("description"), item.get("suggestion")
+        if not all(isinstance(text, str) and text.strip() for text in (title, description)):
+            return None
+        return {
+            "title": title.strip(),
+            "description": description.strip(),
+            "suggestion": suggestion.strip() if isinstance(suggestion, str) and suggestion.strip() else None
+        }
+
+    @staticmethod
+    def _category_scores(category_scores) -> Dict[str, float]:
+        """The known categories that have a numeric score"""
+        if not isinstance(category_scores, dict):
+            return {}
+        return {
+            category: value for category, value in category_scores.items()
+            if category in AnswerScoringConfig.CATEGORIES
+            and isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+        }
+
+    async def _run(self, question: str, answer: str, index: int, settings: InterviewSettings) -> Optional[Dict]:
+        try:
+            scored = await self.score_answer(question, answer, index, settings)
+            self.scored += 1
+            return scored
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            print(f"Background scoring failed for question {index + 1}: {e}")
+            return None
+
+    def schedule(self, session_id: str, index: int, question: str, answer: str, settings: InterviewSettings) -> None:
+        """Start scoring an answer in the background"""
+        tasks = self._tasks.setdefault(session_id, {})
+        previous = tasks.pop(index, None)
+        if previous and not previous.done():
+            previous.cancel()
+
+        # Junk or too-short answers get canned feedback at the end, so grading them is wasted quota
+        if AnswerAnalyzer.analyze([question], [answer]).verdicts[0] != AnswerVerdict.OK:
+            self.skipped += 1
+            return
+        tasks[index] = asyncio.create_task(self._run(question, answer, index, settings))
+
+    def cancel_session(self, session_id: Optional[str]) -> None:
+        """Drop all scoring for a session that is no longer current"""
+        for task in self._tasks.pop(session_id, {}).values():
+            if not task.done():
+                task.cancel()
+
+    async def collect(self, session_id: str, questions_and_answers: List[Dict], settings: InterviewSettings) -> Optional[List[Dict]]:
+        """
+        Get scores for every answer, waiting for in-flight scoring.
+
+        Answers whose background scoring failed or never started are scored
+        now, concurrently. Returns None if any answer still has no score.
+        """
+        tasks = self._tasks.get(session_id, {})
+        pending = [task for task in tasks.values() if not task.done()]
+        if pending:
+            await asyncio.wait(pending, timeout=AnswerScoringConfig.AWAIT_TIMEOUT)
+
+        scores: List[Optional[Dict]] = []
+        for i in range(len(questions_and_answers)):
+            task = tasks.get(i)
+            if task and task.done() and not task.cancelled():
+                scores.append(task.result())
+            else:
+                if task:
+                    task.cancel()
+                scores.append(None)
+
+        missing = [i for i, scored in enumerate(scores) if scored is None]
+        if missing:
+            print(f"Scoring {len(missing)} answers that were not scored in the background")
+            # The user is now waiting on these, so they jump ahead of background work
+            with llm_priority(LLMPriority.FEEDBACK):
+                results = await asyncio.gather(*[
+                    self._run(questions_and_answers[i]["question"], questions_and_answers[i]["answer"], i, settings)
+                    for i in missing
+                ])
+            for i, scored in zip(missing, results):
+                scores[i] = scored
+
+        if any(scored is None for scored in scores):
+            return None
+        return scores
+
+    @staticmethod
+    def aggregate(scores: List[Dict]) -> InterviewFeedback:
+        """Build interview feedback from per-answer scores without another LLM call"""
+        question_scores = [
+            QuestionScore(
+                question_index=s["question_index"],
+                score=s["score"],
+                feedback=s["feedback"],
+                suggestions=s.get("suggestions") or []
+            )
+            for s in scores
+        ]
+        overall_score = round(mean(qs.score for qs in question_scores))
+
+        category_values = {}
+        for category in AnswerScoringConfig.CATEGORIES:
+            values = [s["category_scores"][category] for s in scores if category in s["category_scores"]]
+            category_values[category] = round(mean(values)) if values else overall_score
+
+        by_score = sorted(scores, key=lambda s: s["score"])
+        max_items = AnswerScoringConfig.MAX_ITEMS
+
+        strengths = [
+            FeedbackItem(category="strength", title=s["strength"]["title"],
+                         description=s["strength"]["description"], suggestion=None)
+            for s in reversed(by_score) if s.get("strength")
+        ][:max_items]
+        weaknesses = [
+            FeedbackItem(category="weakness", title=s["weakness"]["title"],
+                         description=s["weakness"]["description"],
+                         suggestion=s["weakness"].get("suggestion"))
+            for s in by_score if s.get("weakness")
+        ][:max_items]
+
+        improvements = []
+        seen_suggestions = set()
+        for s in by_score:
+            for suggestion in s.get("suggestions") or []:
+                if suggestion.lower() in seen_suggestions:
+                    continue
+                seen_suggestions.add(suggestion.lower())
+                improvements.append(FeedbackItem(
+                    category="improvement",
+                    title=f"Strengthen your answer to question {s['question_index'] + 1}",
+                    description=s["feedback"],
+                    suggestion=suggestion
+                ))
+        improvements = improvements[:max_items]
+
+        best, worst = by_score[-1], by_score[0]
+        summary = (
+            f"You averaged {overall_score}/10 across {len(scores)} answers. "
+            f"Your strongest answer was question {best['question_index'] + 1} ({best['score']}/10): {best['feedback']}"
+        )
+        if worst is not best:
+            summary += f" Your weakest was question {worst['question_index'] + 1} ({worst['score']}/10): {worst['feedback']}"
+
+        return InterviewFeedback(
+            overall_score=overall_score,
+            question_scores=question_scores,
+            category_scores=CategoryScores(**category_values),
+            strengths=strengths,
+            weaknesses=weaknesses,
+            improvements=improvements,
+            summary=summary
+        )
+
+    def get_stats(self) -> Dict:
+        """Get pipeline statistics"""
+        return {
+            'enabled': AnswerScoringConfig.ENABLED,
+            'sessions': len(self._tasks),
+            'in_flight': sum(1 for tasks in self._tasks.values() for t in tasks.values() if not t.done()),
+            'scored': self.scored,
+            'failed': self.failed,
+            'skipped_screened': self.skipped
+        }
+
+
+# Global answer scoring pipeline instance
+answer_scoring = AnswerScoringPipeline()
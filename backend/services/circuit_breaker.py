@@ -0,0 +1,105 @@
+"""Circuit breaker for calls to an unreliable backend"""
+import os
+import time
+import threading
+from typing import Any, Dict
+
+
+class CircuitBreakerConfig:
+    # Consecutive failures that open the circuit
+    FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+
+    # Seconds the circuit stays open before a trial call is let through
+    RESET_TIMEOUT = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open breaker.
+
+    Closed: calls go through and consecutive failures are counted.
+    Open: calls are refused immediately until the reset timeout passes.
+    Half-open: one trial call is let through; success closes the circuit,
+    failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = None, reset_timeout: float = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or CircuitBreakerConfig.FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout or CircuitBreakerConfig.RESET_TIMEOUT
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at = None
+        self.rejected: int = 0
+        self.times_opened: int = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            now = time.monotonic()
+            if self._state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._trial_started_at = None
+            # A trial that never reported back (e.g. an abandoned stream) must not
+            # keep the circuit half-open forever
+            if self._state == self.HALF_OPEN and self._trial_started_at is not None \
+                    and now - self._trial_started_at >= self.reset_timeout:
+                self._trial_started_at = None
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Whether a call may go to the backend right now"""
+        state = self.state
+        with self._lock:
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._trial_started_at is None:
+                self._trial_started_at = time.monotonic()
+                return True
+            self.rejected += 1
+            return False
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if the call should not be made"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open; backend marked unhealthy")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.times_opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_started_at = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker state for monitoring"""
+        state = self.state
+        with self._lock:
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)) if state == self.OPEN else 0.0
+            return {
+                'state': state,
+                'consecutive_failures': self._consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'retry_in_seconds': round(retry_in, 1),
+                'times_opened': self.times_opened,
+                'rejected_calls': self.rejected
+            }
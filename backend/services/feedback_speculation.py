@@ -0,0 +1,140 @@
+"""Speculative feedback generation started as soon as the last answer is submitted"""
+import os
+import json
+import time
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from models.interview_settings import InterviewSettings
+from models.feedback import InterviewFeedback
+from services.llm_dispatcher import llm_priority, LLMPriority
+
+
+class FeedbackSpeculationConfig:
+    # Start generating feedback when the final answer arrives instead of on /api/get-feedback
+    ENABLED = os.getenv("FEEDBACK_SPECULATION_ENABLED", "true").lower() == "true"
+
+
+class FeedbackSpeculator:
+    """
+    Runs feedback generation in the background once a session has an answer
+    for every question.
+
+    The frontend only asks for feedback after the final answer, so starting
+    then hides most of the generation latency. Each speculation is keyed on
+    the exact questions, answers and settings it was started with; a request
+    that no longer matches (an answer was resubmitted) discards it, and a new
+    or deleted session cancels it.
+    """
+
+    def __init__(self):
+        # session_id -> (key, task)
+        self._speculations: Dict[str, Tuple[str, asyncio.Task]] = {}
+        self.started: int = 0
+        self.hits_ready: int = 0
+        self.hits_waited: int = 0
+        self.misses: int = 0
+        self.stale: int = 0
+        self.failed: int = 0
+        self.cancelled: int = 0
+        self.wait_seconds: float = 0.0
+
+    @staticmethod
+    def make_key(questions_and_answers: List[Dict], settings: InterviewSettings) -> str:
+        """Fingerprint of everything the feedback depends on"""
+        payload = {"qa": questions_and_answers, "settings": settings.dict()}
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def start(self, session_id: str, questions_and_answers: List[Dict], settings: InterviewSettings,
+              generate: Callable[[], Awaitable[InterviewFeedback]]) -> None:
+        """
+        Start generating feedback for a session in the background.
+
+        Args:
+            session_id: Session the feedback belongs to
+            questions_and_answers: The answers the feedback will cover
+            settings: Interview settings of the session
+            generate: Coroutine function producing the feedback
+        """
+        key = self.make_key(questions_and_answers, settings)
+        current = self._speculations.get(session_id)
+        if current and current[0] == key:
+            return
+        self.cancel_session(session_id)
+        self._speculations[session_id] = (key, asyncio.create_task(self._speculate(generate)))
+        self.started += 1
+        print(f"Started speculative feedback for session {session_id[:8]}")
+
+    @staticmethod
+    async def _speculate(generate: Callable[[], Awaitable[InterviewFeedback]]) -> InterviewFeedback:
+        # A speculation may be wasted, so it must not crowd out calls a user is waiting on
+        with llm_priority(LLMPriority.BACKGROUND):
+            return await generate()
+
+    async def take(self, session_id: Optional[str], questions_and_answers: List[Dict],
+                   settings: InterviewSettings) -> Optional[InterviewFeedback]:
+        """
+        Get the speculated feedback for exactly these answers, waiting if it is still running.
+
+        Returns None if there is no matching speculation or it failed, in
+        which case the caller generates feedback itself.
+        """
+        speculation = self._speculations.get(session_id)
+        if speculation is None:
+            self.misses += 1
+            return None
+
+        key, task = speculation
+        if key != self.make_key(questions_and_answers, settings):
+            self.stale += 1
+            self.cancel_session(session_id)
+            return None
+
+        ready = task.done()
+        start = time.monotonic()
+        try:
+            # Shielded so a client disconnecting from get_feedback doesn't kill the shared result
+            feedback = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            return None
+        except Exception as e:
+            self.failed += 1
+            self._speculations.pop(session_id, None)
+            print(f"Speculative feedback failed: {e}")
+            return None
+
+        if ready:
+            self.hits_ready += 1
+        else:
+            self.hits_waited += 1
+            self.wait_seconds += time.monotonic() - start
+        return feedback
+
+    def cancel_session(self, session_id: Optional[str]) -> None:
+        """Drop speculation for a session that is no longer current"""
+        speculation = self._speculations.pop(session_id, None)
+        if speculation and not speculation[1].done():
+            speculation[1].cancel()
+            self.cancelled += 1
+
+    def get_stats(self) -> Dict:
+        """Get speculation statistics"""
+        return {
+            'enabled': FeedbackSpeculationConfig.ENABLED,
+            'in_flight': sum(1 for _, task in self._speculations.values() if not task.done()),
+            'started': self.started,
+            'hits_ready': self.hits_ready,
+            'hits_waited': self.hits_waited,
+            'avg_wait_ms': round(self.wait_seconds / self.hits_waited * 1000, 1) if self.hits_waited else 0.0,
+            'misses': self.misses,
+            'stale': self.stale,
+            'failed': self.failed,
+            'cancelled': self.cancelled
+        }
+
+
+# Global feedback speculator instance
+feedback_speculator = FeedbackSpeculator()
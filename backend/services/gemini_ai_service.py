@@ -1,114 +1,229 @@
-import os
 import json
-import google.generativeai as genai
-from typing import List, Dict
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from models.interview_settings import InterviewSettings, Question
 from models.feedback import InterviewFeedback, FeedbackItem, QuestionScore, CategoryScores
 from config.prompts import AIPrompts
+from services.llm_service import llm_service, LLMCallSite
+from services.llm_metrics import llm_metrics
+from services.question_cache import question_cache
+from services.json_stream import JSONStreamParser
+from services.question_pool import question_pool
+from services.question_index import question_index
+from services.prompt_compiler import prompt_compiler, PromptSection, PromptCompilerConfig
+from services.answer_analysis import AnswerAnalyzer
+from services.skill_taxonomy import skill_matcher
 
 class GeminiAIService:
     @staticmethod
-    def _get_model():
-        """Get configured Gemini model"""
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
-        
-        genai.configure(api_key=api_key)
-        return genai.GenerativeModel('gemini-2.0-flash')
-    
-    @staticmethod
-    def generate_questions(settings: InterviewSettings, resume_text: str = None) -> List[Question]:
-        """Generate custom interview questions using Gemini AI"""
+    def _build_question_prompt(settings: InterviewSettings, resume_text: str = None) -> str:
+        """Build the question generation prompt from settings and resume context"""
+        interview_type = settings.interview_type.lower()
+        resume_info = ""
+        
+        # Include resume information for context, but with different emphasis based on interview type
+        if resume_text:
+            # Use AI-generated resume summary if available, otherwise the raw text
+            if hasattr(settings, 'ai_summary') and settings.ai_summary:
+                print(f"Using AI summary: {settings.ai_summary[:200]}...")
+                resume_info = settings.ai_summary
+            else:
+                print(f"No AI summary found, using raw text: {resume_text[:200]}...")
+                resume_info = resume_text
+        
+        # Fit the job description and resume into the prompt budget; whichever
+        # is the primary focus for this interview type is trimmed last
+        resume_is_primary = interview_type == 'resume'
+        sections = prompt_compiler.compile(LLMCallSite.QUESTION_GENERATION, [
+            PromptSection("job_description", settings.job_description, priority=1 if resume_is_primary else 2,
+                          strategy=PromptSection.EXTRACTIVE, min_tokens=100),
+            PromptSection("resume", resume_info, priority=2 if resume_is_primary else 1,
+                          min_tokens=100, max_tokens=None if settings.ai_summary else PromptCompilerConfig.RAW_RESUME_MAX_TOKENS),
+        ])
         
         # Build context for question generation
         context = f"""
         Job Title: {settings.job_title}
         Company: {settings.company_name}
-        Job Description: {settings.job_description}
+        Job Description: {sections["job_description"]}
         Job Level: {settings.job_level}
         Interview Type: {settings.interview_type}
         Difficulty: {settings.difficulty}
         Number of Questions: {settings.number_of_questions}
         """
         
-        # Include resume information for context, but with different emphasis based on interview type
-        if resume_text:
-            # Use AI-generated resume summary if available, otherwise truncate
-            if hasattr(settings, 'ai_summary') and settings.ai_summary:
-                print(f"Using AI summary: {settings.ai_summary[:200]}...")
-                resume_info = settings.ai_summary
-            else:
-                print(f"No AI summary found, using raw text: {resume_text[:200]}...")
-                resume_info = f"{resume_text[:1000]}..."
-            
-            # Add resume with different context based on interview type
-            if settings.interview_type.lower() == 'resume':
+        # Add resume with different context based on interview type
+        if resume_info:
+            resume_info = sections["resume"]
+            if interview_type == 'resume':
                 context += f"\nCandidate Resume (PRIMARY FOCUS): {resume_info}"
                 print("Resume interview - resume is PRIMARY focus")
-            elif settings.interview_type.lower() == 'technical':
+            elif interview_type == 'technical':
                 context += f"\nCandidate Background (for context only, focus on job requirements): {resume_info}"
                 print("Technical interview - resume for context, job role is PRIMARY focus")
-            elif settings.interview_type.lower() == 'behavioral':
+            elif interview_type == 'behavioral':
                 context += f"\nCandidate Background (for context only): {resume_info}"
                 print("Behavioral interview - resume for context, behavioral scenarios are PRIMARY focus")
             else:  # Mixed or other
                 context += f"\nCandidate Resume: {resume_info}"
                 print("Mixed interview - balanced focus on resume and job")
+            
+            # Which of the job's skills the resume shows, matched locally against the skill taxonomy
+            if settings.job_description.strip():
+                overlap = skill_matcher.keyword_overlap(resume_text, settings.job_description)
+                if overlap["matched"] or overlap["missing"]:
+                    context += f"\nJob Skills Shown on the Resume: {', '.join(overlap['matched']) or 'None'}"
+                    context += f"\nJob Skills Not on the Resume: {', '.join(overlap['missing']) or 'None'}"
         
-        prompt = AIPrompts.QUESTION_GENERATION_USER.format(
+        return AIPrompts.QUESTION_GENERATION_USER.format(
             number_of_questions=settings.number_of_questions,
             context=context,
             difficulty=settings.difficulty.lower(),
             job_level=settings.job_level.lower(),
-            interview_type=settings.interview_type.lower()
+            interview_type=interview_type
+        )
+    
+    @staticmethod
+    def _to_question(q_data: Dict, index: int, settings: InterviewSettings) -> Question:
+        """Convert one parsed question object into a Question"""
+        return Question(
+            id=q_data.get("id", index + 1),
+            question=q_data["question"],
+            question_type=q_data.get("question_type", settings.interview_type),
+            difficulty=q_data.get("difficulty", settings.difficulty)
+        )
+    
+    @staticmethod
+    def _renumber(questions: List[Question]) -> List[Question]:
+        """Give a combined question list sequential ids starting at 1"""
+        return [q.copy(update={"id": i + 1}) for i, q in enumerate(questions)]
+    
+    @staticmethod
+    async def _request_questions(settings: InterviewSettings, resume_text: str = None) -> List[Question]:
+        """Ask Gemini for a question set, raising if the response can't be used"""
+        prompt = GeminiAIService._build_question_prompt(settings, resume_text)
+        
+        def to_questions(questions_data: List[Dict]) -> List[Question]:
+            questions = [
+                GeminiAIService._to_question(q_data, i, settings)
+                for i, q_data in enumerate(questions_data)
+            ]
+            if not questions:
+                raise ValueError("Response contained no questions")
+            return questions
+        
+        # A set cut short by truncation is not worth keeping, so it is continued instead
+        return await llm_service.generate_json(
+            prompt, LLMCallSite.QUESTION_GENERATION, '[', convert=to_questions, require_complete=True
+        )
+    
+    @staticmethod
+    async def generate_questions(settings: InterviewSettings, resume_text: str = None, use_cache: bool = True) -> List[Question]:
+        """Generate custom interview questions using Gemini AI"""
+        
+        # Identical settings and resume context reuse a previously generated set
+        cache_key = question_cache.make_key(settings, resume_text)
+        if use_cache:
+            cached_questions = question_cache.get(cache_key)
+            if cached_questions:
+                print(f"Question cache hit: {cache_key[:12]}")
+                return cached_questions
+        
+        # Generic requests are served from the pre-generated pool when it has enough
+        pooled_questions = question_pool.take(settings, resume_text)
+        if pooled_questions:
+            return pooled_questions
+        
+        # Reuse good matches from previously generated questions, ask Gemini for the rest
+        retrieved_questions = question_index.retrieve(settings, resume_text)
+        remaining = settings.number_of_questions - len(retrieved_questions)
+        generated_questions = []
+        
+        if remaining > 0:
+            try:
+                generated_questions = await GeminiAIService._request_questions(
+                    settings.copy(update={"number_of_questions": remaining}), resume_text
+                )
+            except Exception as e:
+                print(f"Error calling Gemini: {e}")
+                # Top up with fallback questions so the client still gets a full set;
+                # only sets the model produced are cached
+                fallback_questions = GeminiAIService._get_fallback_questions(settings)[len(retrieved_questions):]
+                return GeminiAIService._renumber(retrieved_questions + fallback_questions)
+            question_index.add(generated_questions, settings, resume_text)
+        
+        questions = GeminiAIService._renumber(retrieved_questions + generated_questions)
+        question_cache.set(cache_key, questions)
+        return questions
+    
+    @staticmethod
+    async def stream_questions(settings: InterviewSettings, resume_text: str = None, use_cache: bool = True) -> AsyncIterator[Question]:
+        """
+        Generate interview questions, yielding each one as soon as it is parsed.
+
+        Gemini's streamed output goes through an incremental JSON array parser,
+        so the first question is available long before the full set is done.
+        Falls back to the canned questions if nothing usable was produced.
+        """
+        cache_key = question_cache.make_key(settings, resume_text)
+        if use_cache:
+            cached_questions = question_cache.get(cache_key)
+            if cached_questions:
+                print(f"Question cache hit: {cache_key[:12]}")
+                for question in cached_questions:
+                    yield question
+                return
+        
+        pooled_questions = question_pool.take(settings, resume_text)
+        if pooled_questions:
+            for question in pooled_questions:
+                yield question
+            return
+        
+        # Retrieved questions are ready immediately; stream the rest from Gemini
+        questions = question_index.retrieve(settings, resume_text)
+        for question in questions:
+            yield question
+        remaining = settings.number_of_questions - len(questions)
+        if remaining <= 0:
+            question_cache.set(cache_key, questions)
+            return
+        
+        prompt = GeminiAIService._build_question_prompt(
+            settings.copy(update={"number_of_questions": remaining}), resume_text
         )
+        parser = JSONStreamParser('[')
+        generated_questions = []
         
         try:
-            model = GeminiAIService._get_model()
-            print(f"Calling Gemini for question generation with prompt length: {len(prompt)}")
-            
-            response = model.generate_content(prompt)
-            response_text = response.text
+            async for chunk in llm_service.stream(prompt, LLMCallSite.QUESTION_GENERATION):
+                for q_data in parser.feed(chunk):
+                    question = GeminiAIService._to_question(q_data, len(questions), settings)
+                    question.id = len(questions) + 1
+                    questions.append(question)
+                    generated_questions.append(question)
+                    yield question
             
-            print(f"Gemini response received, length: {len(response_text)}")
+            llm_metrics.record_parse(LLMCallSite.QUESTION_GENERATION, parser.complete)
+            if not parser.complete:
+                raise ValueError("Streamed JSON array was not closed")
             
-            # Try to extract JSON from response
-            try:
-                # Find JSON array in response
-                start_idx = response_text.find('[')
-                end_idx = response_text.rfind(']') + 1
-                
-                if start_idx != -1 and end_idx != -1:
-                    json_text = response_text[start_idx:end_idx]
-                    questions_data = json.loads(json_text)
-                    
-                    # Convert to Question objects
-                    questions = []
-                    for i, q_data in enumerate(questions_data):
-                        questions.append(Question(
-                            id=q_data.get("id", i + 1),
-                            question=q_data["question"],
-                            question_type=q_data.get("question_type", settings.interview_type),
-                            difficulty=q_data.get("difficulty", settings.difficulty)
-                        ))
-                    
-                    return questions
-                else:
-                    raise ValueError("No JSON array found in response")
-                    
-            except (json.JSONDecodeError, ValueError) as e:
-                print(f"JSON parsing error: {e}")
-                print(f"Raw response: {response_text}")
-                return GeminiAIService._get_fallback_questions(settings)
+            question_index.add(generated_questions, settings, resume_text)
+            question_cache.set(cache_key, questions)
         
         except Exception as e:
-            print(f"Error calling Gemini: {e}")
-            return GeminiAIService._get_fallback_questions(settings)
+            print(f"Error streaming questions from Gemini: {e}")
+            if isinstance(e, json.JSONDecodeError):
+                llm_metrics.record_parse(LLMCallSite.QUESTION_GENERATION, False)
+            # Top up with fallback questions so the client still gets a full set
+            for question in GeminiAIService._get_fallback_questions(settings)[len(questions):]:
+                question.id = len(questions) + 1
+                questions.append(question)
+                yield question
     
     @staticmethod
     def _get_fallback_questions(settings: InterviewSettings) -> List[Question]:
         """Fallback questions if Gemini generation fails"""
+        llm_metrics.record_fallback(LLMCallSite.QUESTION_GENERATION, "_get_fallback_questions")
         fallback_questions = AIPrompts.FALLBACK_QUESTIONS
         
         questions_list = fallback_questions.get(settings.interview_type, fallback_questions["Mixed"])
@@ -125,41 +240,21 @@ class GeminiAIService:
         return questions
     
     @staticmethod
-    def generate_feedback(questions_and_answers: List[Dict], settings: InterviewSettings) -> InterviewFeedback:
-        """Generate comprehensive feedback using Gemini AI"""
+    def _screen_answers(questions_and_answers: List[Dict]) -> Optional[InterviewFeedback]:
+        """Return canned feedback for nonsensical or poor answers, or None if the LLM should grade them"""
+        analysis = AnswerAnalyzer.analyze_pairs(questions_and_answers)
         
-        # Check for nonsensical or test answers
-        has_nonsensical_answers = False
-        has_poor_quality_answers = False
-        
-        for qa in questions_and_answers:
-            answer = qa['answer'].lower().strip()
-            question = qa['question'].lower().strip()
-            
-            # Check for various types of nonsensical answers
-            if (answer in ['asdasdasdasd', 'test', 'testing', 'asdf', 'qwerty', '123', 'abc'] or 
-                len(answer) < 3 or 
-                answer.isdigit() or
-                # Check if answer is very similar to question (repeating question back)
-                (len(answer) > 10 and len(question) > 10 and 
-                 len(set(answer.split()) & set(question.split())) > len(answer.split()) * 0.6)):
-                has_nonsensical_answers = True
-                break
-            
-            # Check for poor quality answers (incomplete, very short, no substance)
-            if (len(answer.split()) < 5 or  # Very short answers (reduced from 15)
-                (answer.count('.') == 0 and len(answer.split()) < 20) or  # No complete sentences only for very short answers
-                answer in ['uh', 'um', 'yes', 'no', 'ok', 'sure'] or  # Single word responses
-                (len(answer.split()) < 10 and answer.endswith('for example'))):  # Very short incomplete thoughts
-                has_poor_quality_answers = True
-        
-        if has_nonsensical_answers:
+        if analysis.has_nonsensical:
             return GeminiAIService._get_test_feedback()
         
-        if has_poor_quality_answers:
+        if analysis.has_poor:
             return GeminiAIService._get_poor_quality_feedback()
         
-        # Build context for feedback generation
+        return None
+    
+    @staticmethod
+    def _build_feedback_prompt(questions_and_answers: List[Dict], settings: InterviewSettings) -> str:
+        """Build the feedback prompt from the interview responses"""
         context = f"""
         Job Position: {settings.job_title} at {settings.company_name}
         Job Level: {settings.job_level}
@@ -169,73 +264,128 @@ class GeminiAIService:
         Interview Responses:
         """
         
+        # Long answers are shortened evenly (keeping their opening and conclusion)
+        # so the prompt stays within budget however much the candidate wrote
+        sections = prompt_compiler.compile(LLMCallSite.FEEDBACK, [
+            section
+            for i, qa in enumerate(questions_and_answers)
+            for section in (
+                PromptSection(f"question_{i+1}", qa['question'], priority=2, max_tokens=PromptCompilerConfig.QUESTION_MAX_TOKENS),
+                PromptSection(f"answer_{i+1}", qa['answer'], priority=1, strategy=PromptSection.HEAD_TAIL, min_tokens=60),
+            )
+        ])
+        
         for i, qa in enumerate(questions_and_answers):
-            context += f"\nQuestion {i+1}: {qa['question']}\nAnswer: {qa['answer']}\n"
+            context += f"\nQuestion {i+1}: {sections[f'question_{i+1}']}\nAnswer: {sections[f'answer_{i+1}']}\n"
         
-        prompt = AIPrompts.FEEDBACK_USER_GENTLE.format(context=context)
+        return AIPrompts.FEEDBACK_USER_GENTLE.format(context=context)
+    
+    @staticmethod
+    def _build_feedback(feedback_data: Dict) -> InterviewFeedback:
+        """Convert parsed feedback JSON into an InterviewFeedback"""
+        # Convert to FeedbackItem objects
+        strengths = [FeedbackItem(**item) for item in feedback_data.get("strengths", [])]
+        weaknesses = [FeedbackItem(**item) for item in feedback_data.get("weaknesses", [])]
+        improvements = [FeedbackItem(**item) for item in feedback_data.get("improvements", [])]
+        
+        # Convert question scores
+        question_scores = []
+        for qs_data in feedback_data.get("question_scores", []):
+            question_scores.append(QuestionScore(**qs_data))
+        
+        # Convert category scores
+        category_scores_data = feedback_data.get("category_scores", {})
+        category_scores = CategoryScores(
+            communication=category_scores_data.get("communication", 5),
+            technical=category_scores_data.get("technical", 5),
+            problem_solving=category_scores_data.get("problem_solving", 5),
+            behavioral=category_scores_data.get("behavioral", 5)
+        )
+        
+        return InterviewFeedback(
+            overall_score=feedback_data.get("overall_score", 7),
+            question_scores=question_scores,
+            category_scores=category_scores,
+            strengths=strengths,
+            weaknesses=weaknesses,
+            improvements=improvements,
+            summary=feedback_data.get("summary", "Good overall performance.")
+        )
+    
+    @staticmethod
+    async def generate_feedback(questions_and_answers: List[Dict], settings: InterviewSettings) -> InterviewFeedback:
+        """Generate comprehensive feedback using Gemini AI"""
+        
+        screened_feedback = GeminiAIService._screen_answers(questions_and_answers)
+        if screened_feedback:
+            return screened_feedback
+        
+        prompt = GeminiAIService._build_feedback_prompt(questions_and_answers, settings)
         
         try:
-            model = GeminiAIService._get_model()
-            print(f"Calling Gemini for feedback generation with prompt length: {len(prompt)}")
-            
-            response = model.generate_content(prompt)
-            response_text = response.text
-            
-            print(f"Gemini feedback response received, length: {len(response_text)}")
-            
-            # Try to extract JSON from response
-            try:
-                # Find JSON object in response
-                start_idx = response_text.find('{')
-                end_idx = response_text.rfind('}') + 1
-                
-                if start_idx != -1 and end_idx != -1:
-                    json_text = response_text[start_idx:end_idx]
-                    feedback_data = json.loads(json_text)
-                    
-                    # Convert to FeedbackItem objects
-                    strengths = [FeedbackItem(**item) for item in feedback_data.get("strengths", [])]
-                    weaknesses = [FeedbackItem(**item) for item in feedback_data.get("weaknesses", [])]
-                    improvements = [FeedbackItem(**item) for item in feedback_data.get("improvements", [])]
-                    
-                    # Convert question scores
-                    question_scores = []
-                    for qs_data in feedback_data.get("question_scores", []):
-                        question_scores.append(QuestionScore(**qs_data))
-                    
-                    # Convert category scores
-                    category_scores_data = feedback_data.get("category_scores", {})
-                    category_scores = CategoryScores(
-                        communication=category_scores_data.get("communication", 5),
-                        technical=category_scores_data.get("technical", 5),
-                        problem_solving=category_scores_data.get("problem_solving", 5),
-                        behavioral=category_scores_data.get("behavioral", 5)
-                    )
-                    
-                    return InterviewFeedback(
-                        overall_score=feedback_data.get("overall_score", 7),
-                        question_scores=question_scores,
-                        category_scores=category_scores,
-                        strengths=strengths,
-                        weaknesses=weaknesses,
-                        improvements=improvements,
-                        summary=feedback_data.get("summary", "Good overall performance.")
-                    )
-                else:
-                    raise ValueError("No JSON object found in response")
-                    
-            except (json.JSONDecodeError, ValueError) as e:
-                print(f"JSON parsing error: {e}")
-                print(f"Raw response: {response_text}")
-                return GeminiAIService._get_fallback_feedback()
+            # _build_feedback fills missing fields with defaults, so cut-off feedback must be continued
+            return await llm_service.generate_json(
+                prompt, LLMCallSite.FEEDBACK, '{', convert=GeminiAIService._build_feedback, require_complete=True
+            )
         
         except Exception as e:
             print(f"Error calling Gemini for feedback: {e}")
             return GeminiAIService._get_fallback_feedback()
     
+    @staticmethod
+    def _feedback_section(key: str, value: Any) -> Any:
+        """Validate one streamed top-level feedback section"""
+        if key == "question_scores":
+            return [QuestionScore(**item).dict() for item in value]
+        if key in ("strengths", "weaknesses", "improvements"):
+            return [FeedbackItem(**item).dict() for item in value]
+        if key == "category_scores":
+            return CategoryScores(**value).dict()
+        return value
+    
+    @staticmethod
+    async def stream_feedback(questions_and_answers: List[Dict], settings: InterviewSettings) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Generate feedback, yielding (section, data) pairs as each section is parsed.
+
+        Sections are the top-level keys of the feedback JSON (question_scores,
+        category_scores, strengths, weaknesses, improvements, summary,
+        overall_score). The last pair is always ("feedback", InterviewFeedback)
+        with the fully validated result, which may be a fallback on errors.
+        """
+        screened_feedback = GeminiAIService._screen_answers(questions_and_answers)
+        if screened_feedback:
+            yield "feedback", screened_feedback
+            return
+        
+        prompt = GeminiAIService._build_feedback_prompt(questions_and_answers, settings)
+        parser = JSONStreamParser('{')
+        feedback_data = {}
+        
+        try:
+            async for chunk in llm_service.stream(prompt, LLMCallSite.FEEDBACK):
+                for key, value in parser.feed(chunk):
+                    feedback_data[key] = value
+                    yield key, GeminiAIService._feedback_section(key, value)
+            
+            llm_metrics.record_parse(LLMCallSite.FEEDBACK, parser.complete)
+            if not parser.complete:
+                raise ValueError("Streamed JSON object was not closed")
+            
+            feedback = GeminiAIService._build_feedback(feedback_data)
+        
+        except Exception as e:
+            print(f"Error streaming feedback from Gemini: {e}")
+            if isinstance(e, json.JSONDecodeError):
+                llm_metrics.record_parse(LLMCallSite.FEEDBACK, False)
+            feedback = GeminiAIService._get_fallback_feedback()
+        
+        yield "feedback", feedback
+    
     @staticmethod
     def _get_test_feedback() -> InterviewFeedback:
         """Feedback for test/nonsensical answers"""
+        llm_metrics.record_fallback(LLMCallSite.FEEDBACK, "_get_test_feedback")
         feedback_data = AIPrompts.TEST_FEEDBACK
         
         # Convert question scores
@@ -262,6 +412,7 @@ class GeminiAIService:
     @staticmethod
     def _get_poor_quality_feedback() -> InterviewFeedback:
         """Feedback for incomplete/poor quality answers"""
+        llm_metrics.record_fallback(LLMCallSite.FEEDBACK, "_get_poor_quality_feedback")
         feedback_data = AIPrompts.POOR_QUALITY_FEEDBACK
         
         # Convert question scores
@@ -288,6 +439,7 @@ class GeminiAIService:
     @staticmethod
     def _get_fallback_feedback() -> InterviewFeedback:
         """Fallback feedback if Gemini generation fails"""
+        llm_metrics.record_fallback(LLMCallSite.FEEDBACK, "_get_fallback_feedback")
         feedback_data = AIPrompts.FALLBACK_FEEDBACK
         
         # Convert question scores
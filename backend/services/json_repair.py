@@ -0,0 +1,141 @@
+"""Tolerant JSON extraction for LLM responses: code fences, trailing commas and truncated output"""
+import re
+import json
+from typing import Any, List, Optional
+
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*\n?")
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+class JSONRepairError(ValueError):
+    """Raised when no JSON value could be recovered from a response"""
+
+    def __init__(self, message: str, truncated: bool = False):
+        super().__init__(message)
+        self.truncated = truncated
+
+
+class JSONRepairResult:
+    """A value recovered from a response and how much repair it needed"""
+
+    def __init__(self, value: Any, repaired: bool, truncated: bool):
+        self.value = value
+        self.repaired = repaired      # Anything beyond slicing out the JSON was needed
+        self.truncated = truncated    # The response stopped before the JSON was closed
+
+
+def _strict(text: str, container: str) -> Optional[Any]:
+    """The original extraction: from the first opener to the last closer"""
+    start_idx = text.find(container)
+    end_idx = text.rfind(_CLOSERS[container]) + 1
+    if start_idx == -1 or end_idx <= start_idx:
+        return None
+    try:
+        return json.loads(text[start_idx:end_idx])
+    except json.JSONDecodeError:
+        return None
+
+
+def _close(out: List[str], stack: List[str]) -> str:
+    text = "".join(out).rstrip()
+    if text.endswith(','):
+        text = text[:-1]
+    return text + "".join(_CLOSERS[opener] for opener in reversed(stack))
+
+
+def _repair(text: str, container: str):
+    """
+    Rebuild the first top-level JSON value in text in one pass.
+
+    Trailing commas are dropped as closers are met. If the text ends before
+    the value is closed, everything after the last complete element is cut
+    and the open containers are closed, so a response truncated mid-item
+    keeps all the items before it.
+
+    Returns:
+        (repaired text, truncated)
+    """
+    start = text.find(container)
+    if start == -1:
+        raise JSONRepairError(f"No JSON {'object' if container == '{' else 'array'} found in response")
+
+    out: List[str] = []
+    stack: List[str] = []
+    in_string = escaped = False
+    # Output length and open containers at the last point where the value could be cut and closed
+    safe_len, safe_stack = 0, []
+
+    for char in text[start:]:
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+            elif char == '\n':
+                # Raw newlines are invalid inside JSON strings
+                out[-1] = '\\n'
+            continue
+
+        if char == '"':
+            in_string = True
+            out.append(char)
+        elif char in _CLOSERS:
+            stack.append(char)
+            out.append(char)
+            if len(stack) == 1:
+                # Cutting right after a nested opener would leave an empty element behind
+                safe_len, safe_stack = len(out), list(stack)
+        elif char in '}]':
+            if not stack or _CLOSERS[stack[-1]] != char:
+                raise JSONRepairError(f"Unbalanced '{char}' in response")
+            while out and out[-1] in ' \t\r\n':
+                out.pop()
+            if out and out[-1] == ',':
+                out.pop()
+            stack.pop()
+            out.append(char)
+            if not stack:
+                return "".join(out), False
+            safe_len, safe_stack = len(out), list(stack)
+        elif char == ',':
+            safe_len, safe_stack = len(out), list(stack)
+            out.append(char)
+        elif char == '`':
+            # A closing code fence before the value was closed
+            break
+        else:
+            out.append(char)
+
+    return _close(out[:safe_len], safe_stack), True
+
+
+def load_json(text: str, container: str = '{') -> JSONRepairResult:
+    """
+    Parse the JSON value an LLM response contains, repairing it if needed.
+
+    Well-formed responses are parsed exactly as before (first opener to last
+    closer). Otherwise code fences are stripped and the value is rebuilt
+    with trailing commas removed and truncated containers closed.
+
+    Args:
+        text: Raw response text
+        container: '{' for an object, '[' for an array
+
+    Returns:
+        JSONRepairResult with the parsed value
+
+    Raises:
+        JSONRepairError: If nothing parseable could be recovered
+    """
+    value = _strict(text, container)
+    if value is not None:
+        return JSONRepairResult(value, repaired=False, truncated=False)
+
+    repaired, truncated = _repair(_FENCE_RE.sub("", text), container)
+    try:
+        return JSONRepairResult(json.loads(repaired), repaired=True, truncated=truncated)
+    except json.JSONDecodeError as e:
+        raise JSONRepairError(f"Could not repair JSON in response: {e}", truncated=truncated)
@@ -0,0 +1,119 @@
+"""Incremental parsers for JSON streamed from the LLM in chunks"""
+import json
+from typing import Any, List
+
+
+class JSONStreamParser:
+    """
+    Parses the top level of a JSON array or object as text arrives.
+
+    Text before the opening bracket (e.g. a ```json fence) is skipped. Each
+    call to feed() returns the top-level values that became complete with
+    that chunk: array elements for '[' and (key, value) pairs for '{'.
+    """
+
+    def __init__(self, container: str = '['):
+        if container not in ('[', '{'):
+            raise ValueError("container must be '[' or '{'")
+        self.container = container
+        self.complete = False
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._value_start = None
+        self._key_start = None
+        self._key = None
+        self._expect_key = container == '{'
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Feed the next chunk of text and return newly completed values"""
+        if self.complete or not chunk:
+            return []
+
+        self._buffer += chunk
+        results = []
+        buffer = self._buffer
+        i = self._pos
+
+        while i < len(buffer):
+            ch = buffer[i]
+
+            if not self._started:
+                if ch == self.container:
+                    self._started = True
+                    self._depth = 1
+                i += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._key_start is not None:
+                            self._key = json.loads(buffer[self._key_start:i + 1])
+                            self._key_start = None
+                        elif self._value_start is not None:
+                            self._emit(buffer, i + 1, results)
+                i += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    if self._expect_key:
+                        self._key_start = i
+                    elif self._value_start is None:
+                        self._value_start = i
+            elif ch in '[{':
+                if self._depth == 1 and self._value_start is None:
+                    self._value_start = i
+                self._depth += 1
+            elif ch in ']}':
+                self._depth -= 1
+                if self._depth == 1 and self._value_start is not None:
+                    self._emit(buffer, i + 1, results)
+                elif self._depth == 0:
+                    if self._value_start is not None:
+                        self._emit(buffer, i, results)
+                    self.complete = True
+                    break
+            elif self._depth == 1:
+                if ch == ',':
+                    if self._value_start is not None:
+                        self._emit(buffer, i, results)
+                    self._expect_key = self.container == '{'
+                elif ch == ':' and self.container == '{':
+                    self._expect_key = False
+                elif not ch.isspace() and self._value_start is None and not self._expect_key:
+                    # Start of a number, true, false or null
+                    self._value_start = i
+            i += 1
+
+        # Drop consumed text so the buffer only holds the value in progress
+        keep_from = min(x for x in (i, self._value_start, self._key_start) if x is not None)
+        self._buffer = buffer[keep_from:]
+        self._pos = i - keep_from
+        if self._value_start is not None:
+            self._value_start -= keep_from
+        if self._key_start is not None:
+            self._key_start -= keep_from
+
+        return results
+
+    def _emit(self, buffer: str, end: int, results: List[Any]) -> None:
+        value = json.loads(buffer[self._value_start:end])
+        self._value_start = None
+        if self.container == '{':
+            results.append((self._key, value))
+            self._key = None
+            self._expect_key = True
+        else:
+            results.append(value)
+
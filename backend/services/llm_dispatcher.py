@@ -0,0 +1,225 @@
+"""Central dispatch queue bounding concurrent LLM calls, with priorities and load shedding"""
+import os
+import math
+import time
+import heapq
+import asyncio
+import itertools
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class LLMPriority:
+    """Dispatch priorities, lowest value served first"""
+    FEEDBACK = 0      # Interactive: the user is waiting on their results
+    QUESTIONS = 1     # Interactive: starting an interview, uploading a resume
+    BACKGROUND = 2    # Prefetching: pool refills, per-answer scoring, speculation
+
+    NAMES = {FEEDBACK: "feedback", QUESTIONS: "questions", BACKGROUND: "background"}
+
+
+class LLMDispatchConfig:
+    # Most LLM calls in flight at once per worker
+    MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+    # Queued calls beyond which interactive requests are shed; background
+    # work is shed at half this depth so it never crowds out users
+    MAX_QUEUE_DEPTH = int(os.getenv("LLM_MAX_QUEUE_DEPTH", "50"))
+
+    # Bounds for the Retry-After hint sent with shed requests
+    MIN_RETRY_AFTER = 1
+    MAX_RETRY_AFTER = 60
+
+    # Recent queue waits kept per priority for metrics
+    WAIT_WINDOW = 500
+
+
+class LLMOverloadedError(Exception):
+    """Raised when the dispatch queue is too deep to accept another call"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# Priority of LLM calls made from the current task (and tasks it creates)
+_current_priority: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("llm_priority", default=None)
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """Run LLM calls in this block (and tasks spawned from it) at the given priority"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Optional[int]:
+    """Priority set by an enclosing llm_priority block, if any"""
+    return _current_priority.get()
+
+
+class LLMDispatcher:
+    """
+    Bounded-concurrency gate in front of the LLM provider.
+
+    Up to max_concurrency calls run at once; the rest wait in a heap ordered
+    by priority, then arrival. When the queue is deeper than a priority's
+    limit, a new call first displaces the newest lower-priority waiter; if
+    there is none it is refused immediately with a Retry-After estimate
+    instead of queueing behind work that cannot finish in time.
+    """
+
+    def __init__(self, max_concurrency: int = None, max_queue_depth: int = None):
+        self.max_concurrency = max(1, max_concurrency or LLMDispatchConfig.MAX_CONCURRENCY)
+        self.max_queue_depth = max(1, max_queue_depth or LLMDispatchConfig.MAX_QUEUE_DEPTH)
+        self._active = 0
+        self._queue: List = []
+        self._seq = itertools.count()
+        self._queued_by_priority: Dict[int, int] = {p: 0 for p in LLMPriority.NAMES}
+        self._waits: Dict[int, deque] = {p: deque(maxlen=LLMDispatchConfig.WAIT_WINDOW) for p in LLMPriority.NAMES}
+        self._admitted: Dict[int, int] = {p: 0 for p in LLMPriority.NAMES}
+        self._shed: Dict[int, int] = {p: 0 for p in LLMPriority.NAMES}
+        self._max_depth_seen = 0
+        # Smoothed seconds a call holds its slot, for Retry-After estimates
+        self._service_time = 2.0
+        self._held_since: Dict[int, float] = {}
+
+    @property
+    def depth(self) -> int:
+        return sum(self._queued_by_priority.values())
+
+    def depth_limit(self, priority: int) -> int:
+        return self.max_queue_depth // 2 if priority >= LLMPriority.BACKGROUND else self.max_queue_depth
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue is likely to have drained"""
+        estimate = math.ceil((self.depth + 1) / self.max_concurrency * self._service_time)
+        return min(max(estimate, LLMDispatchConfig.MIN_RETRY_AFTER), LLMDispatchConfig.MAX_RETRY_AFTER)
+
+    def _overloaded_error(self, priority: int) -> LLMOverloadedError:
+        self._shed[priority] += 1
+        return LLMOverloadedError(
+            f"LLM queue is full ({self.depth} waiting, {LLMPriority.NAMES[priority]} limit "
+            f"{self.depth_limit(priority)})",
+            self.retry_after()
+        )
+
+    def _evict_lower(self, priority: int) -> bool:
+        """Shed the newest queued call of a lower priority to make room; False if there is none"""
+        live = [entry for entry in self._queue if entry[2] is not None and entry[0] > priority]
+        if not live:
+            return False
+        victim = max(live, key=lambda entry: (entry[0], entry[1]))
+        future, victim[2] = victim[2], None
+        self._queued_by_priority[victim[0]] -= 1
+        if not future.done():
+            future.set_exception(self._overloaded_error(victim[0]))
+        return True
+
+    def is_overloaded(self, priority: int) -> bool:
+        """Whether a new call at this priority would be shed"""
+        if self._active < self.max_concurrency or self.depth < self.depth_limit(priority):
+            return False
+        # Background work queued ahead of an interactive call gives way to it
+        return not any(entry[2] is not None and entry[0] > priority for entry in self._queue)
+
+    def check(self, priority: int) -> None:
+        """Raise LLMOverloadedError if a new call at this priority would be shed"""
+        if self.is_overloaded(priority):
+            raise self._overloaded_error(priority)
+
+    def _grant(self, priority: int, waited: float) -> int:
+        self._active += 1
+        self._admitted[priority] += 1
+        self._waits[priority].append(waited)
+        ticket = next(self._seq)
+        self._held_since[ticket] = time.monotonic()
+        return ticket
+
+    def try_acquire(self, priority: int) -> Optional[int]:
+        """Take a slot only if one is free right now and nobody is queued"""
+        if self._active < self.max_concurrency and self.depth == 0:
+            return self._grant(priority, 0.0)
+        return None
+
+    async def acquire(self, priority: int) -> int:
+        """
+        Wait for a call slot.
+
+        Returns:
+            int: Ticket to pass to release()
+
+        Raises:
+            LLMOverloadedError: If the queue is too deep for this priority
+        """
+        ticket = self.try_acquire(priority)
+        if ticket is not None:
+            return ticket
+        self.check(priority)
+        if self.depth >= self.depth_limit(priority):
+            self._evict_lower(priority)
+
+        future = asyncio.get_running_loop().create_future()
+        entry = [priority, next(self._seq), future, time.monotonic()]
+        heapq.heappush(self._queue, entry)
+        self._queued_by_priority[priority] += 1
+        self._max_depth_seen = max(self._max_depth_seen, self.depth)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the waiter gave up: hand the slot on
+                self.release(future.result())
+            elif entry[2] is not None:
+                entry[2] = None
+                self._queued_by_priority[priority] -= 1
+            raise
+
+    def release(self, ticket: int) -> None:
+        """Return a slot and hand it to the highest-priority waiter"""
+        held_since = self._held_since.pop(ticket, None)
+        if held_since is not None:
+            self._service_time = 0.9 * self._service_time + 0.1 * (time.monotonic() - held_since)
+        self._active -= 1
+
+        while self._queue and self._active < self.max_concurrency:
+            entry = heapq.heappop(self._queue)
+            priority, _, future, queued_at = entry
+            if future is None:
+                continue  # Waiter cancelled
+            entry[2] = None
+            self._queued_by_priority[priority] -= 1
+            if future.done():
+                continue
+            future.set_result(self._grant(priority, time.monotonic() - queued_at))
+
+    @staticmethod
+    def _percentile(values, pct: float) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+    def get_stats(self) -> Dict:
+        """Get queue depth, wait times and shedding per priority"""
+        return {
+            'max_concurrency': self.max_concurrency,
+            'max_queue_depth': self.max_queue_depth,
+            'in_flight': self._active,
+            'queue_depth': self.depth,
+            'max_queue_depth_seen': self._max_depth_seen,
+            'avg_call_seconds': round(self._service_time, 2),
+            'priorities': {
+                name: {
+                    'queued': self._queued_by_priority[priority],
+                    'admitted': self._admitted[priority],
+                    'shed': self._shed[priority],
+                    'wait_p50_ms': round(self._percentile(self._waits[priority], 50) * 1000, 1),
+                    'wait_p95_ms': round(self._percentile(self._waits[priority], 95) * 1000, 1)
+                }
+                for priority, name in LLMPriority.NAMES.items()
+            }
+        }
@@ -0,0 +1,246 @@
+"""Per-call LLM instrumentation aggregated into scrapeable histograms"""
+import os
+import bisect
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+class LLMMetricsConfig:
+    # Print one structured line per LLM call
+    LOG_CALLS = os.getenv("LLM_LOG_CALLS", "true").lower() == "true"
+
+    # Histogram bucket upper bounds
+    DURATION_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+    TOKEN_BUCKETS = (32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+
+class LLMCallOutcome:
+    """How an LLM call ended"""
+    OK = "ok"
+    TIMEOUT = "timeout"
+    ERROR = "error"
+    CIRCUIT_OPEN = "circuit_open"
+    OVERLOADED = "overloaded"
+    CANCELLED = "cancelled"  # The caller stopped reading (e.g. a streaming client disconnected)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style (not thread-safe on its own)"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: "Histogram") -> None:
+        """Add another histogram with the same buckets into this one"""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile (None if empty or past the last bucket)"""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return None
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs including +Inf"""
+        pairs, seen = [], 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            pairs.append((f"{bound:g}", seen))
+        pairs.append(("+Inf", self.count))
+        return pairs
+
+
+class LLMMetrics:
+    """
+    Records every LLM call with its call site, model, prompt and response
+    sizes, wall time and outcome, plus JSON parse results and fallbacks
+    served per call site.
+
+    Wall time is measured from when the call is made to when it returns, so
+    it includes time queued for a dispatch slot. Token counts use the same
+    local estimate as the prompt compiler.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (call_site, model) -> histogram
+        self._durations: Dict[Tuple[str, str], Histogram] = {}
+        self._prompt_tokens: Dict[Tuple[str, str], Histogram] = {}
+        self._response_tokens: Dict[Tuple[str, str], Histogram] = {}
+        # (call_site, model) -> total characters
+        self._prompt_chars: Dict[Tuple[str, str], int] = {}
+        self._response_chars: Dict[Tuple[str, str], int] = {}
+        # (call_site, model, outcome) -> calls
+        self._outcomes: Dict[Tuple[str, str, str], int] = {}
+        # (call_site, success) -> parses
+        self._parses: Dict[Tuple[str, bool], int] = {}
+        # (call_site, fallback) -> times served
+        self._fallbacks: Dict[Tuple[str, str], int] = {}
+        # (call_site, method) -> responses made usable by repair or continuation
+        self._repairs: Dict[Tuple[str, str], int] = {}
+
+    def record_call(self, call_site: str, model: str, prompt: str, response: Optional[str],
+                    seconds: float, outcome: str = LLMCallOutcome.OK) -> None:
+        """
+        Record one LLM call.
+
+        Args:
+            call_site: LLMCallSite name
+            model: Model the call went to
+            prompt: Prompt text sent
+            response: Response text, or None if the call failed
+            seconds: Wall time of the call
+            outcome: One of the LLMCallOutcome values
+        """
+        # Imported here to avoid a circular import with the prompt compiler
+        from services.prompt_compiler import count_tokens
+
+        response = response or ""
+        prompt_tokens = count_tokens(prompt)
+        response_tokens = count_tokens(response)
+        key = (call_site, model)
+
+        with self._lock:
+            self._durations.setdefault(key, Histogram(LLMMetricsConfig.DURATION_BUCKETS)).observe(seconds)
+            self._prompt_tokens.setdefault(key, Histogram(LLMMetricsConfig.TOKEN_BUCKETS)).observe(prompt_tokens)
+            self._prompt_chars[key] = self._prompt_chars.get(key, 0) + len(prompt)
+            if outcome == LLMCallOutcome.OK:
+                self._response_tokens.setdefault(key, Histogram(LLMMetricsConfig.TOKEN_BUCKETS)).observe(response_tokens)
+                self._response_chars[key] = self._response_chars.get(key, 0) + len(response)
+            outcome_key = (call_site, model, outcome)
+            self._outcomes[outcome_key] = self._outcomes.get(outcome_key, 0) + 1
+
+        if LLMMetricsConfig.LOG_CALLS:
+            print(f"LLM call {call_site} [{model}] {outcome} in {seconds * 1000:.0f} ms: "
+                  f"prompt {len(prompt)} chars/{prompt_tokens} tokens, "
+                  f"response {len(response)} chars/{response_tokens} tokens")
+
+    def record_parse(self, call_site: str, success: bool) -> None:
+        """Record whether an LLM response parsed into the expected JSON"""
+        with self._lock:
+            self._parses[(call_site, success)] = self._parses.get((call_site, success), 0) + 1
+
+    def record_fallback(self, call_site: str, fallback: str) -> None:
+        """Record that a canned/fallback result was served instead of an LLM one"""
+        with self._lock:
+            self._fallbacks[(call_site, fallback)] = self._fallbacks.get((call_site, fallback), 0) + 1
+
+    def record_repair(self, call_site: str, method: str) -> None:
+        """Record a malformed response salvaged locally ("repaired") or with a follow-up call ("continued")"""
+        with self._lock:
+            self._repairs[(call_site, method)] = self._repairs.get((call_site, method), 0) + 1
+
+    def get_stats(self) -> Dict:
+        """Per call site summary: calls by outcome, latency, sizes, parse failures and fallbacks"""
+        with self._lock:
+            call_sites = sorted({site for site, _ in self._durations} | {site for site, _ in self._parses}
+                                | {site for site, _ in self._fallbacks})
+            stats = {}
+            for call_site in call_sites:
+                durations = [h for (site, _), h in self._durations.items() if site == call_site]
+                count = sum(h.count for h in durations)
+                prompt_count = sum(h.count for (site, _), h in self._prompt_tokens.items() if site == call_site)
+                response_count = sum(h.count for (site, _), h in self._response_tokens.items() if site == call_site)
+                parsed = self._parses.get((call_site, True), 0)
+                unparsed = self._parses.get((call_site, False), 0)
+                merged = Histogram(LLMMetricsConfig.DURATION_BUCKETS)
+                for h in durations:
+                    merged.merge(h)
+                outcomes: Dict[str, int] = {}
+                for (site, _, outcome), n in self._outcomes.items():
+                    if site == call_site:
+                        outcomes[outcome] = outcomes.get(outcome, 0) + n
+                stats[call_site] = {
+                    'calls': count,
+                    'outcomes': outcomes,
+                    'avg_ms': round(merged.sum / count * 1000, 1) if count else 0.0,
+                    'p50_ms_le': self._ms(merged.quantile(0.5)),
+                    'p95_ms_le': self._ms(merged.quantile(0.95)),
+                    'avg_prompt_tokens': round(sum(
+                        h.sum for (site, _), h in self._prompt_tokens.items() if site == call_site
+                    ) / prompt_count) if prompt_count else 0,
+                    'avg_response_tokens': round(sum(
+                        h.sum for (site, _), h in self._response_tokens.items() if site == call_site
+                    ) / response_count) if response_count else 0,
+                    'parse_failure_rate': round(unparsed / (parsed + unparsed), 3) if parsed + unparsed else 0.0,
+                    'repairs': {
+                        method: n for (site, method), n in self._repairs.items() if site == call_site
+                    },
+                    'fallbacks': {
+                        fallback: n for (site, fallback), n in self._fallbacks.items() if site == call_site
+                    }
+                }
+            return stats
+
+    @staticmethod
+    def _ms(seconds: Optional[float]) -> Optional[float]:
+        return round(seconds * 1000) if seconds is not None else None
+
+    @staticmethod
+    def _labels(**labels) -> str:
+        def escape(value) -> str:
+            return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels.items()) + "}"
+
+    def _render_histogram(self, lines: List[str], name: str, help_text: str,
+                          histograms: Dict[Tuple[str, str], Histogram]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for (call_site, model), histogram in sorted(histograms.items()):
+            for le, cumulative in histogram.cumulative():
+                lines.append(f"{name}_bucket{self._labels(call_site=call_site, model=model, le=le)} {cumulative}")
+            lines.append(f"{name}_sum{self._labels(call_site=call_site, model=model)} {histogram.sum:g}")
+            lines.append(f"{name}_count{self._labels(call_site=call_site, model=model)} {histogram.count}")
+
+    def _render_counter(self, lines: List[str], name: str, help_text: str,
+                        values: Dict[Tuple, int], label_names: Tuple[str, ...]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for key, value in sorted(values.items(), key=lambda item: tuple(map(str, item[0]))):
+            lines.append(f"{name}{self._labels(**dict(zip(label_names, map(str, key))))} {value}")
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            self._render_histogram(lines, "mockmate_llm_call_duration_seconds",
+                                   "Wall time of LLM calls, including time queued for a slot", self._durations)
+            self._render_histogram(lines, "mockmate_llm_prompt_tokens",
+                                   "Estimated prompt tokens per LLM call", self._prompt_tokens)
+            self._render_histogram(lines, "mockmate_llm_response_tokens",
+                                   "Estimated response tokens per successful LLM call", self._response_tokens)
+            self._render_counter(lines, "mockmate_llm_prompt_chars_total",
+                                 "Prompt characters sent", self._prompt_chars, ("call_site", "model"))
+            self._render_counter(lines, "mockmate_llm_response_chars_total",
+                                 "Response characters received", self._response_chars, ("call_site", "model"))
+            self._render_counter(lines, "mockmate_llm_calls_total",
+                                 "LLM calls by outcome", self._outcomes, ("call_site", "model", "outcome"))
+            parses = {(site, "true" if ok else "false"): n for (site, ok), n in self._parses.items()}
+            self._render_counter(lines, "mockmate_llm_json_parse_total",
+                                 "LLM responses parsed as JSON, by success", parses, ("call_site", "success"))
+            self._render_counter(lines, "mockmate_llm_json_repairs_total",
+                                 "Malformed LLM responses made usable, by method", self._repairs,
+                                 ("call_site", "method"))
+            self._render_counter(lines, "mockmate_llm_fallbacks_total",
+                                 "Fallback results served instead of LLM output", self._fallbacks,
+                                 ("call_site", "fallback"))
+        return "\n".join(lines) + "\n"
+
+
+# Global LLM metrics instance
+llm_metrics = LLMMetrics()
@@ -0,0 +1,361 @@
+"""LLM backends: Gemini for production, a deterministic stub for load tests"""
+import os
+import re
+import abc
+import json
+import math
+import random
+import asyncio
+import hashlib
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from services.model_registry import model_registry
+from services.llm_service import LLMCallSite, LLMConfig
+
+
+class LLMProviderError(Exception):
+    """Raised when a provider fails to produce a completion"""
+
+
+class LLMProvider(abc.ABC):
+    """
+    Interface every LLM backend implements.
+
+    Timeouts, coalescing and other policies live in LLMService; providers
+    only turn a prompt into text.
+    """
+
+    name = "base"
+
+    def is_configured(self) -> bool:
+        """Whether the provider has what it needs (e.g. an API key) to serve calls"""
+        return True
+
+    @abc.abstractmethod
+    async def generate(self, prompt: str, call_site: str, model_name: str, timeout: float) -> str:
+        """Complete a prompt; raises on failure"""
+
+    @abc.abstractmethod
+    def stream(self, prompt: str, call_site: str, model_name: str, timeout: float) -> AsyncIterator[str]:
+        """Complete a prompt, yielding text as it is produced (implemented as an async generator)"""
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini through the async SDK and the shared model registry"""
+
+    name = "gemini"
+
+    JSON_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+    def is_configured(self) -> bool:
+        return bool(os.getenv("GEMINI_API_KEY"))
+
+    @staticmethod
+    def _generation_config(call_site: str) -> Optional[Dict]:
+        """Constrain output to JSON at call sites that parse it"""
+        if LLMConfig.STRUCTURED_OUTPUT and call_site in LLMConfig.JSON_CALL_SITES:
+            return GeminiProvider.JSON_GENERATION_CONFIG
+        return None
+
+    @staticmethod
+    def generation_configs() -> List[Optional[Dict]]:
+        """Every distinct generation config calls can use, for warming up model handles"""
+        configs = [None]
+        if LLMConfig.STRUCTURED_OUTPUT:
+            configs.append(GeminiProvider.JSON_GENERATION_CONFIG)
+        return configs
+
+    async def generate(self, prompt: str, call_site: str, model_name: str, timeout: float) -> str:
+        model = model_registry.get_model(model_name, GeminiProvider._generation_config(call_site))
+        response = await model.generate_content_async(prompt, request_options={"timeout": timeout})
+        return response.text
+
+    async def stream(self, prompt: str, call_site: str, model_name: str, timeout: float) -> AsyncIterator[str]:
+        model = model_registry.get_model(model_name, GeminiProvider._generation_config(call_site))
+        response = await model.generate_content_async(prompt, stream=True, request_options={"timeout": timeout})
+        async for chunk in response:
+            text = GeminiProvider._chunk_text(chunk)
+            if text:
+                yield text
+
+    @staticmethod
+    def _chunk_text(chunk) -> str:
+        """
+        Text of a streamed chunk, read from its parts.
+
+        chunk.text raises ValueError on chunks without text (a finish reason
+        only, or a candidate stopped by safety filters), so it isn't used.
+
+        Raises:
+            LLMProviderError: If the prompt itself was blocked
+        """
+        if not chunk.candidates:
+            block_reason = getattr(getattr(chunk, "prompt_feedback", None), "block_reason", None)
+            if block_reason:
+                raise LLMProviderError(f"Prompt blocked: {block_reason}")
+            return ""
+        content = chunk.candidates[0].content
+        parts = content.parts if content is not None else []
+        return "".join(part.text for part in parts if getattr(part, "text", None))
+
+
+class StubProviderConfig:
+    # Mean simulated latency per call in milliseconds
+    LATENCY_MS = float(os.getenv("LLM_STUB_LATENCY_MS", "1500"))
+
+    # Latency distribution: "fixed", "uniform" (mean +/- jitter) or "lognormal"
+    LATENCY_DISTRIBUTION = os.getenv("LLM_STUB_LATENCY_DISTRIBUTION", "lognormal")
+
+    # Spread: +/- range for uniform, sigma of the underlying normal for lognormal
+    LATENCY_JITTER_MS = float(os.getenv("LLM_STUB_LATENCY_JITTER_MS", "500"))
+    LATENCY_SIGMA = float(os.getenv("LLM_STUB_LATENCY_SIGMA", "0.5"))
+
+    # Extra latency per 1000 response characters, modelling output token
+    # generation time (0 = latency does not depend on response size)
+    OUTPUT_MS_PER_1K_CHARS = float(os.getenv("LLM_STUB_OUTPUT_MS_PER_1K_CHARS", "0"))
+
+    # Share of calls that raise LLMProviderError (0.0 - 1.0)
+    FAILURE_RATE = float(os.getenv("LLM_STUB_FAILURE_RATE", "0"))
+
+    # Share of non-streamed responses returned malformed (code fence, trailing
+    # comma or cut off), for exercising JSON repair (0.0 - 1.0)
+    MALFORMED_RATE = float(os.getenv("LLM_STUB_MALFORMED_RATE", "0"))
+
+    # Seed for the latency/failure sequence
+    SEED = int(os.getenv("LLM_STUB_SEED", "42"))
+
+    # Per-model overrides simulating different tiers, e.g.
+    # "gemini-2.0-flash-lite:600:0.1,gemini-2.5-flash:3000:0" (model:latency_ms[:malformed_rate])
+    TIERS = os.getenv("LLM_STUB_TIERS", "")
+
+    # Characters per streamed chunk
+    STREAM_CHUNK_CHARS = 40
+
+
+def parse_stub_tiers(value: str) -> Dict[str, Tuple[float, Optional[float]]]:
+    """Parse 'model:latency_ms[:malformed_rate],...' into per-model (latency_ms, malformed_rate)"""
+    tiers = {}
+    for item in value.split(","):
+        parts = [part.strip() for part in item.split(":")]
+        try:
+            if len(parts) in (2, 3) and parts[0]:
+                tiers[parts[0]] = (float(parts[1]), float(parts[2]) if len(parts) == 3 else None)
+        except ValueError:
+            continue
+    return tiers
+
+
+class StubProvider(LLMProvider):
+    """
+    Offline backend that returns schema-valid JSON for every call site.
+
+    Response content depends only on the prompt, so runs are reproducible.
+    Latency and failures come from a seeded generator following the
+    configured distribution, optionally per model to simulate tiers. This
+    makes it possible to benchmark routing, parsing and concurrency against
+    a realistically slow backend without spending quota.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency_ms: float = None, failure_rate: float = None, seed: int = None,
+                 output_ms_per_1k_chars: float = None, malformed_rate: float = None,
+                 tiers: Dict[str, Tuple[float, Optional[float]]] = None):
+        self.latency_ms = StubProviderConfig.LATENCY_MS if latency_ms is None else latency_ms
+        self.failure_rate = StubProviderConfig.FAILURE_RATE if failure_rate is None else failure_rate
+        self.malformed_rate = StubProviderConfig.MALFORMED_RATE if malformed_rate is None else malformed_rate
+        self.output_ms_per_1k_chars = StubProviderConfig.OUTPUT_MS_PER_1K_CHARS \
+            if output_ms_per_1k_chars is None else output_ms_per_1k_chars
+        self.tiers = parse_stub_tiers(StubProviderConfig.TIERS) if tiers is None else tiers
+        self._rng = random.Random(StubProviderConfig.SEED if seed is None else seed)
+        self.calls: int = 0
+
+    def _malformed_rate(self, model_name: str) -> float:
+        rate = self.tiers.get(model_name, (None, None))[1]
+        return self.malformed_rate if rate is None else rate
+
+    def _sample_latency(self, model_name: str) -> float:
+        mean_ms = self.tiers[model_name][0] if model_name in self.tiers else self.latency_ms
+        distribution = StubProviderConfig.LATENCY_DISTRIBUTION
+        if distribution == "uniform":
+            jitter = StubProviderConfig.LATENCY_JITTER_MS
+            latency_ms = self._rng.uniform(mean_ms - jitter, mean_ms + jitter)
+        elif distribution == "lognormal" and mean_ms > 0:
+            sigma = StubProviderConfig.LATENCY_SIGMA
+            # Choose mu so the distribution's mean equals the configured mean
+            mu = math.log(mean_ms) - sigma ** 2 / 2
+            latency_ms = self._rng.lognormvariate(mu, sigma)
+        else:
+            latency_ms = mean_ms
+        return max(latency_ms, 0) / 1000
+
+    async def _simulate(self, model_name: str, response_chars: int = 0) -> None:
+        self.calls += 1
+        latency = self._sample_latency(model_name) + response_chars * self.output_ms_per_1k_chars / 1_000_000
+        fails = self._rng.random() < self.failure_rate
+        await asyncio.sleep(latency)
+        if fails:
+            raise LLMProviderError("Simulated stub failure")
+
+    async def generate(self, prompt: str, call_site: str, model_name: str, timeout: float) -> str:
+        text = self.respond(prompt, call_site)
+        if call_site != LLMCallSite.JSON_CONTINUATION and self._rng.random() < self._malformed_rate(model_name):
+            text = self._malform(text)
+        await self._simulate(model_name, len(text))
+        return text
+
+    def _malform(self, text: str) -> str:
+        """Damage a response the way real model output goes wrong"""
+        kind = self._rng.choice(("fence", "trailing_comma", "truncated"))
+        if kind == "fence":
+            return f"```json\n{text}\n```"
+        if kind == "trailing_comma":
+            return re.sub(r'(["\d\]}])(\s*[\]}])', r'\1,\2', text, count=3)
+        return text[:int(len(text) * self._rng.uniform(0.5, 0.95))]
+
+    async def stream(self, prompt: str, call_site: str, model_name: str, timeout: float) -> AsyncIterator[str]:
+        text = self.respond(prompt, call_site)
+        await self._simulate(model_name, len(text))
+        size = StubProviderConfig.STREAM_CHUNK_CHARS
+        for i in range(0, len(text), size):
+            await asyncio.sleep(0)
+            yield text[i:i + size]
+
+    @staticmethod
+    def respond(prompt: str, call_site: str) -> str:
+        """Build a deterministic, schema-valid response for a prompt"""
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).hexdigest())
+        builders = {
+            LLMCallSite.QUESTION_GENERATION: StubProvider._questions,
+            LLMCallSite.FEEDBACK: StubProvider._feedback,
+            LLMCallSite.RESUME_ANALYSIS: StubProvider._resume_analysis,
+            LLMCallSite.RESUME_ANALYSIS_BATCH: StubProvider._resume_analysis_batch,
+            LLMCallSite.RESUME_HIGHLIGHTS: StubProvider._resume_highlights,
+            LLMCallSite.ANSWER_SCORING: StubProvider._answer_score,
+        }
+        if call_site == LLMCallSite.JSON_CONTINUATION:
+            return StubProvider._continuation(prompt)
+        builder = builders.get(call_site)
+        return json.dumps(builder(prompt, rng) if builder else {}, indent=2)
+
+    @staticmethod
+    def _continuation(prompt: str) -> str:
+        """The rest of whichever call site's response the partial response is a prefix of"""
+        original = re.search(r"<request>\n    (.*)\n    </request>", prompt, re.DOTALL)
+        partial = re.search(r"<partial_response>\n    (.*)\n    </partial_response>", prompt, re.DOTALL)
+        if not original or not partial:
+            return ""
+        for call_site in LLMConfig.JSON_CALL_SITES:
+            full = StubProvider.respond(original.group(1), call_site)
+            if full.startswith(partial.group(1)):
+                return full[len(partial.group(1)):]
+        return ""
+
+    @staticmethod
+    def _match(pattern: str, prompt: str, default: str) -> str:
+        match = re.search(pattern, prompt)
+        return match.group(1) if match else default
+
+    @staticmethod
+    def _questions(prompt: str, rng: random.Random) -> List[Dict]:
+        count = int(StubProvider._match(r"Generate (\d+) interview questions", prompt, "5"))
+        interview_type = StubProvider._match(r"Focus on (\w+) questions", prompt, "mixed")
+        difficulty = StubProvider._match(r"appropriate for (\w+) difficulty", prompt, "medium")
+        topics = ["system design", "debugging", "teamwork", "deadlines", "code quality",
+                  "stakeholder communication", "testing", "performance", "mentoring", "trade-offs"]
+        return [
+            {
+                "id": i + 1,
+                "question": f"Tell me how you approach {rng.choice(topics)} in your work (stub question {i + 1}).",
+                "question_type": interview_type,
+                "difficulty": difficulty
+            }
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def _feedback(prompt: str, rng: random.Random) -> Dict:
+        answered = len(re.findall(r"Question \d+:", prompt)) or 1
+        scores = [rng.randint(4, 9) for _ in range(answered)]
+        return {
+            "overall_score": round(sum(scores) / len(scores)),
+            "question_scores": [
+                {"question_index": i, "score": score, "feedback": f"Stub feedback for answer {i + 1}",
+                 "suggestions": ["Add a concrete example"]}
+                for i, score in enumerate(scores)
+            ],
+            "category_scores": {
+                "communication": rng.randint(4, 9), "technical": rng.randint(4, 9),
+                "problem_solving": rng.randint(4, 9), "behavioral": rng.randint(4, 9)
+            },
+            "strengths": [{"category": "strength", "title": "Clear structure",
+                           "description": "Answers followed a logical order", "suggestion": None}],
+            "weaknesses": [{"category": "weakness", "title": "Few metrics",
+                            "description": "Results were rarely quantified", "suggestion": "Quantify outcomes"}],
+            "improvements": [{"category": "improvement", "title": "Use STAR",
+                              "description": "Structure behavioral answers", "suggestion": "Practice STAR answers"}],
+            "summary": "Stub feedback summary."
+        }
+
+    @staticmethod
+    def _resume_analysis(prompt: str, rng: random.Random) -> Dict:
+        email = StubProvider._match(r"([\w.+-]+@[\w-]+\.[\w.]+)", prompt, None)
+        years = rng.randint(1, 15)
+        return {
+            "name": "Stub Candidate",
+            "email": email,
+            "phone": None,
+            "location": None,
+            "summary": "Stub professional summary.",
+            "experience_years": years,
+            "current_role": "Software Engineer",
+            "current_company": "Stub Corp",
+            "education": "B.Sc. Computer Science",
+            "skills": ["Problem Solving", "Communication"],
+            "technologies": ["Python", "SQL"],
+            "industries": ["Technology"],
+            "achievements": ["Shipped a stub feature"],
+            "certifications": [],
+            "languages": ["English"],
+            "experience_level": "senior" if years >= 8 else "mid" if years >= 3 else "entry",
+            "key_strengths": ["Ownership", "Collaboration"],
+            "career_progression": "Steady stub progression"
+        }
+
+    @staticmethod
+    def _resume_analysis_batch(prompt: str, rng: random.Random) -> Dict:
+        documents = re.findall(r'<document id="([\w-]+)">(.*?)</document>', prompt, re.DOTALL)
+        return {doc_id: StubProvider._resume_analysis(text, rng) for doc_id, text in documents}
+
+    @staticmethod
+    def _resume_highlights(prompt: str, rng: random.Random) -> Dict:
+        strengths = ["Ownership", "Collaboration", "Mentoring", "Delivery", "Communication", "Debugging"]
+        return {
+            "summary": "Stub professional summary.",
+            "key_strengths": rng.sample(strengths, 3),
+            "career_progression": "Steady stub progression"
+        }
+
+    @staticmethod
+    def _answer_score(prompt: str, rng: random.Random) -> Dict:
+        index = int(StubProvider._match(r'"question_index": (\d+)', prompt, "0"))
+        return {
+            "question_index": index,
+            "score": rng.randint(4, 9),
+            "feedback": f"Stub score for answer {index + 1}.",
+            "suggestions": ["Add a concrete example"],
+            "category_scores": {"communication": rng.randint(4, 9), "technical": None,
+                                "problem_solving": rng.randint(4, 9), "behavioral": rng.randint(4, 9)},
+            "strength": {"title": "Relevant example", "description": "Grounded the answer in real work"},
+            "weakness": None
+        }
+
+
+def create_provider(name: str) -> LLMProvider:
+    """Create the provider selected by LLM_PROVIDER"""
+    providers = {
+        GeminiProvider.name: GeminiProvider,
+        StubProvider.name: StubProvider,
+    }
+    if name not in providers:
+        raise ValueError(f"Unknown LLM provider '{name}'. Choose one of: {', '.join(providers)}")
+    return providers[name]()
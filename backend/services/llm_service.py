@@ -0,0 +1,488 @@
+"""Async LLM service layer shared by every AI code path"""
+import os
+import time
+import asyncio
+import hashlib
+import threading
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+from config.prompts import AIPrompts
+from services.singleflight import SingleFlight
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.llm_dispatcher import LLMDispatcher, LLMOverloadedError, LLMPriority, current_priority, llm_priority
+from services.llm_metrics import llm_metrics, LLMCallOutcome
+from services.json_repair import load_json, JSONRepairError
+from services.model_router import ModelRouter
+
+
+class LLMCallSite:
+    """Names for the places in the app that call the LLM"""
+    QUESTION_GENERATION = "question_generation"
+    FEEDBACK = "feedback"
+    RESUME_ANALYSIS = "resume_analysis"
+    RESUME_ANALYSIS_BATCH = "resume_analysis_batch"
+    RESUME_HIGHLIGHTS = "resume_highlights"
+    ANSWER_SCORING = "answer_scoring"
+    JSON_CONTINUATION = "json_continuation"
+
+
+class LLMConfig:
+    # Backend: "gemini" or "stub" (offline, for load tests)
+    PROVIDER = os.getenv("LLM_PROVIDER", "gemini").lower()
+
+    # Model used for every call unless model routing is enabled
+    DEFAULT_MODEL = "gemini-2.0-flash"
+
+    # Per-call latency budgets in seconds, overridable from the environment.
+    # A call that has not finished within its budget (hedge included) is
+    # abandoned and the caller serves its fallback.
+    TIMEOUTS = {
+        LLMCallSite.QUESTION_GENERATION: float(os.getenv("LLM_TIMEOUT_QUESTIONS", "20")),
+        LLMCallSite.FEEDBACK: float(os.getenv("LLM_TIMEOUT_FEEDBACK", "30")),
+        LLMCallSite.RESUME_ANALYSIS: float(os.getenv("LLM_TIMEOUT_RESUME", "20")),
+        LLMCallSite.RESUME_ANALYSIS_BATCH: float(os.getenv("LLM_TIMEOUT_RESUME_BATCH", "40")),
+        LLMCallSite.RESUME_HIGHLIGHTS: float(os.getenv("LLM_TIMEOUT_RESUME_HIGHLIGHTS", "15")),
+        LLMCallSite.ANSWER_SCORING: float(os.getenv("LLM_TIMEOUT_ANSWER_SCORING", "15")),
+    }
+    DEFAULT_TIMEOUT = float(os.getenv("LLM_TIMEOUT_DEFAULT", "20"))
+
+    # Send a second, identical request when the first one is slower than the
+    # call site's recent p95 latency, and use whichever finishes first
+    HEDGING_ENABLED = os.getenv("LLM_HEDGING_ENABLED", "false").lower() == "true"
+    HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+
+    # Successful calls observed per call site before hedging kicks in
+    HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+
+    # Recent latencies kept per call site
+    LATENCY_WINDOW = 200
+
+    # Dispatch priority per call site; background work overrides it with llm_priority()
+    PRIORITIES = {
+        LLMCallSite.FEEDBACK: LLMPriority.FEEDBACK,
+        LLMCallSite.QUESTION_GENERATION: LLMPriority.QUESTIONS,
+        LLMCallSite.RESUME_ANALYSIS: LLMPriority.QUESTIONS,
+        LLMCallSite.RESUME_ANALYSIS_BATCH: LLMPriority.QUESTIONS,
+        LLMCallSite.RESUME_HIGHLIGHTS: LLMPriority.QUESTIONS,
+        LLMCallSite.ANSWER_SCORING: LLMPriority.BACKGROUND,
+    }
+
+    # Ask the model for JSON output (response MIME type) at call sites that parse JSON
+    STRUCTURED_OUTPUT = os.getenv("LLM_STRUCTURED_OUTPUT", "true").lower() == "true"
+    JSON_CALL_SITES = frozenset([
+        LLMCallSite.QUESTION_GENERATION,
+        LLMCallSite.FEEDBACK,
+        LLMCallSite.RESUME_ANALYSIS,
+        LLMCallSite.RESUME_ANALYSIS_BATCH,
+        LLMCallSite.RESUME_HIGHLIGHTS,
+        LLMCallSite.ANSWER_SCORING,
+    ])
+
+    # Request the rest of a truncated JSON response when local repair can't make it usable
+    JSON_CONTINUATION = os.getenv("LLM_JSON_CONTINUATION", "true").lower() == "true"
+
+    @classmethod
+    def timeout_for(cls, call_site: str) -> float:
+        return cls.TIMEOUTS.get(call_site, cls.DEFAULT_TIMEOUT)
+
+    @classmethod
+    def priority_for(cls, call_site: str) -> int:
+        priority = current_priority()
+        return priority if priority is not None else cls.PRIORITIES.get(call_site, LLMPriority.QUESTIONS)
+
+
+class LLMTimeoutError(Exception):
+    """Raised when an LLM call does not finish within its timeout"""
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per call site"""
+
+    def __init__(self, window: int = None):
+        self.window = window or LLMConfig.LATENCY_WINDOW
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call_site: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(call_site, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, call_site: str, pct: float, min_samples: int = 1) -> Optional[float]:
+        """Latency percentile in seconds, or None with fewer than min_samples samples"""
+        with self._lock:
+            samples = sorted(self._samples.get(call_site, ()))
+        if len(samples) < max(min_samples, 1):
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+    def get_stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            call_sites = list(self._samples)
+        return {
+            call_site: {
+                'samples': len(self._samples[call_site]),
+                'p50_ms': round(self.percentile(call_site, 50) * 1000, 1),
+                'p95_ms': round(self.percentile(call_site, 95) * 1000, 1),
+                'budget_ms': round(LLMConfig.timeout_for(call_site) * 1000)
+            }
+            for call_site in call_sites
+        }
+
+
+class LLMService:
+    """
+    Non-blocking front door for every LLM call.
+
+    Calls go to the configured provider's async API so the event loop keeps
+    serving other requests while a generation is in flight. Identical prompts
+    that arrive while a call is running share that call instead of starting a
+    new one (double-clicks, frontend retries).
+
+    Every call takes a slot from the dispatch queue, which bounds concurrent
+    provider calls and serves interactive work before background work, and
+    runs inside its call site's latency budget (queueing included). With
+    hedging on, a call slower than the recent p95 gets a second request
+    raced against it if a slot is free.
+    Timeouts and provider errors feed a circuit breaker; while it is open,
+    calls fail immediately with CircuitOpenError so callers serve their
+    fallbacks without waiting on an unhealthy backend.
+    The model comes from the router: per call site and prompt size, adjusted
+    by observed latency and parse failures (always the default model unless
+    LLM_ROUTING_ENABLED is set).
+    Every provider call (and every call the breaker refuses) is recorded in
+    llm_metrics with its sizes, wall time and outcome.
+    """
+
+    def __init__(self, provider=None):
+        self._provider = provider
+        self.single_flight = SingleFlight()
+        self.breaker = CircuitBreaker("llm")
+        self.dispatcher = LLMDispatcher()
+        self.latency = LatencyTracker()
+        self.router = ModelRouter(default_model=LLMConfig.DEFAULT_MODEL)
+        self.hedges_sent: int = 0
+        self.hedges_won: int = 0
+
+    @property
+    def provider(self):
+        """The LLM backend, created from LLM_PROVIDER on first use"""
+        if self._provider is None:
+            # Imported here to avoid a circular import with the providers module
+            from services.llm_providers import create_provider
+            self._provider = create_provider(LLMConfig.PROVIDER)
+        return self._provider
+
+    def is_configured(self) -> bool:
+        """Whether the backend can serve calls (e.g. the API key is set)"""
+        return self.provider.is_configured()
+
+    def _route(self, prompt: str, call_site: str, timeout: float = None) -> str:
+        return self.router.choose(call_site, prompt, timeout or LLMConfig.timeout_for(call_site))
+
+    async def generate(self, prompt: str, call_site: str, timeout: float = None, model: str = None) -> str:
+        """
+        Generate a completion for a prompt without blocking the event loop.
+
+        Args:
+            prompt: Full prompt text
+            call_site: One of the LLMCallSite names, used to pick the timeout
+            timeout: Optional override of the per-call-site timeout in seconds
+            model: Optional model override; by default the router picks one
+
+        Returns:
+            str: Response text
+
+        Raises:
+            LLMTimeoutError: If the call takes longer than the timeout
+            CircuitOpenError: If the backend is marked unhealthy
+            LLMOverloadedError: If the dispatch queue is too deep
+        """
+        model = model or self._route(prompt, call_site, timeout)
+        try:
+            self.breaker.check()
+        except CircuitOpenError:
+            llm_metrics.record_call(call_site, model, prompt, None, 0.0, LLMCallOutcome.CIRCUIT_OPEN)
+            raise
+        key = hashlib.sha256(f"{self.provider.name}\0{model}\0{prompt}".encode("utf-8")).hexdigest()
+        return await self.single_flight.do(
+            key, lambda: self._generate(prompt, call_site, model, timeout), group=call_site
+        )
+
+    async def generate_json(self, prompt: str, call_site: str, container: str = '{',
+                            convert: Callable[[Any], Any] = None, require_complete: bool = False,
+                            timeout: float = None) -> Any:
+        """
+        Generate a completion and parse the JSON value it contains.
+
+        Malformed responses are repaired locally first (code fences, trailing
+        commas, output cut off mid-value). Only if the repaired value is still
+        unusable and the response was cut off is a continuation requested, so
+        a bad response costs at most one extra call instead of a fallback.
+
+        Args:
+            prompt: Full prompt text
+            call_site: One of the LLMCallSite names
+            container: '{' for an object response, '[' for an array
+            convert: Turns the parsed value into the result; raising
+                ValueError, KeyError or TypeError marks the value unusable
+            require_complete: Treat a value rebuilt from a cut-off response
+                as unusable even if convert accepts it
+            timeout: Optional override of the per-call-site timeout in seconds
+
+        Returns:
+            The converted value
+
+        Raises:
+            ValueError: If no usable JSON could be recovered
+            LLMTimeoutError, CircuitOpenError, LLMOverloadedError: As for generate()
+        """
+        convert = convert or (lambda value: value)
+        model = self._route(prompt, call_site, timeout)
+        text = await self.generate(prompt, call_site, timeout, model)
+
+        truncated = False
+        try:
+            result = load_json(text, container)
+            truncated = result.truncated
+            if require_complete and truncated:
+                raise JSONRepairError("Response was cut off before the JSON was complete", truncated=True)
+            value = convert(result.value)
+        except JSONRepairError as e:
+            error, truncated = e, e.truncated
+        except (ValueError, KeyError, TypeError) as e:
+            error = e
+        else:
+            llm_metrics.record_parse(call_site, True)
+            self.router.record_parse(call_site, model, True)
+            if result.repaired:
+                llm_metrics.record_repair(call_site, "repaired")
+            return value
+
+        if truncated and LLMConfig.JSON_CONTINUATION:
+            try:
+                value = await self._continue_json(prompt, text, call_site, container, convert, model, timeout)
+                llm_metrics.record_parse(call_site, True)
+                # Salvaged, but at the cost of a second call: count it against the model for routing
+                self.router.record_parse(call_site, model, False)
+                llm_metrics.record_repair(call_site, "continued")
+                return value
+            except Exception as e:
+                error = e
+
+        llm_metrics.record_parse(call_site, False)
+        self.router.record_parse(call_site, model, False)
+        print(f"JSON parsing error ({call_site}): {error}")
+        print(f"Raw response: {text}")
+        raise ValueError(f"No usable JSON in {call_site} response: {error}") from error
+
+    async def _continue_json(self, prompt: str, partial: str, call_site: str, container: str,
+                             convert: Callable[[Any], Any], model: str, timeout: float = None) -> Any:
+        """Ask for the rest of a cut-off JSON response and parse the joined text"""
+        # Continuations are free-form text, so they use their own call site (no JSON mode),
+        # but keep the original call's model, priority and budget
+        with llm_priority(LLMConfig.priority_for(call_site)):
+            continuation = await self.generate(
+                AIPrompts.JSON_CONTINUATION.format(prompt=prompt, partial=partial),
+                LLMCallSite.JSON_CONTINUATION,
+                timeout or LLMConfig.timeout_for(call_site),
+                model
+            )
+        try:
+            result = load_json(partial + continuation, container)
+        except JSONRepairError:
+            # Models sometimes start over instead of continuing
+            result = load_json(continuation, container)
+        if result.truncated:
+            raise JSONRepairError("Continued response was still cut off", truncated=True)
+        return convert(result.value)
+
+    async def _acquire_slot(self, call_site: str, timeout: float) -> int:
+        """Wait for a dispatch slot within the call's budget"""
+        try:
+            return await asyncio.wait_for(
+                self.dispatcher.acquire(LLMConfig.priority_for(call_site)), timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            # Queueing says nothing about backend health, so the breaker is not told
+            raise LLMTimeoutError(f"LLM call '{call_site}' waited over {timeout}s for a dispatch slot")
+
+    @staticmethod
+    def _outcome(error: Exception) -> str:
+        if isinstance(error, LLMTimeoutError):
+            return LLMCallOutcome.TIMEOUT
+        if isinstance(error, CircuitOpenError):
+            return LLMCallOutcome.CIRCUIT_OPEN
+        if isinstance(error, LLMOverloadedError):
+            return LLMCallOutcome.OVERLOADED
+        return LLMCallOutcome.ERROR
+
+    def _record(self, call_site: str, model: str, prompt: str, text: Optional[str], start: float,
+                error: Exception = None, outcome: str = None) -> None:
+        """Record a finished call in the call metrics and the router's latency stats"""
+        elapsed = time.monotonic() - start
+        if outcome is None:
+            outcome = self._outcome(error) if error else LLMCallOutcome.OK
+        llm_metrics.record_call(call_site, model, prompt, text, elapsed, outcome)
+        if outcome in (LLMCallOutcome.OK, LLMCallOutcome.TIMEOUT):
+            self.router.record_latency(call_site, model, elapsed)
+
+    async def _generate(self, prompt: str, call_site: str, model: str, timeout: float = None) -> str:
+        """Make one provider call and record it"""
+        start = time.monotonic()
+        try:
+            text = await self._dispatch(prompt, call_site, model, timeout)
+        except Exception as e:
+            self._record(call_site, model, prompt, None, start, e)
+            raise
+        self._record(call_site, model, prompt, text, start)
+        return text
+
+    async def _dispatch(self, prompt: str, call_site: str, model: str, timeout: float = None) -> str:
+        timeout = timeout or LLMConfig.timeout_for(call_site)
+        deadline = time.monotonic() + timeout
+        ticket = await self._acquire_slot(call_site, timeout)
+        start = time.monotonic()
+
+        try:
+            text = await asyncio.wait_for(
+                self._hedged(prompt, call_site, model, timeout), timeout=max(deadline - start, 0)
+            )
+        except asyncio.TimeoutError:
+            self.breaker.record_failure()
+            raise LLMTimeoutError(f"LLM call '{call_site}' timed out after {timeout}s")
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        finally:
+            self.dispatcher.release(ticket)
+
+        self.breaker.record_success()
+        self.latency.record(call_site, time.monotonic() - start)
+        return text
+
+    def _hedge_delay(self, call_site: str, timeout: float) -> Optional[float]:
+        """Seconds to wait before hedging, or None if this call should not be hedged"""
+        if not LLMConfig.HEDGING_ENABLED:
+            return None
+        delay = self.latency.percentile(call_site, LLMConfig.HEDGE_PERCENTILE, LLMConfig.HEDGE_MIN_SAMPLES)
+        if delay is None or delay >= timeout:
+            return None
+        return delay
+
+    async def _hedged(self, prompt: str, call_site: str, model: str, timeout: float) -> str:
+        """Run the provider call, racing a second request once it passes the hedge delay"""
+        def attempt():
+            return asyncio.ensure_future(self.provider.generate(prompt, call_site, model, timeout))
+
+        primary = attempt()
+        pending = {primary}
+        hedge_ticket = None
+        try:
+            delay = self._hedge_delay(call_site, timeout)
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done and self.breaker.state == CircuitBreaker.CLOSED:
+                    # Hedges only use spare capacity, never a queued caller's slot
+                    hedge_ticket = self.dispatcher.try_acquire(LLMConfig.priority_for(call_site))
+                    if hedge_ticket is not None:
+                        self.hedges_sent += 1
+                        pending.add(attempt())
+
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            if hedge_ticket is not None:
+                self.dispatcher.release(hedge_ticket)
+
+    async def stream(self, prompt: str, call_site: str, timeout: float = None) -> AsyncIterator[str]:
+        """
+        Stream a completion as text chunks without blocking the event loop.
+
+        The timeout applies to the whole stream, not to each chunk.
+
+        Raises:
+            LLMTimeoutError: If the stream does not finish within the timeout
+            CircuitOpenError: If the backend is marked unhealthy
+            LLMOverloadedError: If the dispatch queue is too deep
+        """
+        model = self._route(prompt, call_site, timeout)
+        start = time.monotonic()
+        received = []
+        chunks = self._stream(prompt, call_site, model, timeout)
+        finished, error = False, None
+        try:
+            async for chunk in chunks:
+                received.append(chunk)
+                yield chunk
+            finished = True
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # Also reached when the consumer stops early (a client disconnecting closes
+            # this generator), so the provider stream is closed and the call still counted
+            await chunks.aclose()
+            if finished:
+                self._record(call_site, model, prompt, "".join(received), start)
+            elif error is not None:
+                self._record(call_site, model, prompt, None, start, error)
+            else:
+                self._record(call_site, model, prompt, None, start, outcome=LLMCallOutcome.CANCELLED)
+
+    async def _stream(self, prompt: str, call_site: str, model: str, timeout: float = None) -> AsyncIterator[str]:
+        self.breaker.check()
+        timeout = timeout or LLMConfig.timeout_for(call_site)
+        deadline = time.monotonic() + timeout
+        ticket = await self._acquire_slot(call_site, timeout)
+        chunks = self.provider.stream(prompt, call_site, model, timeout).__aiter__()
+
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining)
+                except StopAsyncIteration:
+                    break
+                yield chunk
+        except asyncio.TimeoutError:
+            self.breaker.record_failure()
+            raise LLMTimeoutError(f"LLM stream '{call_site}' timed out after {timeout}s")
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        finally:
+            self.dispatcher.release(ticket)
+            # A timed-out or abandoned provider stream would otherwise hold its connection open
+            try:
+                await chunks.aclose()
+            except Exception as e:
+                print(f"Closing LLM stream '{call_site}' failed: {e}")
+        self.breaker.record_success()
+
+    def get_stats(self) -> Dict:
+        """Get latency, dispatch queue, routing, hedging and circuit breaker statistics"""
+        return {
+            'circuit_breaker': self.breaker.get_stats(),
+            'routing': self.router.get_stats(),
+            'dispatch': self.dispatcher.get_stats(),
+            'hedging_enabled': LLMConfig.HEDGING_ENABLED,
+            'hedges_sent': self.hedges_sent,
+            'hedges_won': self.hedges_won,
+            'latency': self.latency.get_stats()
+        }
+
+
+# Global LLM service instance
+llm_service = LLMService()
@@ -0,0 +1,102 @@
+"""Process-wide registry of Gemini model handles"""
+import os
+import json
+import threading
+from typing import Dict, Any, Optional, Tuple
+import google.generativeai as genai
+
+
+class ModelRegistry:
+    """
+    Builds Gemini model handles once and reuses them for every call.
+
+    The SDK keeps one client (and its connection pool) per process until
+    genai.configure() is called again, so configuring exactly once here lets
+    every request share the same transport instead of re-handshaking.
+    """
+
+    def __init__(self):
+        self._models: Dict[Tuple[str, str], genai.GenerativeModel] = {}
+        self._lock = threading.Lock()
+        self._configured = False
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def configure(self) -> None:
+        """Configure the Gemini SDK once per process"""
+        if self._configured:
+            return
+
+        with self._lock:
+            if self._configured:
+                return
+            api_key = os.getenv("GEMINI_API_KEY")
+            if not api_key:
+                raise ValueError("GEMINI_API_KEY environment variable is required")
+            genai.configure(api_key=api_key)
+            self._configured = True
+
+    @staticmethod
+    def _make_key(model_name: str, generation_config: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+        config_key = json.dumps(generation_config or {}, sort_keys=True, default=str)
+        return model_name, config_key
+
+    def get_model(self, model_name: str, generation_config: Optional[Dict[str, Any]] = None) -> genai.GenerativeModel:
+        """
+        Get a cached model handle, building it on first use.
+
+        Args:
+            model_name: Gemini model name, e.g. 'gemini-2.0-flash'
+            generation_config: Optional generation config the handle is bound to
+
+        Returns:
+            GenerativeModel: Shared model handle
+        """
+        key = self._make_key(model_name, generation_config)
+        model = self._models.get(key)
+        if model is not None:
+            self.hits += 1
+            return model
+
+        self.configure()
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                model = genai.GenerativeModel(model_name, generation_config=generation_config)
+                self._models[key] = model
+                self.misses += 1
+            else:
+                self.hits += 1
+        return model
+
+    def warm_up(self, model_names, generation_configs=(None,)) -> int:
+        """
+        Build handles for the given models ahead of the first request.
+
+        Args:
+            model_names: Models to build handles for
+            generation_configs: Generation configs to build each model with
+
+        Returns:
+            int: Number of handles available after warm-up
+        """
+        for model_name in model_names:
+            for generation_config in generation_configs:
+                self.get_model(model_name, generation_config)
+        return len(self._models)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics"""
+        total = self.hits + self.misses
+        return {
+            'configured': self._configured,
+            'models': [{'model': name, 'generation_config': json.loads(config)}
+                       for name, config in self._models.keys()],
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0
+        }
+
+
+# Global model registry instance
+model_registry = ModelRegistry()
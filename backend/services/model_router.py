@@ -0,0 +1,205 @@
+"""Picks a Gemini model tier per call from the call site, prompt size and observed latency/parse stats"""
+import os
+import time
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+class ModelRouterConfig:
+    # Route calls across model tiers; off means every call uses the default model
+    ENABLED = os.getenv("LLM_ROUTING_ENABLED", "false").lower() == "true"
+
+    # Tiers from fastest/cheapest to strongest
+    TIERS = [
+        ("light", os.getenv("LLM_MODEL_LIGHT", "gemini-2.0-flash-lite")),
+        ("standard", os.getenv("LLM_MODEL_STANDARD", "gemini-2.0-flash")),
+        ("strong", os.getenv("LLM_MODEL_STRONG", "gemini-2.5-flash")),
+    ]
+
+    # Base tier per call site: "call_site=tier<max_prompt_tokens,tier;..." where
+    # the first tier whose token limit fits the prompt wins and the last has none
+    RULES = os.getenv(
+        "LLM_ROUTING_RULES",
+        "resume_analysis=light;resume_highlights=light;answer_scoring=light;resume_analysis_batch=standard;"
+        "question_generation=light<1400,standard;feedback=standard<1500,strong"
+    )
+    DEFAULT_TIER = os.getenv("LLM_ROUTING_DEFAULT_TIER", "standard")
+
+    # Step down a tier when a tier's recent p95 passes this share of the call's budget
+    LATENCY_FRACTION = float(os.getenv("LLM_ROUTING_LATENCY_FRACTION", "0.8"))
+
+    # Step up a tier when a tier's recent JSON parse failure rate passes this
+    MAX_PARSE_FAILURE_RATE = float(os.getenv("LLM_ROUTING_MAX_PARSE_FAILURE_RATE", "0.2"))
+
+    # Observations needed before stats can move a call off its base tier
+    MIN_SAMPLES = int(os.getenv("LLM_ROUTING_MIN_SAMPLES", "10"))
+
+    # Observations older than this are forgotten, so a tier routed away from
+    # gets retried once its bad stats expire
+    STATS_TTL_SECONDS = float(os.getenv("LLM_ROUTING_STATS_TTL_SECONDS", "600"))
+    WINDOW = 200
+
+
+RoutingRules = Dict[str, List[Tuple[Optional[int], str]]]
+
+
+def parse_routing_rules(value: str, tiers: List[str]) -> RoutingRules:
+    """Parse 'call_site=tier<max_tokens,tier;...' into per-call-site rules, skipping unknown tiers"""
+    rules: RoutingRules = {}
+    for item in value.split(";"):
+        if "=" not in item:
+            continue
+        call_site, spec = (part.strip() for part in item.split("=", 1))
+        entries = []
+        for option in spec.split(","):
+            tier, _, limit = (part.strip() for part in option.partition("<"))
+            if tier not in tiers:
+                continue
+            entries.append((int(limit) if limit.isdigit() else None, tier))
+        if call_site and entries:
+            rules[call_site] = entries
+    return rules
+
+
+class _TierStats:
+    """Recent latency and parse outcomes of one model at one call site"""
+
+    def __init__(self):
+        self.latencies: Deque[Tuple[float, float]] = deque(maxlen=ModelRouterConfig.WINDOW)
+        self.parses: Deque[Tuple[float, bool]] = deque(maxlen=ModelRouterConfig.WINDOW)
+
+    @staticmethod
+    def _recent(samples: Deque, now: float) -> list:
+        cutoff = now - ModelRouterConfig.STATS_TTL_SECONDS
+        return [value for at, value in samples if at >= cutoff]
+
+    def p95(self, now: float) -> Optional[float]:
+        values = sorted(self._recent(self.latencies, now))
+        if len(values) < ModelRouterConfig.MIN_SAMPLES:
+            return None
+        return values[min(len(values) - 1, int(len(values) * 0.95))]
+
+    def parse_failure_rate(self, now: float) -> Optional[float]:
+        values = self._recent(self.parses, now)
+        if len(values) < ModelRouterConfig.MIN_SAMPLES:
+            return None
+        return values.count(False) / len(values)
+
+
+class ModelRouter:
+    """
+    Chooses the model for each LLM call.
+
+    The base tier comes from the routing rules for the call site and the
+    prompt's token count: light models for field extraction and short
+    question sets, stronger ones for long feedback. Observed stats then
+    adjust it by one tier: a tier whose JSON often fails to parse is
+    replaced by the next stronger one, and a tier whose p95 latency is
+    close to the call's budget by the next lighter one (unless that one
+    is failing to parse).
+    """
+
+    def __init__(self, enabled: bool = None, tiers: List[Tuple[str, str]] = None, rules: str = None,
+                 default_model: str = None):
+        self.enabled = ModelRouterConfig.ENABLED if enabled is None else enabled
+        self.tiers = tiers or ModelRouterConfig.TIERS
+        self._tier_names = [name for name, _ in self.tiers]
+        self._models = dict(self.tiers)
+        self.rules = parse_routing_rules(rules if rules is not None else ModelRouterConfig.RULES, self._tier_names)
+        self.default_model = default_model or self._models.get(ModelRouterConfig.DEFAULT_TIER, self.tiers[0][1])
+        self._stats: Dict[Tuple[str, str], _TierStats] = {}
+        self._lock = threading.Lock()
+        # (call_site, model) -> calls routed there
+        self._routed: Dict[Tuple[str, str], int] = {}
+        self.escalated: int = 0
+        self.deescalated: int = 0
+
+    def models(self) -> List[str]:
+        """Every model calls can be routed to"""
+        return list(self._models.values()) if self.enabled else [self.default_model]
+
+    def _base_tier(self, call_site: str, prompt_tokens: int) -> str:
+        default_tier = ModelRouterConfig.DEFAULT_TIER
+        for limit, tier in self.rules.get(call_site, [(None, default_tier)]):
+            if limit is None or prompt_tokens <= limit:
+                return tier
+        return default_tier
+
+    def _tier_stats(self, call_site: str, model: str) -> _TierStats:
+        return self._stats.setdefault((call_site, model), _TierStats())
+
+    def _parse_failing(self, call_site: str, tier: str, now: float) -> bool:
+        rate = self._tier_stats(call_site, self._models[tier]).parse_failure_rate(now)
+        return rate is not None and rate > ModelRouterConfig.MAX_PARSE_FAILURE_RATE
+
+    def choose(self, call_site: str, prompt: str, budget: float) -> str:
+        """
+        Pick the model for a call.
+
+        Args:
+            call_site: LLMCallSite name
+            prompt: Full prompt text
+            budget: The call's latency budget in seconds
+
+        Returns:
+            str: Model name
+        """
+        if not self.enabled:
+            return self.default_model
+
+        # Imported here to avoid a circular import with the prompt compiler
+        from services.prompt_compiler import count_tokens
+
+        tier = self._base_tier(call_site, count_tokens(prompt))
+        index = self._tier_names.index(tier) if tier in self._tier_names else 0
+        now = time.monotonic()
+
+        with self._lock:
+            if self._parse_failing(call_site, tier, now) and index + 1 < len(self._tier_names):
+                index += 1
+                self.escalated += 1
+            elif index > 0:
+                p95 = self._tier_stats(call_site, self._models[tier]).p95(now)
+                lighter = self._tier_names[index - 1]
+                if (p95 is not None and p95 > budget * ModelRouterConfig.LATENCY_FRACTION
+                        and not self._parse_failing(call_site, lighter, now)):
+                    index -= 1
+                    self.deescalated += 1
+
+            model = self._models[self._tier_names[index]]
+            self._routed[(call_site, model)] = self._routed.get((call_site, model), 0) + 1
+        return model
+
+    def record_latency(self, call_site: str, model: str, seconds: float) -> None:
+        """Record how long a call took (timeouts count as the full budget)"""
+        with self._lock:
+            self._tier_stats(call_site, model).latencies.append((time.monotonic(), seconds))
+
+    def record_parse(self, call_site: str, model: str, success: bool) -> None:
+        """Record whether a model's response was usable without a continuation call"""
+        with self._lock:
+            self._tier_stats(call_site, model).parses.append((time.monotonic(), success))
+
+    def get_stats(self) -> Dict:
+        """Get routing decisions and the per-tier stats driving them"""
+        now = time.monotonic()
+        with self._lock:
+            per_model = {}
+            for (call_site, model), stats in self._stats.items():
+                p95 = stats.p95(now)
+                failure_rate = stats.parse_failure_rate(now)
+                per_model.setdefault(call_site, {})[model] = {
+                    'routed': self._routed.get((call_site, model), 0),
+                    'p95_ms': round(p95 * 1000, 1) if p95 is not None else None,
+                    'parse_failure_rate': round(failure_rate, 3) if failure_rate is not None else None
+                }
+            return {
+                'enabled': self.enabled,
+                'tiers': dict(self.tiers),
+                'rules': {site: [f"{tier}<{limit}" if limit else tier for limit, tier in entries]
+                          for site, entries in self.rules.items()},
+                'escalated': self.escalated,
+                'deescalated': self.deescalated,
+                'call_sites': per_model
+            }
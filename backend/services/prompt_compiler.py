@@ -0,0 +1,253 @@
+"""Prompt compilation: local token accounting and per-section budgets"""
+import os
+import re
+import math
+import threading
+from collections import Counter
+from typing import Dict, List
+from services.llm_service import LLMCallSite
+
+
+class PromptCompilerConfig:
+    # Token budget for the variable sections of each prompt (the fixed
+    # instructions in AIPrompts are not counted against it)
+    BUDGETS = {
+        LLMCallSite.QUESTION_GENERATION: int(os.getenv("PROMPT_BUDGET_QUESTIONS", "1200")),
+        LLMCallSite.FEEDBACK: int(os.getenv("PROMPT_BUDGET_FEEDBACK", "3000")),
+        LLMCallSite.RESUME_ANALYSIS: int(os.getenv("PROMPT_BUDGET_RESUME", "3000")),
+        LLMCallSite.RESUME_HIGHLIGHTS: int(os.getenv("PROMPT_BUDGET_RESUME_HIGHLIGHTS", "3000")),
+        LLMCallSite.ANSWER_SCORING: int(os.getenv("PROMPT_BUDGET_ANSWER_SCORING", "800")),
+    }
+    DEFAULT_BUDGET = 2000
+
+    # Raw resume text used as question context when there is no AI summary
+    # (about the 1000 characters the prompt used to slice)
+    RAW_RESUME_MAX_TOKENS = 250
+
+    # Interview questions are short; anything longer is pasted junk
+    QUESTION_MAX_TOKENS = 200
+
+    # Print per-section token usage for every compiled prompt
+    LOG_USAGE = os.getenv("PROMPT_LOG_USAGE", "true").lower() == "true"
+
+    @classmethod
+    def budget_for(cls, call_site: str) -> int:
+        return cls.BUDGETS.get(call_site, cls.DEFAULT_BUDGET)
+
+
+# Words, numbers and single punctuation marks
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our that the this to we will with you your".split()
+)
+
+# Sub-word pieces per long word; close to SentencePiece counts for English prose
+_CHARS_PER_TOKEN = 4
+
+
+def _token_cost(word: str) -> int:
+    return max(1, math.ceil(len(word) / _CHARS_PER_TOKEN))
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the model token count of a text without calling the API"""
+    if not text:
+        return 0
+    return sum(_token_cost(m.group()) for m in _TOKEN_RE.finditer(text))
+
+
+def _truncate_head(text: str, max_tokens: int, marker: str = " ...") -> str:
+    """Keep the first max_tokens tokens, cut at a token boundary and followed by marker"""
+    used = 0
+    for match in _TOKEN_RE.finditer(text):
+        used += _token_cost(match.group())
+        if used > max_tokens:
+            return text[:match.start()].rstrip() + marker
+    return text
+
+
+def _truncate_tail(text: str, max_tokens: int, marker: str = "... ") -> str:
+    """Keep the last max_tokens tokens, cut at a token boundary and preceded by marker"""
+    matches = list(_TOKEN_RE.finditer(text))
+    used = 0
+    for match in reversed(matches):
+        used += _token_cost(match.group())
+        if used > max_tokens:
+            return marker + text[match.end():].lstrip()
+    return text
+
+
+def _extract_sentences(text: str, max_tokens: int) -> str:
+    """
+    Extractive summary: keep the most informative sentences that fit.
+
+    Sentences are scored by the document frequency of their content words,
+    normalized by length, and kept in their original order. The first
+    sentence is always kept since it usually states the role or the point.
+    """
+    sentences = [s.strip() for s in _SENTENCE_RE.split(text) if s.strip()]
+    if len(sentences) <= 1:
+        return _truncate_head(text, max_tokens)
+
+    words = [[w for w in re.findall(r"[a-z0-9+#]+", s.lower()) if w not in _STOPWORDS] for s in sentences]
+    frequency = Counter(w for sentence_words in words for w in sentence_words)
+    costs = [count_tokens(s) for s in sentences]
+    scores = [
+        sum(frequency[w] for w in set(sentence_words)) / math.sqrt(cost or 1)
+        for sentence_words, cost in zip(words, costs)
+    ]
+
+    keep, used = set(), 0
+    for i in [0] + sorted(range(1, len(sentences)), key=lambda i: -scores[i]):
+        if used + costs[i] <= max_tokens:
+            keep.add(i)
+            used += costs[i]
+    if not keep:
+        return _truncate_head(sentences[0], max_tokens)
+    return " ".join(sentences[i] for i in sorted(keep))
+
+
+class PromptSection:
+    """A variable part of a prompt that may be shortened to fit the budget"""
+
+    # Compaction strategies
+    HEAD = "head"              # Keep the beginning
+    HEAD_TAIL = "head_tail"    # Keep the beginning and the end (answers: setup and conclusion)
+    EXTRACTIVE = "extractive"  # Keep the most informative sentences
+
+    def __init__(self, name: str, text: str, priority: int = 1, strategy: str = HEAD,
+                 min_tokens: int = 0, max_tokens: int = None):
+        """
+        Args:
+            name: Label used in usage logs
+            text: Section content
+            priority: Higher priorities are trimmed last; equal priorities share cuts evenly
+            strategy: How to shorten the section (HEAD, HEAD_TAIL or EXTRACTIVE)
+            min_tokens: Never trim the section below this
+            max_tokens: Cap applied even when the prompt is under budget
+        """
+        self.name = name
+        self.text = text or ""
+        self.priority = priority
+        self.strategy = strategy
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.tokens = count_tokens(self.text)
+
+    def compact(self, max_tokens: int) -> str:
+        """Shorten the text to at most max_tokens tokens"""
+        if self.tokens <= max_tokens:
+            return self.text
+        if max_tokens <= 0:
+            return ""
+        if self.strategy == self.EXTRACTIVE:
+            return _extract_sentences(self.text, max_tokens)
+        # Leave room for the "..." marker (three punctuation tokens)
+        if self.strategy == self.HEAD_TAIL:
+            tail = max_tokens // 3
+            # A single marker where the middle was cut
+            head = _truncate_head(self.text, max_tokens - tail - 3, marker="")
+            return head + " ... " + _truncate_tail(self.text, tail, marker="")
+        return _truncate_head(self.text, max_tokens - 3)
+
+
+class PromptCompiler:
+    """
+    Fits the variable sections of a prompt into a per-call-site token budget.
+
+    When the sections are over budget, the lowest priority group is cut
+    first, down to each section's min_tokens, then the next group. Within a
+    group the allowance is shared evenly, so one long answer is cut before
+    several short ones are touched.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.compiled: Dict[str, int] = {}
+        self.compacted: Dict[str, int] = {}
+        self.tokens_in: Dict[str, int] = {}
+        self.tokens_out: Dict[str, int] = {}
+
+    @staticmethod
+    def _fair_share(sections: List[PromptSection], sizes: Dict[str, int], allowance: int) -> Dict[str, int]:
+        """Split an allowance across sections, capping each at its current size (water-filling)"""
+        limits = {}
+        remaining = sorted(sections, key=lambda s: sizes[s.name])
+        while remaining:
+            share = allowance // len(remaining)
+            section = remaining.pop(0)
+            size = sizes[section.name]
+            limits[section.name] = min(size, max(share, section.min_tokens))
+            allowance -= limits[section.name]
+        return limits
+
+    def compile(self, call_site: str, sections: List[PromptSection], budget: int = None) -> Dict[str, str]:
+        """
+        Fit sections into the call site's budget.
+
+        Args:
+            call_site: One of the LLMCallSite names, used to pick the budget
+            sections: Sections with unique names
+            budget: Optional override of the configured budget in tokens
+
+        Returns:
+            Dict mapping section name to its (possibly shortened) text
+        """
+        budget = PromptCompilerConfig.budget_for(call_site) if budget is None else budget
+        limits = {
+            s.name: s.tokens if s.max_tokens is None else min(s.tokens, s.max_tokens)
+            for s in sections
+        }
+
+        overflow = sum(limits.values()) - budget
+        for priority in sorted({s.priority for s in sections}):
+            if overflow <= 0:
+                break
+            group = [s for s in sections if s.priority == priority]
+            current = sum(limits[s.name] for s in group)
+            floor = sum(min(limits[s.name], s.min_tokens) for s in group)
+            target = max(current - overflow, floor)
+            limits.update(self._fair_share(group, limits, target))
+            overflow -= current - sum(limits[s.name] for s in group)
+
+        compiled = {s.name: s.compact(limits[s.name]) for s in sections}
+        self._record(call_site, sections, compiled, budget)
+        return compiled
+
+    def _record(self, call_site: str, sections: List[PromptSection], compiled: Dict[str, str], budget: int) -> None:
+        tokens_in = sum(s.tokens for s in sections)
+        usage = {s.name: (s.tokens, count_tokens(compiled[s.name])) for s in sections}
+        tokens_out = sum(after for _, after in usage.values())
+
+        with self._lock:
+            self.compiled[call_site] = self.compiled.get(call_site, 0) + 1
+            self.tokens_in[call_site] = self.tokens_in.get(call_site, 0) + tokens_in
+            self.tokens_out[call_site] = self.tokens_out.get(call_site, 0) + tokens_out
+            if tokens_out < tokens_in:
+                self.compacted[call_site] = self.compacted.get(call_site, 0) + 1
+
+        if PromptCompilerConfig.LOG_USAGE:
+            parts = ", ".join(
+                f"{name} {before}" if before == after else f"{name} {before}->{after}"
+                for name, (before, after) in usage.items()
+            )
+            print(f"Prompt {call_site}: {tokens_out}/{budget} tokens ({parts})")
+
+    def get_stats(self) -> Dict:
+        """Get per-call-site token accounting"""
+        with self._lock:
+            return {
+                call_site: {
+                    'prompts': count,
+                    'compacted': self.compacted.get(call_site, 0),
+                    'budget': PromptCompilerConfig.budget_for(call_site),
+                    'avg_tokens_in': round(self.tokens_in[call_site] / count),
+                    'avg_tokens_out': round(self.tokens_out[call_site] / count)
+                }
+                for call_site, count in self.compiled.items()
+            }
+
+
+# Global prompt compiler instance
+prompt_compiler = PromptCompiler()
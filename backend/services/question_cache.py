@@ -0,0 +1,193 @@
+"""Content-addressed cache for generated question sets"""
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any
+from models.interview_settings import InterviewSettings, Question
+
+
+class QuestionCacheConfig:
+    # Backend: "memory", "disk" or "off"
+    BACKEND = os.getenv("QUESTION_CACHE_BACKEND", "memory").lower()
+
+    # Entries expire after this many seconds (default: 24 hours)
+    TTL_SECONDS = int(os.getenv("QUESTION_CACHE_TTL", "86400"))
+
+    # Least recently used entries are evicted past this size
+    MAX_ENTRIES = int(os.getenv("QUESTION_CACHE_MAX_ENTRIES", "500"))
+
+    # SQLite file used by the disk backend
+    DISK_PATH = os.getenv("QUESTION_CACHE_PATH", "./question_cache.sqlite3")
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with TTL"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, created_at = entry
+            if time.time() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class DiskCacheBackend:
+    """SQLite-backed LRU cache with TTL, shared across workers on one host"""
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS question_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM question_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM question_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE question_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO question_cache (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM question_cache WHERE key IN ("
+                "SELECT key FROM question_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM question_cache").fetchone()[0]
+
+
+class QuestionCache:
+    """
+    Caches question sets by a hash of everything that shapes the prompt.
+
+    Two requests with the same (normalized) settings and the same resume
+    context produce the same key, so the second one skips the LLM.
+    """
+
+    # Settings that influence the generated questions
+    KEY_FIELDS = (
+        "job_title", "company_name", "job_description", "job_level",
+        "interview_type", "difficulty", "number_of_questions"
+    )
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def _normalize(value: Any) -> Any:
+        if isinstance(value, str):
+            return re.sub(r"\s+", " ", value).strip().lower()
+        return value
+
+    @staticmethod
+    def make_key(settings: InterviewSettings, resume_text: str = None) -> str:
+        """Build the cache key for a question generation request"""
+        payload = {field: QuestionCache._normalize(getattr(settings, field)) for field in QuestionCache.KEY_FIELDS}
+        # Mirror generate_questions: resume context is the AI summary when present
+        if resume_text:
+            payload["resume"] = QuestionCache._normalize(settings.ai_summary or resume_text)
+        encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Question]]:
+        """Get cached questions, or None on a miss"""
+        if not self.enabled:
+            return None
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [Question(**q) for q in json.loads(value)]
+
+    def set(self, key: str, questions: List[Question]) -> None:
+        """Store a generated question set"""
+        if not self.enabled or not questions:
+            return
+        self.backend.set(key, json.dumps([q.dict() for q in questions]))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        total = self.hits + self.misses
+        return {
+            'backend': QuestionCacheConfig.BACKEND if self.enabled else 'off',
+            'entries': self.backend.size() if self.enabled else 0,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0
+        }
+
+
+def _create_backend():
+    if QuestionCacheConfig.BACKEND == "disk":
+        return DiskCacheBackend(
+            QuestionCacheConfig.DISK_PATH,
+            QuestionCacheConfig.MAX_ENTRIES,
+            QuestionCacheConfig.TTL_SECONDS
+        )
+    if QuestionCacheConfig.BACKEND == "memory":
+        return MemoryCacheBackend(QuestionCacheConfig.MAX_ENTRIES, QuestionCacheConfig.TTL_SECONDS)
+    return None
+
+
+# Global question cache instance
+question_cache = QuestionCache(_create_backend())
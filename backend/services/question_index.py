@@ -0,0 +1,286 @@
+"""Local similarity index over previously generated questions"""
+import os
+import re
+import json
+import zlib
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+from models.interview_settings import InterviewSettings, Question
+
+
+class QuestionIndexConfig:
+    # Retrieve stored questions before asking the LLM
+    ENABLED = os.getenv("QUESTION_INDEX_ENABLED", "false").lower() == "true"
+
+    # Directory holding vectors.f32 (memory-mapped) and meta.jsonl
+    DIR = os.getenv("QUESTION_INDEX_DIR", "./question_index")
+
+    # Hashed feature dimensions per vector
+    DIM = int(os.getenv("QUESTION_INDEX_DIM", "1024"))
+
+    # Minimum cosine similarity for a stored question to count as a match
+    MIN_SIMILARITY = float(os.getenv("QUESTION_INDEX_MIN_SIMILARITY", "0.3"))
+
+    # Share of a question set that may come from the index (0.0 - 1.0)
+    MAX_RETRIEVED_FRACTION = float(os.getenv("QUESTION_INDEX_MAX_RETRIEVED_FRACTION", "1.0"))
+
+    # Questions at least this similar to a stored one are not inserted again
+    DUPLICATE_SIMILARITY = 0.95
+
+    # Job description text used for the query vector
+    MAX_QUERY_CHARS = 2000
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+
+
+def vectorize(text: str, dim: int = None) -> np.ndarray:
+    """
+    Embed text as an L2-normalized hashed n-gram vector.
+
+    Features are word unigrams, word bigrams and character trigrams, hashed
+    with CRC32 into `dim` signed buckets. No vocabulary is needed, so new
+    questions can be inserted without refitting anything.
+    """
+    dim = dim or QuestionIndexConfig.DIM
+    vector = np.zeros(dim, dtype=np.float32)
+    words = _TOKEN_RE.findall(text.lower())
+
+    features = list(words)
+    features.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+    for word in words:
+        padded = f"^{word}$"
+        features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+
+    if not features:
+        return vector
+
+    hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint32, count=len(features))
+    buckets = (hashes % dim).astype(np.int64)
+    signs = np.where((hashes >> 31) & 1, -1.0, 1.0).astype(np.float32)
+    np.add.at(vector, buckets, signs)
+
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+class QuestionIndex:
+    """
+    Append-only on-disk index of generated questions.
+
+    Vectors live in a raw float32 file that is memory-mapped for search, and
+    tags (question_type, difficulty, job_title, company) live in a JSON-lines
+    file with one row per vector. Inserts append to both files.
+
+    Only questions generated without candidate, company or job description
+    context are stored, and a row tagged with a company is only ever served
+    to requests for that same company. Rows written before the company tag
+    existed can't be told apart from tailored ones, so they aren't served.
+    """
+
+    def __init__(self, directory: str, dim: int):
+        self.directory = directory
+        self.dim = dim
+        self._vectors_path = os.path.join(directory, "vectors.f32")
+        self._meta_path = os.path.join(directory, "meta.jsonl")
+        self._lock = threading.Lock()
+        self._meta: List[Dict] = []
+        self._vectors: Optional[np.memmap] = None
+        self._type_tags = np.zeros(0, dtype=object)
+        self._difficulty_tags = np.zeros(0, dtype=object)
+        self._company_tags = np.zeros(0, dtype=object)
+        self._loaded = False
+        self.retrievals: int = 0
+        self.retrieved: int = 0
+        self.inserted: int = 0
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                self._meta = [json.loads(line) for line in f if line.strip()]
+
+        row_bytes = self.dim * 4
+        vector_rows = os.path.getsize(self._vectors_path) // row_bytes if os.path.exists(self._vectors_path) else 0
+
+        # A crash between the two appends can leave one file a row ahead
+        rows = min(len(self._meta), vector_rows)
+        if rows < vector_rows:
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(rows * row_bytes)
+        if rows < len(self._meta):
+            self._meta = self._meta[:rows]
+            with open(self._meta_path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(m) + "\n" for m in self._meta)
+
+        self._type_tags = np.array([m["question_type"] for m in self._meta], dtype=object)
+        self._difficulty_tags = np.array([m["difficulty"] for m in self._meta], dtype=object)
+        self._company_tags = np.array([m.get("company") for m in self._meta], dtype=object)
+        self._remap()
+        self._loaded = True
+
+    def _remap(self) -> None:
+        rows = len(self._meta)
+        if rows == 0:
+            self._vectors = None
+            return
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._meta)
+
+    @staticmethod
+    def _normalize_tag(value: str) -> str:
+        return value.strip().lower()
+
+    @staticmethod
+    def _query_text(settings: InterviewSettings) -> str:
+        return f"{settings.job_title} {settings.job_description[:QuestionIndexConfig.MAX_QUERY_CHARS]}"
+
+    @staticmethod
+    def _document_text(question: str, job_title: str) -> str:
+        return f"{job_title} {question}"
+
+    def search(self, query_text: str, question_type: str, difficulty: str, k: int,
+               min_similarity: float = None, company: str = "") -> List[Dict]:
+        """
+        Find the k most similar stored questions with matching tags.
+
+        Only untagged rows and rows tagged with `company` are considered.
+
+        Returns:
+            List of metadata dicts with an added 'similarity' key, best first
+        """
+        min_similarity = QuestionIndexConfig.MIN_SIMILARITY if min_similarity is None else min_similarity
+        with self._lock:
+            self._load()
+            if self._vectors is None or k <= 0:
+                return []
+            vectors = self._vectors
+            mask = (self._type_tags == self._normalize_tag(question_type)) & \
+                   (self._difficulty_tags == self._normalize_tag(difficulty)) & \
+                   ((self._company_tags == "") | (self._company_tags == self._normalize_tag(company)))
+            meta = self._meta
+
+        candidates = np.flatnonzero(mask)
+        if candidates.size == 0:
+            return []
+
+        scores = vectors[candidates] @ vectorize(query_text, self.dim)
+        top = min(k * 2, candidates.size)
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+
+        results, seen = [], set()
+        for position in best:
+            similarity = float(scores[position])
+            if similarity < min_similarity:
+                break
+            entry = meta[candidates[position]]
+            if entry.get("company") not in ("", self._normalize_tag(company)):
+                # The tag mask already excludes these; never serve one company's questions to another
+                continue
+            text = entry["question"].strip().lower()
+            if text in seen:
+                continue
+            seen.add(text)
+            results.append({**entry, "similarity": round(similarity, 4)})
+            if len(results) == k:
+                break
+        return results
+
+    def retrieve(self, settings: InterviewSettings, resume_text: str = None) -> List[Question]:
+        """Get stored questions that fit these settings, up to the configured share of the set"""
+        if not QuestionIndexConfig.ENABLED or settings.interview_type.lower() == "resume":
+            return []
+
+        limit = int(settings.number_of_questions * QuestionIndexConfig.MAX_RETRIEVED_FRACTION)
+        matches = self.search(self._query_text(settings), settings.interview_type, settings.difficulty, limit,
+                              company=settings.company_name)
+        self.retrievals += 1
+        self.retrieved += len(matches)
+
+        return [
+            Question(id=i + 1, question=m["question"],
+                     question_type=settings.interview_type, difficulty=settings.difficulty)
+            for i, m in enumerate(matches)
+        ]
+
+    def add(self, questions: List[Question], settings: InterviewSettings, resume_text: str = None,
+            dedupe: bool = True) -> int:
+        """
+        Insert newly generated questions.
+
+        Questions generated with resume, company or job description context
+        are skipped, since they can mention another candidate's personal
+        details or another user's target company. With dedupe, questions
+        nearly identical to a stored one are skipped too.
+
+        Returns:
+            int: Number of questions inserted
+        """
+        if (not QuestionIndexConfig.ENABLED or resume_text or settings.ai_summary
+                or settings.company_name.strip() or settings.job_description.strip()):
+            return 0
+
+        rows, metas, batch_texts = [], [], set()
+        for question in questions:
+            document = self._document_text(question.question, settings.job_title)
+            text = question.question.strip().lower()
+            if text in batch_texts or dedupe and self.search(
+                document, settings.interview_type, settings.difficulty, 1,
+                min_similarity=QuestionIndexConfig.DUPLICATE_SIMILARITY
+            ):
+                continue
+            batch_texts.add(text)
+            rows.append(vectorize(document, self.dim))
+            metas.append({
+                "question": question.question,
+                "question_type": self._normalize_tag(settings.interview_type),
+                "difficulty": self._normalize_tag(settings.difficulty),
+                "job_title": settings.job_title,
+                "company": self._normalize_tag(settings.company_name),
+                "created_at": datetime.utcnow().isoformat()
+            })
+
+        if not rows:
+            return 0
+
+        with self._lock:
+            self._load()
+            with open(self._vectors_path, "ab") as f:
+                f.write(np.vstack(rows).astype(np.float32).tobytes())
+            with open(self._meta_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(m) + "\n" for m in metas)
+            self._meta.extend(metas)
+            self._type_tags = np.append(self._type_tags, np.array([m["question_type"] for m in metas], dtype=object))
+            self._difficulty_tags = np.append(self._difficulty_tags, np.array([m["difficulty"] for m in metas], dtype=object))
+            self._company_tags = np.append(self._company_tags, np.array([m["company"] for m in metas], dtype=object))
+            self._remap()
+
+        self.inserted += len(rows)
+        return len(rows)
+
+    def get_stats(self) -> Dict:
+        """Get index statistics"""
+        return {
+            'enabled': QuestionIndexConfig.ENABLED,
+            'size': len(self) if QuestionIndexConfig.ENABLED else 0,
+            'dim': self.dim,
+            'retrievals': self.retrievals,
+            'questions_retrieved': self.retrieved,
+            'questions_inserted': self.inserted
+        }
+
+
+# Global question index instance
+question_index = QuestionIndex(QuestionIndexConfig.DIR, QuestionIndexConfig.DIM)
@@ -0,0 +1,178 @@
+"""Pre-generated pool of generic questions with background refill"""
+import os
+import asyncio
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from models.interview_settings import InterviewSettings, Question
+from services.llm_dispatcher import llm_priority, LLMPriority
+
+
+class QuestionPoolConfig:
+    # Serve generic requests (no resume, no job description) from the pool
+    ENABLED = os.getenv("QUESTION_POOL_ENABLED", "false").lower() == "true"
+
+    # Refill starts when a pool drops below the low watermark and stops at the high one
+    LOW_WATERMARK = int(os.getenv("QUESTION_POOL_LOW_WATERMARK", "10"))
+    HIGH_WATERMARK = int(os.getenv("QUESTION_POOL_HIGH_WATERMARK", "30"))
+
+    # Questions requested from the LLM per refill call
+    REFILL_BATCH = int(os.getenv("QUESTION_POOL_REFILL_BATCH", "10"))
+
+    # Combinations filled at startup, e.g. "Technical:Mid-Level:Medium,Behavioral:Entry-Level:Easy";
+    # an optional fourth part fills the pool for a job title ("Technical:Senior:Hard:Backend Engineer")
+    PREWARM = os.getenv("QUESTION_POOL_PREWARM", "")
+
+
+PoolKey = Tuple[str, str, str, str]
+
+
+class QuestionPool:
+    """
+    Keeps ready-made questions per (interview_type, job_level, difficulty,
+    job_title).
+
+    Requests without a resume, job description or company take questions
+    straight from the pool; the job title is part of the key, so questions
+    generated for one role are never served for another. Refills run as background tasks, never on the request
+    path, and an empty pool just means the caller generates live.
+    """
+
+    def __init__(self):
+        self._pools: Dict[PoolKey, Deque[Question]] = {}
+        self._refill_tasks: Dict[PoolKey, asyncio.Task] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+        self.refilled: int = 0
+
+    @staticmethod
+    def _make_key(settings: InterviewSettings) -> PoolKey:
+        return (
+            settings.interview_type.strip().lower(),
+            settings.job_level.strip().lower(),
+            settings.difficulty.strip().lower(),
+            " ".join(settings.job_title.split()).lower()
+        )
+
+    @staticmethod
+    def is_eligible(settings: InterviewSettings, resume_text: str = None) -> bool:
+        """Only requests without candidate- or company-specific context can be served from the pool"""
+        return (
+            QuestionPoolConfig.ENABLED
+            and not resume_text
+            and not settings.ai_summary
+            and not settings.job_description.strip()
+            and not settings.company_name.strip()
+        )
+
+    def take(self, settings: InterviewSettings, resume_text: str = None) -> Optional[List[Question]]:
+        """
+        Take a full question set from the pool.
+
+        Returns:
+            List of questions, or None if the request isn't eligible or the
+            pool doesn't hold enough questions yet
+        """
+        if not self.is_eligible(settings, resume_text):
+            return None
+
+        key = self._make_key(settings)
+        pool = self._pools.setdefault(key, deque())
+        count = settings.number_of_questions
+
+        if len(pool) < count:
+            self.misses += 1
+            self._schedule_refill(key, settings)
+            return None
+
+        questions = []
+        for i in range(count):
+            question = pool.popleft()
+            questions.append(question.copy(update={"id": i + 1}))
+        self.hits += 1
+
+        if len(pool) < QuestionPoolConfig.LOW_WATERMARK:
+            self._schedule_refill(key, settings)
+        return questions
+
+    def prewarm(self, combinations: List[PoolKey]) -> None:
+        """Start filling pools for the given (interview_type, job_level, difficulty, job_title) combinations"""
+        if not QuestionPoolConfig.ENABLED:
+            return
+        for interview_type, job_level, difficulty, job_title in combinations:
+            settings = InterviewSettings(
+                interview_type=interview_type,
+                job_level=job_level,
+                difficulty=difficulty,
+                job_title=job_title
+            )
+            self._schedule_refill(self._make_key(settings), settings)
+
+    def _schedule_refill(self, key: PoolKey, settings: InterviewSettings) -> None:
+        task = self._refill_tasks.get(key)
+        if task and not task.done():
+            return
+        generic_settings = InterviewSettings(
+            job_title=settings.job_title.strip(),
+            job_level=settings.job_level,
+            interview_type=settings.interview_type,
+            difficulty=settings.difficulty,
+            number_of_questions=QuestionPoolConfig.REFILL_BATCH
+        )
+        self._refill_tasks[key] = asyncio.create_task(self._refill(key, generic_settings))
+
+    async def _refill(self, key: PoolKey, settings: InterviewSettings) -> None:
+        # Imported here to avoid a circular import with the AI service
+        from services.gemini_ai_service import GeminiAIService
+
+        pool = self._pools.setdefault(key, deque())
+        while len(pool) < QuestionPoolConfig.HIGH_WATERMARK:
+            try:
+                with llm_priority(LLMPriority.BACKGROUND):
+                    batch = await GeminiAIService._request_questions(settings)
+            except Exception as e:
+                print(f"Question pool refill failed for {key}: {e}")
+                return
+
+            known = {q.question.strip().lower() for q in pool}
+            added = 0
+            for question in batch:
+                text = question.question.strip().lower()
+                if text not in known:
+                    known.add(text)
+                    pool.append(question)
+                    added += 1
+            self.refilled += added
+            if added == 0:
+                # The model is only repeating itself; try again on the next miss
+                return
+
+    def get_stats(self) -> Dict:
+        """Get pool statistics"""
+        return {
+            'enabled': QuestionPoolConfig.ENABLED,
+            'low_watermark': QuestionPoolConfig.LOW_WATERMARK,
+            'high_watermark': QuestionPoolConfig.HIGH_WATERMARK,
+            'pools': {_format_key(key): len(pool) for key, pool in self._pools.items()},
+            'refilling': [_format_key(key) for key, task in self._refill_tasks.items() if not task.done()],
+            'hits': self.hits,
+            'misses': self.misses,
+            'questions_refilled': self.refilled
+        }
+
+
+def _format_key(key: PoolKey) -> str:
+    return ':'.join(part for part in key if part)
+
+
+def parse_prewarm_combinations(value: str) -> List[PoolKey]:
+    """Parse 'Type:Level:Difficulty[:Job Title],...' into pool combinations"""
+    combinations = []
+    for item in value.split(","):
+        parts = [part.strip() for part in item.split(":")]
+        if len(parts) in (3, 4) and all(parts):
+            combinations.append(tuple(parts) if len(parts) == 4 else (*parts, ""))
+    return combinations
+
+
+# Global question pool instance
+question_pool = QuestionPool()
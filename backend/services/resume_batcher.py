@@ -0,0 +1,227 @@
+"""Micro-batching of concurrent resume analyses into multi-document LLM calls"""
+import os
+import re
+import time
+import asyncio
+import itertools
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+from config.prompts import AIPrompts
+from services.llm_service import llm_service, LLMCallSite
+from services.prompt_compiler import prompt_compiler, PromptSection, PromptCompilerConfig
+
+
+class ResumeBatchConfig:
+    # Collect resume analyses that arrive close together into one LLM call
+    ENABLED = os.getenv("RESUME_BATCH_ENABLED", "false").lower() == "true"
+
+    # Most resumes per call
+    MAX_BATCH_SIZE = int(os.getenv("RESUME_BATCH_MAX_SIZE", "8"))
+
+    # How long the first resume in a batch waits for others to join
+    MAX_WAIT_MS = float(os.getenv("RESUME_BATCH_MAX_WAIT_MS", "50"))
+
+    # Recent requests kept per mode for latency/throughput metrics
+    METRICS_WINDOW = 500
+
+
+# Opening or closing <document> tags inside a resume, which could break the batch framing
+_DOCUMENT_TAG_RE = re.compile(r"<(\s*/?\s*document\b)", re.IGNORECASE)
+
+
+def _escape_document(text: str) -> str:
+    """Neutralize document tags in resume text so one resume can't end or open another's block"""
+    return _DOCUMENT_TAG_RE.sub(r"&lt;\1", text)
+
+
+class ResumeBatcher:
+    """
+    Groups resume analyses arriving within a short window into one prompt.
+
+    Each waiting request gets a document id; the model returns a JSON object
+    keyed by those ids and each request is resolved with its own entry.
+    Entries missing from the response are retried as single analyses. If
+    the batched call itself fails, every request in it fails and falls back
+    as it would have alone, rather than multiplying load on a failing
+    backend with per-document retries.
+
+    With batching off, analyses go straight to a single call; both modes
+    record latency and throughput so they can be compared.
+    """
+
+    BATCHED = "batched"
+    DIRECT = "direct"
+
+    def __init__(self, enabled: bool = None, max_batch_size: int = None, max_wait_ms: float = None):
+        self.enabled = ResumeBatchConfig.ENABLED if enabled is None else enabled
+        self.max_batch_size = max(1, max_batch_size or ResumeBatchConfig.MAX_BATCH_SIZE)
+        self.max_wait = (ResumeBatchConfig.MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000
+        self._ids = itertools.count(1)
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._samples = {
+            self.BATCHED: deque(maxlen=ResumeBatchConfig.METRICS_WINDOW),
+            self.DIRECT: deque(maxlen=ResumeBatchConfig.METRICS_WINDOW),
+        }
+        self.llm_calls: int = 0
+        self.batches: int = 0
+        self.batched_documents: int = 0
+        self.split_retries: int = 0
+
+    async def analyze(self, resume_text: str) -> Dict:
+        """
+        Analyze a resume, sharing an LLM call with concurrent requests when enabled.
+
+        Raises:
+            Exception: Whatever the underlying call raised; callers fall back
+        """
+        started = time.monotonic()
+        mode = self.BATCHED if self.enabled and self.max_batch_size > 1 else self.DIRECT
+        try:
+            if mode == self.DIRECT:
+                return await self._analyze_one(resume_text)
+
+            future = asyncio.get_running_loop().create_future()
+            self._pending.append((f"r{next(self._ids)}", resume_text, future))
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = self._spawn(self._flush_after_wait())
+            return await future
+        finally:
+            self._samples[mode].append((started, time.monotonic()))
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _flush_after_wait(self) -> None:
+        await asyncio.sleep(self.max_wait)
+        self._timer = None
+        while self._pending:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Send up to max_batch_size pending analyses as one batch"""
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        if not self._pending and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._spawn(self._run_batch(batch))
+
+    async def _analyze_one(self, resume_text: str) -> Dict:
+        # Imported here to avoid a circular import with the resume service
+        from services.resume_service import ResumeService
+        self.llm_calls += 1
+        return await ResumeService._request_analysis(resume_text)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Dict = None, error: Exception = None) -> None:
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def _run_single(self, resume_text: str, future: asyncio.Future) -> None:
+        try:
+            self._resolve(future, await self._analyze_one(resume_text))
+        except Exception as e:
+            self._resolve(future, error=e)
+
+    async def _run_batch(self, batch: List[Tuple[str, str, asyncio.Future]]) -> None:
+        # Requests whose caller went away no longer need a slot
+        batch = [item for item in batch if not item[2].done()]
+        if not batch:
+            return
+        if len(batch) == 1:
+            await self._run_single(batch[0][1], batch[0][2])
+            return
+
+        try:
+            results = await self._request_batch(batch)
+        except Exception as e:
+            print(f"Batched resume analysis of {len(batch)} resumes failed: {e}")
+            for _, _, future in batch:
+                self._resolve(future, error=e)
+            return
+
+        missing = []
+        for doc_id, resume_text, future in batch:
+            analysis = results.get(doc_id)
+            if isinstance(analysis, dict):
+                self._resolve(future, analysis)
+            else:
+                missing.append((resume_text, future))
+
+        if missing:
+            print(f"Batched resume analysis missed {len(missing)} of {len(batch)} resumes, retrying singly")
+            self.split_retries += len(missing)
+            await asyncio.gather(*[self._run_single(text, future) for text, future in missing])
+
+    async def _request_batch(self, batch: List[Tuple[str, str, asyncio.Future]]) -> Dict:
+        """One LLM call for several resumes; returns the response keyed by document id"""
+        # Each resume gets the same share of the budget a single analysis would
+        sections = prompt_compiler.compile(
+            LLMCallSite.RESUME_ANALYSIS_BATCH,
+            [PromptSection(doc_id, resume_text) for doc_id, resume_text, _ in batch],
+            budget=PromptCompilerConfig.budget_for(LLMCallSite.RESUME_ANALYSIS) * len(batch)
+        )
+        documents = "\n\n".join(
+            f'<document id="{doc_id}">\n{_escape_document(sections[doc_id])}\n</document>' for doc_id, _, _ in batch
+        )
+        prompt = AIPrompts.RESUME_ANALYSIS_BATCH.format(documents=documents)
+
+        self.llm_calls += 1
+        self.batches += 1
+        self.batched_documents += len(batch)
+
+        def to_results(results: Dict) -> Dict:
+            if not isinstance(results, dict):
+                raise ValueError("Batched resume analysis response is not a JSON object")
+            return results
+
+        # Documents lost to a cut-off are retried individually by the caller
+        return await llm_service.generate_json(prompt, LLMCallSite.RESUME_ANALYSIS_BATCH, '{', convert=to_results)
+
+    @staticmethod
+    def _percentile(values: List[float], pct: float) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+    def _mode_stats(self, mode: str) -> Dict:
+        samples = list(self._samples[mode])
+        if not samples:
+            return {'requests': 0}
+        latencies = [(end - start) * 1000 for start, end in samples]
+        span = max(end for _, end in samples) - min(start for start, _ in samples)
+        return {
+            'requests': len(samples),
+            'p50_ms': round(self._percentile(latencies, 50), 1),
+            'p95_ms': round(self._percentile(latencies, 95), 1),
+            'throughput_per_s': round(len(samples) / span, 2) if span > 0 else None
+        }
+
+    def get_stats(self) -> Dict:
+        """Get batching statistics, with latency and throughput per mode"""
+        return {
+            'enabled': self.enabled,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': round(self.max_wait * 1000),
+            'llm_calls': self.llm_calls,
+            'batches': self.batches,
+            'avg_batch_size': round(self.batched_documents / self.batches, 2) if self.batches else 0.0,
+            'split_retries': self.split_retries,
+            'pending': len(self._pending),
+            self.BATCHED: self._mode_stats(self.BATCHED),
+            self.DIRECT: self._mode_stats(self.DIRECT)
+        }
+
+
+# Global resume batcher instance
+resume_batcher = ResumeBatcher()
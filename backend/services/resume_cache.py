@@ -0,0 +1,244 @@
+"""Database cache of resume extraction and analysis, keyed by content hashes"""
+import os
+import re
+import hashlib
+import unicodedata
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from config.prompts import AIPrompts
+from database.config import SessionLocal
+from database.models import ResumeAnalysisCache, ResumeFileCache
+from services.resume_fields import ResumeFieldsConfig
+
+
+class ResumeCacheConfig:
+    # Reuse extraction and analysis for resumes seen before
+    ENABLED = os.getenv("RESUME_CACHE_ENABLED", "true").lower() == "true"
+
+    # Entries expire after this many seconds (default: 30 days)
+    TTL_SECONDS = int(os.getenv("RESUME_CACHE_TTL", str(30 * 86400)))
+
+    # Least recently used analyses are evicted past this count
+    MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "1000"))
+
+    # Bump to drop cached analyses after a change the prompt fingerprint doesn't see
+    PROMPT_VERSION = os.getenv("RESUME_CACHE_PROMPT_VERSION", "2")
+
+
+def normalize_resume_text(text: str) -> str:
+    """Canonical form of extracted text: Unicode-normalized, case-folded, whitespace collapsed"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip().casefold()
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 of the normalized text"""
+    return hashlib.sha256(normalize_resume_text(text).encode("utf-8")).hexdigest()
+
+
+class ResumeCache:
+    """
+    Two-level cache of resume processing results in the database.
+
+    The first level maps the SHA-256 of the uploaded bytes to an analysis,
+    so re-uploading the same file skips parsing as well as the LLM. The
+    second level is keyed on the normalized extracted text, so the same
+    resume exported again (new file bytes, same words) or pasted as text
+    still skips the analysis call. Entries expire after a TTL and the
+    least recently used ones are evicted past MAX_ENTRIES.
+
+    Both keys are scoped to the analysis mode and the analysis prompts, so
+    switching RESUME_ANALYSIS_MODE or editing a prompt misses instead of
+    serving analyses produced the old way.
+
+    Lookups and stores are blocking database calls; call them from async
+    code through asyncio.to_thread.
+    """
+
+    def __init__(self, enabled: bool = None, session_factory=None):
+        self.enabled = ResumeCacheConfig.ENABLED if enabled is None else enabled
+        self._session_factory = session_factory or SessionLocal
+        self._lock = threading.Lock()
+        self.variant = self._variant()
+        self.content_hits: int = 0
+        self.text_hits: int = 0
+        self.misses: int = 0
+        self.stores: int = 0
+        self.evictions: int = 0
+        self.errors: int = 0
+
+    @staticmethod
+    def _variant() -> str:
+        """Fingerprint of what shapes an analysis: the mode, the prompts and the prompt version"""
+        shape = "\0".join([
+            ResumeFieldsConfig.MODE,
+            ResumeCacheConfig.PROMPT_VERSION,
+            AIPrompts.RESUME_ANALYSIS,
+            AIPrompts.RESUME_HIGHLIGHTS
+        ])
+        return hashlib.sha256(shape.encode("utf-8")).hexdigest()[:16]
+
+    def _scoped(self, key: str) -> str:
+        """Scope a content or text hash to the current analysis variant"""
+        return hashlib.sha256(f"{self.variant}:{key}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _expired(entry: ResumeAnalysisCache, now: datetime) -> bool:
+        return now - entry.created_at > timedelta(seconds=ResumeCacheConfig.TTL_SECONDS)
+
+    @staticmethod
+    def _to_result(entry: ResumeAnalysisCache) -> Dict:
+        return {
+            "resume_text": entry.resume_text,
+            "analysis": entry.ai_analysis,
+            "ai_summary": entry.ai_summary
+        }
+
+    def _lookup(self, db, key: str) -> Optional[Dict]:
+        now = datetime.utcnow()
+        entry = db.query(ResumeAnalysisCache).filter(ResumeAnalysisCache.text_hash == key).first()
+        if entry is None:
+            return None
+        if self._expired(entry, now):
+            db.query(ResumeFileCache).filter(ResumeFileCache.text_hash == key).delete()
+            db.delete(entry)
+            db.commit()
+            return None
+        entry.hits = (entry.hits or 0) + 1
+        entry.last_access = now
+        db.commit()
+        return self._to_result(entry)
+
+    def get_by_content(self, content_hash: str) -> Optional[Dict]:
+        """
+        Get the cached result for an uploaded file.
+
+        Args:
+            content_hash: SHA-256 hex digest of the file bytes
+
+        Returns:
+            Optional[Dict]: resume_text, analysis and ai_summary, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        try:
+            with self._lock, self._session_factory() as db:
+                link = db.get(ResumeFileCache, self._scoped(content_hash))
+                result = self._lookup(db, link.text_hash) if link is not None else None
+        except Exception as e:
+            self.errors += 1
+            print(f"Resume cache lookup failed: {e}")
+            return None
+        if result is not None:
+            self.content_hits += 1
+        return result
+
+    def get_by_text(self, resume_text: str, content_hash: str = None) -> Optional[Dict]:
+        """
+        Get the cached result for extracted resume text.
+
+        Args:
+            resume_text: Extracted (or pasted) resume text
+            content_hash: SHA-256 of the uploaded file, linked to the entry on a hit
+                so the next upload of the same file skips extraction too
+
+        Returns:
+            Optional[Dict]: resume_text, analysis and ai_summary, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        key = self._scoped(text_hash(resume_text))
+        try:
+            with self._lock, self._session_factory() as db:
+                result = self._lookup(db, key)
+                file_key = self._scoped(content_hash) if content_hash else None
+                if result is not None and file_key and db.get(ResumeFileCache, file_key) is None:
+                    db.add(ResumeFileCache(content_hash=file_key, text_hash=key))
+                    db.commit()
+        except Exception as e:
+            self.errors += 1
+            print(f"Resume cache lookup failed: {e}")
+            return None
+        if result is None:
+            self.misses += 1
+            return None
+        self.text_hits += 1
+        return result
+
+    def set(self, resume_text: str, analysis: Dict, ai_summary: str, content_hash: str = None) -> None:
+        """
+        Store the processing result for a resume.
+
+        Args:
+            resume_text: Extracted resume text
+            analysis: AI analysis of the text (only store analyses the LLM produced)
+            ai_summary: Summary built from the analysis
+            content_hash: SHA-256 of the uploaded file, if the text came from one
+        """
+        if not self.enabled:
+            return
+        key = self._scoped(text_hash(resume_text))
+        now = datetime.utcnow()
+        try:
+            with self._lock, self._session_factory() as db:
+                entry = db.query(ResumeAnalysisCache).filter(ResumeAnalysisCache.text_hash == key).first()
+                if entry is None:
+                    db.add(ResumeAnalysisCache(
+                        text_hash=key, resume_text=resume_text, ai_analysis=analysis, ai_summary=ai_summary,
+                        hits=0, created_at=now, last_access=now
+                    ))
+                else:
+                    entry.resume_text, entry.ai_analysis, entry.ai_summary = resume_text, analysis, ai_summary
+                    entry.created_at = entry.last_access = now
+                if content_hash:
+                    db.merge(ResumeFileCache(content_hash=self._scoped(content_hash), text_hash=key, created_at=now))
+                db.commit()
+                self._evict(db, now)
+        except Exception as e:
+            self.errors += 1
+            print(f"Resume cache store failed: {e}")
+            return
+        self.stores += 1
+
+    def _evict(self, db, now: datetime) -> None:
+        """Drop expired entries and the least recently used ones past MAX_ENTRIES"""
+        cutoff = now - timedelta(seconds=ResumeCacheConfig.TTL_SECONDS)
+        stale = [key for (key,) in db.query(ResumeAnalysisCache.text_hash)
+                 .filter(ResumeAnalysisCache.created_at < cutoff)]
+        stale += [key for (key,) in db.query(ResumeAnalysisCache.text_hash)
+                  .filter(ResumeAnalysisCache.created_at >= cutoff)
+                  .order_by(ResumeAnalysisCache.last_access.desc())
+                  .offset(ResumeCacheConfig.MAX_ENTRIES)]
+        if not stale:
+            return
+        db.query(ResumeFileCache).filter(ResumeFileCache.text_hash.in_(stale)).delete(synchronize_session=False)
+        db.query(ResumeAnalysisCache).filter(ResumeAnalysisCache.text_hash.in_(stale)).delete(synchronize_session=False)
+        db.commit()
+        self.evictions += len(stale)
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        lookups = self.content_hits + self.text_hits + self.misses
+        entries = None
+        if self.enabled:
+            try:
+                with self._session_factory() as db:
+                    entries = db.query(ResumeAnalysisCache).count()
+            except Exception:
+                pass
+        return {
+            'enabled': self.enabled,
+            'variant': self.variant,
+            'entries': entries,
+            'content_hits': self.content_hits,
+            'text_hits': self.text_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.content_hits + self.text_hits) / lookups, 3) if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'errors': self.errors
+        }
+
+
+# Global resume cache instance
+resume_cache = ResumeCache()
@@ -0,0 +1,405 @@
+"""Resume text extraction in a bounded process pool, off the event loop"""
+import io
+import os
+import mmap
+import time
+import signal
+import asyncio
+import zipfile
+import multiprocessing
+from collections import deque
+from xml.etree import ElementTree
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Deque, Dict, List, Optional, Tuple, Union
+import PyPDF2
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; only the wall-clock timeout applies there
+    resource = None
+
+
+class ResumeExtractionConfig:
+    # Parse uploads in worker processes; off parses inline on the event loop
+    POOL_ENABLED = os.getenv("RESUME_EXTRACTION_POOL_ENABLED", "true").lower() == "true"
+
+    # Worker processes (each parses one document at a time)
+    WORKERS = int(os.getenv("RESUME_EXTRACTION_WORKERS", str(os.cpu_count() or 1)))
+
+    # CPU seconds one document may use before its worker gives up on it
+    CPU_SECONDS = int(os.getenv("RESUME_EXTRACTION_CPU_SECONDS", "10"))
+
+    # Wall-clock limit per document; a worker still busy after this is killed
+    TIMEOUT_SECONDS = float(os.getenv("RESUME_EXTRACTION_TIMEOUT_SECONDS", "20"))
+
+    # PDFs at least this large are split into page ranges parsed by idle workers in parallel
+    PARALLEL_MIN_BYTES = int(os.getenv("RESUME_EXTRACTION_PARALLEL_MIN_BYTES", str(1024 * 1024)))
+
+    # Recent extraction times kept for stats
+    LATENCY_WINDOW = 200
+
+
+class ExtractionTimeoutError(Exception):
+    """Raised when a document takes longer than its CPU or wall-clock budget to parse"""
+
+
+class _BufferReader(io.RawIOBase):
+    """Seekable read-only file over a buffer (bytes, bytearray, memoryview or mmap) that copies only what is read"""
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast('B')
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def readinto(self, target) -> int:
+        chunk = self._view[self._pos:self._pos + len(target)]
+        target[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def readall(self) -> bytes:
+        data = bytes(self._view[self._pos:])
+        self._pos = len(self._view)
+        return data
+
+    def close(self) -> None:
+        # Release the view so an underlying mmap can be closed
+        self._view.release()
+        super().close()
+
+
+def _extract_from_pdf(stream, shard: Tuple[int, int] = (0, 1)) -> str:
+    """Text of the PDF's pages, or of one contiguous shard of them (index, count)"""
+    pages = PyPDF2.PdfReader(stream).pages
+    index, count = shard
+    start, stop = len(pages) * index // count, len(pages) * (index + 1) // count
+    return "\n".join(pages[i].extract_text() or "" for i in range(start, stop))
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def _extract_from_docx(stream, shard: Tuple[int, int] = (0, 1)) -> str:
+    """
+    Paragraphs and table rows of a DOCX body in document order.
+
+    word/document.xml is streamed with iterparse rather than loaded into a
+    full DOM. Each table row becomes one line with its cells separated by
+    " | "; a nested table's rows go into the enclosing cell.
+    """
+    lines: List[str] = []
+    paragraphs: List[List[str]] = []  # Runs of each open paragraph (text boxes nest them)
+    cells: List[List[str]] = []       # Paragraphs of each open table cell
+    rows: List[List[str]] = []        # Cells of each open table row
+
+    with zipfile.ZipFile(stream) as package, package.open("word/document.xml") as document:
+        for event, element in ElementTree.iterparse(document, events=("start", "end")):
+            tag = element.tag
+            if event == "start":
+                if tag == _W + "p":
+                    paragraphs.append([])
+                elif tag == _W + "tc":
+                    cells.append([])
+                elif tag == _W + "tr":
+                    rows.append([])
+                continue
+
+            if tag == _W + "t":
+                if paragraphs:
+                    paragraphs[-1].append(element.text or "")
+            elif tag == _W + "tab":
+                if paragraphs:
+                    paragraphs[-1].append("\t")
+            elif tag in (_W + "br", _W + "cr"):
+                if paragraphs:
+                    paragraphs[-1].append("\n")
+            elif tag == _W + "p":
+                (cells[-1] if cells else lines).append("".join(paragraphs.pop()))
+                element.clear()
+            elif tag == _W + "tc":
+                rows[-1].append(" ".join(text for text in cells.pop() if text))
+            elif tag == _W + "tr":
+                (cells[-1] if cells else lines).append(" | ".join(rows.pop()))
+                element.clear()
+
+    return "\n".join(lines)
+
+def _parser_for(filename: str) -> Optional[Callable]:
+    if filename.lower().endswith('.pdf'):
+        return _extract_from_pdf
+    elif filename.lower().endswith('.docx'):
+        return _extract_from_docx
+    return None
+
+
+DocumentSource = Union[bytes, bytearray, memoryview, str, os.PathLike]
+
+
+def extract_text(source: DocumentSource, filename: str) -> Optional[str]:
+    """
+    Extract text from a PDF or DOCX document.
+
+    The parsers read the document in place: in-memory content through a
+    buffer view, files on disk through a read-only memory map.
+
+    Args:
+        source: Raw file content (any bytes-like object) or the path of a file on disk
+        filename: Original file name; its extension picks the parser
+
+    Returns:
+        Optional[str]: Extracted text, or None for unsupported file types
+
+    Raises:
+        Exception: Whatever the parser raises on a malformed document
+    """
+    text = _extract_shard(source, filename, (0, 1))
+    return text.strip() if text is not None else None
+
+
+def _extract_shard(source: DocumentSource, filename: str, shard: Tuple[int, int]) -> Optional[str]:
+    parser = _parser_for(filename)
+    if parser is None:
+        return None
+    # Buffered so the parsers' many small reads and short seeks stay in C
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with io.BufferedReader(_BufferReader(mapped)) as reader:
+                return parser(reader, shard)
+    if isinstance(source, bytes):
+        # BytesIO shares an immutable bytes object's buffer instead of copying it
+        with io.BytesIO(source) as reader:
+            return parser(reader, shard)
+    with io.BufferedReader(_BufferReader(source)) as reader:
+        return parser(reader, shard)
+
+
+def _source_size(source: DocumentSource) -> int:
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    return memoryview(source).nbytes
+
+
+def extract_text_from_path(file_path: str) -> Optional[str]:
+    """Extract text from a PDF or DOCX file on disk (None for unsupported file types)"""
+    return extract_text(file_path, file_path)
+
+
+def _on_cpu_limit(signum, frame):
+    raise ExtractionTimeoutError("Document exceeded its CPU time budget")
+
+
+def _init_worker() -> None:
+    # SIGXCPU terminates the process by default; raise instead so only the current document fails
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+
+
+def _extract_in_worker(source: DocumentSource, filename: str, shard: Tuple[int, int],
+                       cpu_seconds: int) -> Optional[str]:
+    """Extract one shard of a document with the worker's CPU limit set to the shard's budget"""
+    if resource is None:
+        return _extract_shard(source, filename, shard)
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    # RLIMIT_CPU counts the whole process lifetime, so the budget starts from what is used so far
+    soft = int(usage.ru_utime + usage.ru_stime) + cpu_seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    try:
+        return _extract_shard(source, filename, shard)
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+class ResumeExtractor:
+    """
+    Parses uploaded resumes in a pool of worker processes.
+
+    PDF and DOCX parsing is pure CPU work that would otherwise block the
+    event loop (a 10 MB PDF takes seconds). Each document gets a CPU budget
+    enforced inside its worker with RLIMIT_CPU, and a wall-clock budget
+    enforced here; a worker that blows the wall-clock budget is killed and
+    the pool restarted, so a pathological file can't hold a worker forever.
+    A process pool can't lose one worker without breaking, so documents
+    that were parsing in the replaced pool are retried once in the new one
+    rather than failing with it.
+    At most one document per worker is in the pool at a time; further
+    uploads wait here, where they can still be cancelled. A large PDF
+    arriving while workers are idle is split into page ranges across them.
+    """
+
+    def __init__(self, enabled: bool = None, workers: int = None, cpu_seconds: int = None,
+                 timeout_seconds: float = None, parallel_min_bytes: int = None):
+        self.enabled = ResumeExtractionConfig.POOL_ENABLED if enabled is None else enabled
+        self.workers = max(1, workers or ResumeExtractionConfig.WORKERS)
+        self.cpu_seconds = cpu_seconds or ResumeExtractionConfig.CPU_SECONDS
+        self.timeout_seconds = timeout_seconds or ResumeExtractionConfig.TIMEOUT_SECONDS
+        self.parallel_min_bytes = ResumeExtractionConfig.PARALLEL_MIN_BYTES if parallel_min_bytes is None \
+            else parallel_min_bytes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._latencies: Deque[float] = deque(maxlen=ResumeExtractionConfig.LATENCY_WINDOW)
+        self.extracted: int = 0
+        self.failed: int = 0
+        self.cpu_timeouts: int = 0
+        self.wall_timeouts: int = 0
+        self.pool_restarts: int = 0
+        self.retried: int = 0
+        self.parallel_extractions: int = 0
+
+    def start(self) -> None:
+        """Create the worker pool ahead of the first upload"""
+        if self.enabled and self._pool is None:
+            # Spawned, not forked: the server process has threads and open sockets
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+            # Workers are spawned on demand; a no-op per worker starts them (and their imports) now
+            for _ in range(self.workers):
+                self._pool.submit(os.getpid)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _restart(self, pool: ProcessPoolExecutor) -> None:
+        """Replace the pool a failed document ran in, unless a concurrent failure already replaced it"""
+        if pool is None or pool is not self._pool:
+            return
+        self._pool = None
+        # The executor has no public way to stop a running task, so kill its workers
+        for process in list(getattr(pool, "_processes", {}).values()):
+            process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+        self.pool_restarts += 1
+        self.start()
+
+    async def extract(self, source: DocumentSource, filename: str) -> Optional[str]:
+        """
+        Extract text from an uploaded document without blocking the event loop.
+
+        Args:
+            source: Raw file content, or the path of the spooled upload; a path
+                crosses to the worker without the content being pickled
+            filename: Original file name; its extension picks the parser
+
+        Returns:
+            Optional[str]: Extracted text, or None for unsupported file types
+
+        Raises:
+            ExtractionTimeoutError: If the document exceeded its CPU or wall-clock budget
+            Exception: Whatever the parser raised on a malformed document
+        """
+        if not self.enabled:
+            return extract_text(source, filename)
+
+        if isinstance(source, memoryview):
+            # Views can't be pickled over to the worker; send what they look at
+            source = source.obj if isinstance(source.obj, (bytes, bytearray)) and source.nbytes == len(source.obj) \
+                else source.tobytes()
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+
+        await self._slots.acquire()
+        slots = 1
+        try:
+            # Large PDFs also take whichever workers are idle right now, one page range each;
+            # under load nothing is idle and they parse serially like everything else
+            if filename.lower().endswith('.pdf') and _source_size(source) >= self.parallel_min_bytes:
+                while slots < self.workers and not self._slots.locked():
+                    await self._slots.acquire()
+                    slots += 1
+            return await self._run(source, filename, slots)
+        finally:
+            for _ in range(slots):
+                self._slots.release()
+
+    async def _run(self, source: DocumentSource, filename: str, shards: int, retry: bool = True) -> Optional[str]:
+        self.start()
+        pool = self._pool
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        futures = [
+            loop.run_in_executor(pool, _extract_in_worker, source, filename, (index, shards), self.cpu_seconds)
+            for index in range(shards)
+        ]
+        try:
+            parts = await asyncio.wait_for(asyncio.gather(*futures), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            self.wall_timeouts += 1
+            self._restart(pool)
+            raise ExtractionTimeoutError(
+                f"Document took longer than {self.timeout_seconds:g}s to parse"
+            ) from None
+        except ExtractionTimeoutError:
+            self.cpu_timeouts += 1
+            raise
+        except BrokenProcessPool:
+            if retry and pool is not self._pool:
+                # Another document's timeout replaced the pool mid-parse; this one did nothing wrong
+                self.retried += 1
+                return await self._run(source, filename, shards, retry=False)
+            self.failed += 1
+            self._restart(pool)
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+
+        self._latencies.append(time.monotonic() - start)
+        self.extracted += 1
+        if shards > 1:
+            self.parallel_extractions += 1
+        if parts[0] is None:
+            return None
+        return "\n".join(part for part in parts if part).strip()
+
+    def get_stats(self) -> Dict:
+        """Get extraction pool statistics"""
+        latencies = sorted(self._latencies)
+
+        def percentile(pct: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * pct / 100))] * 1000, 1)
+
+        return {
+            'pool_enabled': self.enabled,
+            'workers': self.workers,
+            'cpu_seconds': self.cpu_seconds,
+            'timeout_seconds': self.timeout_seconds,
+            'extracted': self.extracted,
+            'failed': self.failed,
+            'cpu_timeouts': self.cpu_timeouts,
+            'wall_timeouts': self.wall_timeouts,
+            'pool_restarts': self.pool_restarts,
+            'retried': self.retried,
+            'parallel_extractions': self.parallel_extractions,
+            'p50_ms': percentile(50),
+            'p95_ms': percentile(95)
+        }
+
+
+# Global resume extractor instance
+resume_extractor = ResumeExtractor()
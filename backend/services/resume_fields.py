@@ -0,0 +1,340 @@
+"""Deterministic extraction of resume fields that need no LLM"""
+import os
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from services.skill_taxonomy import skill_matcher
+
+
+class ResumeFieldsConfig:
+    # How resumes are analyzed:
+    #   "llm"    - the LLM extracts every field (locally extracted fields only as a fallback)
+    #   "hybrid" - factual fields are extracted locally and the LLM writes only the
+    #              subjective ones (summary, key strengths, career progression)
+    #   "local"  - no LLM call at all
+    MODE = os.getenv("RESUME_ANALYSIS_MODE", "hybrid").lower()
+
+    # Skip the LLM and serve the local analysis while its queue is shedding load
+    LOCAL_UNDER_LOAD = os.getenv("RESUME_ANALYSIS_LOCAL_UNDER_LOAD", "true").lower() == "true"
+
+    # Most entries kept for list fields read from a section
+    MAX_LIST_ITEMS = 15
+
+    # Most bullet points kept as achievements
+    MAX_ACHIEVEMENTS = 5
+
+
+# Fields that take judgement; in hybrid mode only these come from the LLM
+SUBJECTIVE_FIELDS = ("summary", "key_strengths", "career_progression")
+
+# Canonical section name -> headings that introduce it
+SECTION_HEADINGS: Dict[str, Tuple[str, ...]] = {
+    "summary": ("summary", "professional summary", "profile", "professional profile", "about me",
+                "objective", "career objective", "career summary"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history", "relevant experience"),
+    "education": ("education", "academic background", "education and training", "academics"),
+    "skills": ("skills", "technical skills", "core skills", "key skills", "core competencies",
+               "competencies", "technologies", "tech stack", "tools", "skills and technologies"),
+    "projects": ("projects", "personal projects", "selected projects", "key projects"),
+    "certifications": ("certifications", "certificates", "licenses", "licenses and certifications",
+                       "certifications and licenses"),
+    "languages": ("languages", "spoken languages"),
+    "achievements": ("achievements", "awards", "honors", "honours", "awards and honors", "accomplishments"),
+    "publications": ("publications", "research"),
+    "volunteering": ("volunteer", "volunteering", "volunteer experience"),
+    "interests": ("interests", "hobbies", "hobbies and interests"),
+}
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+_MONTHS = {name: number for number, names in enumerate((
+    ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"), ("may",),
+    ("jun", "june"), ("jul", "july"), ("aug", "august"), ("sep", "sept", "september"),
+    ("oct", "october"), ("nov", "november"), ("dec", "december")
+), start=1) for name in names}
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE_RE = re.compile(r"(?<![\w+])(\+?\d{1,3}[\s.-]?)?(\(?\d{2,4}\)?[\s.-]?)\d{3,4}[\s.-]?\d{3,4}(?![\w])")
+_URL_RE = re.compile(r"(?:https?://|www\.)\S+|\b(?:linkedin|github)\.com/\S+", re.IGNORECASE)
+_BULLET_RE = re.compile(r"^[\s•●▪‣⁃∙\-\*·>]+")
+_LIST_SPLIT_RE = re.compile(r"\s*[,;|•·]\s*|\s+/\s+")
+_CONTACT_SPLIT_RE = re.compile(r"\s*[|•·]\s*|\s{3,}")
+_LOCATION_RE = re.compile(r"^[A-Z][A-Za-z.'\- ]{1,30},\s*[A-Z][A-Za-z.]{1,20}(?: [A-Z][A-Za-z]+)?$")
+_NAME_RE = re.compile(r"^[A-Z][A-Za-z'\-.]+(?: [A-Z][A-Za-z'\-.]*){1,3}$")
+_YEARS_STATED_RE = re.compile(r"(\d{1,2})\+?\s*(?:years?|yrs?)(?:\s+of)?\s+(?:\w+\s+){0,3}?experience", re.IGNORECASE)
+_MONTH_NAMES = "|".join(sorted(_MONTHS, key=len, reverse=True))
+_DATE = rf"(?:(?:{_MONTH_NAMES})\.?\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})"
+_DATE_RANGE_RE = re.compile(
+    rf"\(?\b({_DATE})\s*(?:-|–|—|to|until)\s*({_DATE}|present|current|now|today)\b\)?",
+    re.IGNORECASE
+)
+# Cheap check that a line could hold a date range before running the full pattern
+_YEAR_RE = re.compile(r"\b(?:19|20)\d\d\b")
+_ROLE_SPLIT_RE = re.compile(r"\s+(?:at|@)\s+|\s*[|,–—]\s*|\s+-\s+")
+_DEGREE_RE = re.compile(
+    r"\b(?:ph\.?\s?d|doctorate|master'?s?|m\.?\s?sc|m\.?\s?s\b|m\.?\s?a\b|mba|m\.?\s?eng|bachelor'?s?|b\.?\s?sc|"
+    r"b\.?\s?s\b|b\.?\s?a\b|b\.?\s?eng|b\.?\s?tech|b\.?\s?comm?|associate'?s?|diploma|certificate)",
+    re.IGNORECASE
+)
+_METRIC_RE = re.compile(r"\d+\s*(?:%|x\b|k\b|\+)|\$\s?\d|\b\d{2,}\b")
+_EXECUTIVE_RE = re.compile(r"\b(?:chief|cto|ceo|cfo|coo|vp|vice president|head of|director|founder)\b", re.IGNORECASE)
+
+
+def _clean(line: str) -> str:
+    return _BULLET_RE.sub("", line).strip()
+
+
+def _undated(line: str) -> str:
+    return _DATE_RANGE_RE.sub("", line) if _YEAR_RE.search(line) else line
+
+
+def _heading(line: str) -> Tuple[Optional[str], str]:
+    """The section a line opens, and any text after a 'Heading:' prefix on the same line"""
+    stripped = _clean(line)
+    if len(stripped) > 40 and ":" not in stripped[:40]:
+        return None, ""
+    title, _, rest = stripped.partition(":")
+    key = re.sub(r"[^a-z& ]", "", title.lower()).replace("&", "and")
+    key = re.sub(r"\s+", " ", key).strip()
+    section = _HEADING_LOOKUP.get(key)
+    if section is None:
+        return None, ""
+    # A heading stands alone; "Skills: Python, Go" carries its content inline
+    if rest.strip() or title == stripped or title.isupper():
+        return section, rest.strip()
+    return None, ""
+
+
+def split_sections(text: str) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    Split resume text into sections by their headings.
+
+    Returns:
+        Tuple[List[str], Dict[str, List[str]]]: Lines before the first heading,
+            and the non-empty lines of each canonical section in order
+    """
+    header: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    current = header
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        section, inline = _heading(line)
+        if inline:
+            # "Skills: Python, Go" is a one-line section; the lines after it stay where they were
+            sections.setdefault(section, []).append(inline)
+            continue
+        if section is not None:
+            current = sections.setdefault(section, [])
+            continue
+        current.append(line)
+    return header, sections
+
+
+def _parse_date(value: str, today: date, end: bool) -> Optional[Tuple[int, int]]:
+    value = value.strip().lower().rstrip(".")
+    if value in ("present", "current", "now", "today"):
+        return today.year, today.month
+    if "/" in value:
+        month, year = value.split("/")
+        return int(year), min(max(int(month), 1), 12)
+    parts = value.replace(".", " ").split()
+    if len(parts) == 2:
+        return int(parts[1]), _MONTHS.get(parts[0], 1)
+    # A bare year covers the whole year
+    return int(parts[0]), 12 if end else 1
+
+
+def _date_ranges(lines: List[str], today: date) -> List[Tuple[int, int, str]]:
+    """(start month index, end month index, line) for every date range in the lines"""
+    ranges = []
+    for line in lines:
+        if not _YEAR_RE.search(line):
+            continue
+        for match in _DATE_RANGE_RE.finditer(line):
+            start = _parse_date(match.group(1), today, end=False)
+            finish = _parse_date(match.group(2), today, end=True)
+            if not start or not finish:
+                continue
+            first, last = start[0] * 12 + start[1] - 1, finish[0] * 12 + finish[1] - 1
+            if 1950 * 12 <= first <= last <= today.year * 12 + today.month:
+                ranges.append((first, last, line))
+    return ranges
+
+
+def _months_covered(ranges: List[Tuple[int, int, str]]) -> int:
+    """Months covered by the ranges, counting overlapping jobs once"""
+    total, covered_to = 0, -1
+    for first, last, _ in sorted(ranges):
+        if last <= covered_to:
+            continue
+        total += last - max(first, covered_to + 1) + 1
+        covered_to = last
+    return total
+
+
+def _experience_years(text: str, ranges: List[Tuple[int, int, str]]) -> Optional[int]:
+    stated = [int(years) for years in _YEARS_STATED_RE.findall(text)]
+    if stated:
+        return max(stated)
+    if ranges:
+        return round(_months_covered(ranges) / 12)
+    return None
+
+
+def _experience_level(years: Optional[int], role: Optional[str]) -> Optional[str]:
+    if role and _EXECUTIVE_RE.search(role):
+        return "executive"
+    if years is None:
+        return None
+    return "senior" if years >= 8 else "mid" if years >= 3 else "entry"
+
+
+def _role_and_company(line: str, previous: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Split a dated job line such as 'Engineer at Corp (2019 - present)' into title and company"""
+    text = _clean(_undated(line)).strip(" ,|-()–—")
+    if not text and previous:
+        text = _clean(previous)
+    parts = [part for part in _ROLE_SPLIT_RE.split(text) if part]
+    if not parts:
+        return None, None
+    return parts[0], parts[1] if len(parts) > 1 else None
+
+
+def _list_items(lines: List[str]) -> List[str]:
+    items, seen = [], set()
+    for line in lines:
+        for item in _LIST_SPLIT_RE.split(_clean(line)):
+            item = re.sub(r"\s*\([^)]*\)", "", item).strip(" .")
+            if item and len(item) <= 60 and item.lower() not in seen:
+                seen.add(item.lower())
+                items.append(item)
+    return items[:ResumeFieldsConfig.MAX_LIST_ITEMS]
+
+
+def _unmatched_items(items: List[str], known: List[str]) -> List[str]:
+    """Items with no taxonomy match that aren't already listed"""
+    if not items:
+        return []
+    joined = "\n".join(items)
+    matched, offset = set(), 0
+    bounds = []
+    for item in items:
+        bounds.append((offset, offset + len(item)))
+        offset += len(item) + 1
+    for match in skill_matcher.match(joined):
+        matched.update(index for index, (start, end) in enumerate(bounds)
+                       if match["start"] < end and match["end"] > start)
+    listed = {name.lower() for name in known}
+    return [item for index, item in enumerate(items)
+            if index not in matched and item.lower() not in listed][:ResumeFieldsConfig.MAX_LIST_ITEMS]
+
+
+def _contact(header: List[str], text: str) -> Dict[str, Optional[str]]:
+    email = _EMAIL_RE.search(text)
+    top = header[:6] or text.splitlines()[:6]
+    phone = location = name = None
+    for line in top:
+        if phone is None:
+            match = _PHONE_RE.search(_EMAIL_RE.sub("", _URL_RE.sub("", line)))
+            if match and len(re.sub(r"\D", "", match.group(0))) >= 7:
+                phone = match.group(0).strip()
+        for part in _CONTACT_SPLIT_RE.split(line):
+            part = part.strip()
+            if location is None and _LOCATION_RE.match(part) and not _DATE_RANGE_RE.search(part):
+                location = part
+        if name is None and _NAME_RE.match(line) and not _EMAIL_RE.search(line):
+            name = line
+    return {"name": name, "email": email.group(0) if email else None, "phone": phone, "location": location}
+
+
+def _education(lines: List[str], text: str) -> Optional[str]:
+    for line in lines or text.splitlines():
+        if _DEGREE_RE.search(line):
+            return _clean(_undated(line)).strip(" ,|-()–—") or None
+    return None
+
+
+def _summary(lines: List[str]) -> Optional[str]:
+    text = " ".join(_clean(line) for line in lines)
+    if not text:
+        return None
+    sentences = re.split(r"(?<=[.!?])\s+", text)
+    return " ".join(sentences[:3])
+
+
+def _career_progression(jobs: List[Tuple[int, int, Optional[str], Optional[str]]]) -> Optional[str]:
+    """Titles from the earliest job to the latest, without repeats"""
+    titles: List[str] = []
+    for _, _, role, _ in sorted(jobs, key=lambda job: job[:2]):
+        if role and (not titles or titles[-1] != role):
+            titles.append(role)
+    return " -> ".join(titles) if titles else None
+
+
+def extract_resume_fields(text: str, today: date = None) -> Dict:
+    """
+    Extract the factual fields of a resume analysis with rules instead of an LLM.
+
+    Contact details come from the lines above the first section heading,
+    experience from the date ranges in the experience section (overlapping
+    jobs counted once) unless the resume states its years outright, and the
+    current role from the most recent dated job. Skills and technologies are
+    the skill taxonomy's canonical names found anywhere in the text. Fields
+    that can't be found are None or empty lists; the subjective fields are
+    filled in from the resume's own summary and job titles where possible.
+
+    Args:
+        text: Extracted resume text
+        today: Date "present" resolves to (defaults to today)
+
+    Returns:
+        Dict: Resume analysis with the same keys as the LLM's
+    """
+    today = today or date.today()
+    header, sections = split_sections(text)
+    experience = sections.get("experience") or [
+        # Without an experience heading, any dated line that isn't contact details or a degree
+        line for line in text.splitlines()
+        if line.strip() and not _EMAIL_RE.search(line) and not _DEGREE_RE.search(line)
+    ]
+
+    ranges = _date_ranges(experience, today)
+    lines = [line.strip() for line in experience]
+    jobs = []
+    for first, last, line in ranges:
+        index = lines.index(line.strip())
+        role, company = _role_and_company(line, lines[index - 1] if index > 0 else None)
+        jobs.append((first, last, role, company))
+    latest = max(jobs, key=lambda job: (job[1], job[0]), default=(None, None, None, None))
+    current_role, current_company = latest[2], latest[3]
+
+    years = _experience_years(text, ranges)
+    # Canonical names from the taxonomy, split by category; skills section
+    # entries the taxonomy doesn't know are kept as skills in their own words
+    skills, technologies = skill_matcher.split_categories(skill_matcher.match(text))
+    skills += _unmatched_items(_list_items(sections.get("skills", [])), skills + technologies)
+    achievements = [
+        _clean(line) for line in sections.get("achievements", []) + experience
+        if len(line) > 25 and _METRIC_RE.search(_undated(line))
+    ]
+
+    analysis = _contact(header, text)
+    analysis.update({
+        "summary": _summary(sections.get("summary", [])),
+        "experience_years": years,
+        "current_role": current_role,
+        "current_company": current_company,
+        "education": _education(sections.get("education", []), text),
+        "skills": skills,
+        "technologies": technologies,
+        "industries": [],
+        "achievements": list(dict.fromkeys(achievements))[:ResumeFieldsConfig.MAX_ACHIEVEMENTS],
+        "certifications": _list_items(sections.get("certifications", [])),
+        "languages": _list_items(sections.get("languages", [])),
+        "experience_level": _experience_level(years, current_role),
+        "key_strengths": [],
+        "career_progression": _career_progression(jobs)
+    })
+    return analysis
@@ -1,23 +1,23 @@
-import os
-from typing import Optional, Dict
-import PyPDF2
-from docx import Document
-import io
 import json
-import google.generativeai as genai
+import asyncio
+from typing import Optional, Dict, Tuple
 from config.prompts import AIPrompts
+from services.llm_service import llm_service, LLMCallSite, LLMConfig
+from services.llm_metrics import llm_metrics
+from services.prompt_compiler import prompt_compiler, PromptSection
+from services.resume_batcher import resume_batcher
+from services.resume_cache import resume_cache
+from services.resume_fields import ResumeFieldsConfig, SUBJECTIVE_FIELDS, extract_resume_fields
+from services.resume_extraction import (
+    resume_extractor, extract_text, extract_text_from_path, ExtractionTimeoutError, DocumentSource
+)
 
 class ResumeService:
     @staticmethod
     def extract_text_from_file(file_path: str) -> Optional[str]:
         """Extract text from PDF or DOCX file"""
         try:
-            if file_path.lower().endswith('.pdf'):
-                return ResumeService._extract_from_pdf(file_path)
-            elif file_path.lower().endswith(('.doc', '.docx')):
-                return ResumeService._extract_from_docx(file_path)
-            else:
-                return None
+            return extract_text_from_path(file_path)
         except Exception as e:
             print(f"Error extracting text from file: {e}")
             return None
@@ -26,52 +26,22 @@ class ResumeService:
     def extract_text_from_upload(file_content: bytes, filename: str) -> Optional[str]:
         """Extract text from uploaded file content"""
         try:
-            if filename.lower().endswith('.pdf'):
-                return ResumeService._extract_from_pdf_content(file_content)
-            elif filename.lower().endswith(('.doc', '.docx')):
-                return ResumeService._extract_from_docx_content(file_content)
-            else:
-                return None
+            return extract_text(file_content, filename)
         except Exception as e:
             print(f"Error extracting text from upload: {e}")
             return None
     
     @staticmethod
-    def _extract_from_pdf(file_path: str) -> str:
-        """Extract text from PDF file"""
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        return text.strip()
-    
-    @staticmethod
-    def _extract_from_pdf_content(file_content: bytes) -> str:
-        """Extract text from PDF content"""
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
-    
-    @staticmethod
-    def _extract_from_docx(file_path: str) -> str:
-        """Extract text from DOCX file"""
-        doc = Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text.strip()
-    
-    @staticmethod
-    def _extract_from_docx_content(file_content: bytes) -> str:
-        """Extract text from DOCX content"""
-        doc = Document(io.BytesIO(file_content))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text.strip()
+    async def extract_text_from_upload_async(source: DocumentSource, filename: str) -> Optional[str]:
+        """Extract text from uploaded file content (or its spool file's path) in the extraction worker pool"""
+        try:
+            return await resume_extractor.extract(source, filename)
+        except ExtractionTimeoutError as e:
+            print(f"Resume extraction timed out for {filename}: {e}")
+            return None
+        except Exception as e:
+            print(f"Error extracting text from upload: {e}")
+            return None
     
     @staticmethod
     def summarize_resume(resume_text: str) -> str:
@@ -83,97 +53,160 @@ class ResumeService:
         return resume_text
     
     @staticmethod
-    def analyze_resume_with_ai(resume_text: str) -> Dict:
+    async def _request_analysis(resume_text: str) -> Dict:
+        """Analyze one resume with a single LLM call; raises on failure"""
+        # Contact details and recent roles come first, so very long resumes keep their head
+        sections = prompt_compiler.compile(LLMCallSite.RESUME_ANALYSIS, [
+            PromptSection("resume", resume_text)
+        ])
+        prompt = AIPrompts.RESUME_ANALYSIS.format(resume_text=sections["resume"])
+        
+        def to_analysis(analysis: Dict) -> Dict:
+            if not isinstance(analysis, dict) or not analysis:
+                raise ValueError("Resume analysis response is not a non-empty JSON object")
+            print(f"Resume analysis completed successfully. Keys: {list(analysis.keys())}")
+            return analysis
+        
+        # Fields the model got to before a cut-off are still better than the generic fallback
+        return await llm_service.generate_json(prompt, LLMCallSite.RESUME_ANALYSIS, '{', convert=to_analysis)
+    
+    @staticmethod
+    async def _request_highlights(resume_text: str, fields: Dict) -> Dict:
+        """Ask the LLM for only the subjective fields, given the extracted ones; raises on failure"""
+        sections = prompt_compiler.compile(LLMCallSite.RESUME_HIGHLIGHTS, [
+            PromptSection("resume", resume_text)
+        ])
+        profile = json.dumps({key: value for key, value in fields.items()
+                              if value and key not in SUBJECTIVE_FIELDS})
+        prompt = AIPrompts.RESUME_HIGHLIGHTS.format(profile=profile, resume_text=sections["resume"])
+        
+        def to_highlights(highlights: Dict) -> Dict:
+            if not isinstance(highlights, dict):
+                raise ValueError("Resume highlights response is not a JSON object")
+            return {key: highlights[key] for key in SUBJECTIVE_FIELDS if highlights.get(key)}
+        
+        return await llm_service.generate_json(prompt, LLMCallSite.RESUME_HIGHLIGHTS, '{', convert=to_highlights)
+    
+    @staticmethod
+    async def analyze_resume_with_ai(resume_text: str) -> Dict:
         """Use Gemini AI to analyze and extract key information from resume"""
+        analysis, _ = await ResumeService._analyze(resume_text)
+        return analysis
+    
+    @staticmethod
+    async def _analyze(resume_text: str) -> Tuple[Dict, bool]:
+        """
+        Analyze a resume; returns the analysis and whether the LLM produced it.
+        
+        Factual fields (contact details, experience, education) are always
+        extracted locally. RESUME_ANALYSIS_MODE decides whether the LLM then
+        writes only the subjective fields, redoes every field, or isn't called;
+        while the LLM queue is shedding load the local analysis is served as is.
+        """
+        fields = extract_resume_fields(resume_text)
+        mode = ResumeFieldsConfig.MODE
+        call_site = LLMCallSite.RESUME_ANALYSIS if mode == "llm" else LLMCallSite.RESUME_HIGHLIGHTS
         try:
-            # Configure Gemini API
-            api_key = os.getenv("GEMINI_API_KEY")
-            if not api_key:
-                print("GEMINI_API_KEY not found, using fallback analysis")
-                return ResumeService._get_fallback_analysis(resume_text)
-            
-            genai.configure(api_key=api_key)
-            model = genai.GenerativeModel('gemini-2.0-flash')
+            if mode == "local":
+                return fields, False
             
-            prompt = AIPrompts.RESUME_ANALYSIS.format(resume_text=resume_text)
+            if not llm_service.is_configured():
+                print("LLM backend not configured, using fallback analysis")
+                return ResumeService._get_fallback_analysis(resume_text, fields), False
             
-            print(f"Calling Gemini for resume analysis with prompt length: {len(prompt)}")
-            response = model.generate_content(prompt)
-            response_text = response.text
+            if ResumeFieldsConfig.LOCAL_UNDER_LOAD and llm_service.dispatcher.is_overloaded(
+                    LLMConfig.priority_for(call_site)):
+                print("LLM queue is shedding load, using the local resume analysis")
+                return ResumeService._get_fallback_analysis(resume_text, fields), False
             
-            print(f"Gemini resume analysis response received, length: {len(response_text)}")
+            if mode == "llm":
+                # Concurrent uploads may share one multi-resume call
+                analysis = await resume_batcher.analyze(resume_text)
+                # Fields the model left empty keep what the local extractor found
+                return {**fields, **{key: value for key, value in analysis.items() if value}}, True
             
-            # Try to extract JSON from response
-            try:
-                # Find JSON object in response
-                start_idx = response_text.find('{')
-                end_idx = response_text.rfind('}') + 1
-                
-                if start_idx != -1 and end_idx != -1:
-                    json_text = response_text[start_idx:end_idx]
-                    analysis = json.loads(json_text)
-                    print(f"Resume analysis completed successfully. Keys: {list(analysis.keys())}")
-                    return analysis
-                else:
-                    raise ValueError("No JSON object found in response")
-                    
-            except (json.JSONDecodeError, ValueError) as e:
-                print(f"JSON parsing error in resume analysis: {e}")
-                print(f"Raw response: {response_text}")
-                return ResumeService._get_fallback_analysis(resume_text)
+            fields.update(await ResumeService._request_highlights(resume_text, fields))
+            return fields, True
                 
         except Exception as e:
             print(f"Error in Gemini resume analysis: {e}")
-            return ResumeService._get_fallback_analysis(resume_text)
+            return ResumeService._get_fallback_analysis(resume_text, fields), False
+    
+    @staticmethod
+    async def analyze_and_summarize(resume_text: str, content_hash: str = None) -> Tuple[Dict, str]:
+        """
+        Analyze a resume and build its AI summary, reusing the cached result for text seen before.
+        
+        Args:
+            resume_text: Extracted or pasted resume text
+            content_hash: SHA-256 of the uploaded file the text came from, if any
+        
+        Returns:
+            Tuple[Dict, str]: Analysis and AI summary
+        """
+        cached = await asyncio.to_thread(resume_cache.get_by_text, resume_text, content_hash)
+        if cached:
+            print("Resume text seen before, using cached analysis")
+            return cached["analysis"], cached["ai_summary"]
+        
+        analysis, from_llm = await ResumeService._analyze(resume_text)
+        ai_summary = await ResumeService.generate_resume_summary_for_ai(resume_text, analysis)
+        # Fallback profiles aren't cached, so the next upload of this resume tries the LLM again
+        if from_llm:
+            await asyncio.to_thread(resume_cache.set, resume_text, analysis, ai_summary, content_hash)
+        return analysis, ai_summary
     
     @staticmethod
-    def _get_fallback_analysis(resume_text: str) -> Dict:
-        """Fallback analysis if AI fails"""
-        return {
-            "name": "Candidate",
-            "email": None,
-            "phone": None,
-            "location": None,
-            "summary": "Professional with relevant experience in the field.",
-            "experience_years": 3,
-            "current_role": "Professional",
-            "current_company": "Company",
-            "education": "Degree in relevant field",
-            "skills": ["Problem Solving", "Communication", "Teamwork"],
-            "technologies": ["General Technology"],
-            "industries": ["Technology"],
-            "achievements": ["Professional accomplishments"],
-            "certifications": [],
-            "languages": ["English"],
-            "experience_level": "mid",
-            "key_strengths": ["Adaptability", "Learning", "Collaboration"],
-            "career_progression": "Steady professional growth"
-        }
+    def _get_fallback_analysis(resume_text: str, fields: Dict = None) -> Dict:
+        """Fallback analysis if AI fails: the locally extracted fields"""
+        llm_metrics.record_fallback(LLMCallSite.RESUME_ANALYSIS, "_get_fallback_analysis")
+        return fields if fields is not None else extract_resume_fields(resume_text)
     
     @staticmethod
-    def generate_resume_summary_for_ai(resume_text: str, analysis: Dict = None) -> str:
+    async def generate_resume_summary_for_ai(resume_text: str, analysis: Dict = None) -> str:
         """Generate a comprehensive summary for AI question generation"""
         if not analysis:
-            analysis = ResumeService.analyze_resume_with_ai(resume_text)
-        
-        summary = f"""
-        CANDIDATE PROFILE:
-        Name: {analysis.get('name', 'Candidate')}
-        Experience Level: {analysis.get('experience_level', 'mid')} level
-        Total Experience: {analysis.get('experience_years', 3)} years
-        Current Role: {analysis.get('current_role', 'Professional')} at {analysis.get('current_company', 'Company')}
-        Education: {analysis.get('education', 'Relevant degree')}
+            analysis = await ResumeService.analyze_resume_with_ai(resume_text)
         
-        KEY SKILLS: {', '.join(analysis.get('skills', []))}
-        TECHNOLOGIES: {', '.join(analysis.get('technologies', []))}
-        INDUSTRIES: {', '.join(analysis.get('industries', []))}
+        def known(key: str):
+            """The field's value, or None if the analysis doesn't know it (0 years is known)"""
+            value = analysis.get(key)
+            if isinstance(value, list):
+                value = ', '.join(str(item) for item in value if item is not None and str(item).strip())
+            if isinstance(value, str):
+                value = value.strip()
+            return None if value is None or value == '' else value
         
-        PROFESSIONAL SUMMARY: {analysis.get('summary', 'Experienced professional')}
+        role, company = known('current_role'), known('current_company')
+        if role is not None and company is not None:
+            role, company = f"{role} at {company}", None
+        level = known('experience_level')
+        years = known('experience_years')
         
-        KEY ACHIEVEMENTS: {', '.join(analysis.get('achievements', []))}
-        STRENGTHS: {', '.join(analysis.get('key_strengths', []))}
-        
-        CAREER PROGRESSION: {analysis.get('career_progression', 'Steady professional growth')}
-        """
+        # Fields the analysis doesn't know are left out rather than guessed,
+        # so questions aren't built on a made-up profile
+        groups = [
+            [
+                ("Name", known('name')),
+                ("Experience Level", f"{level} level" if level is not None else None),
+                ("Total Experience", f"{years} years" if years is not None else None),
+                ("Current Role", role),
+                ("Current Company", company),
+                ("Education", known('education')),
+            ],
+            [
+                ("KEY SKILLS", known('skills')),
+                ("TECHNOLOGIES", known('technologies')),
+                ("INDUSTRIES", known('industries')),
+            ],
+            [("PROFESSIONAL SUMMARY", known('summary'))],
+            [
+                ("KEY ACHIEVEMENTS", known('achievements')),
+                ("STRENGTHS", known('key_strengths')),
+            ],
+            [("CAREER PROGRESSION", known('career_progression'))],
+        ]
+        blocks = ["\n".join(f"{label}: {value}" for label, value in group if value is not None) for group in groups]
+        blocks[0] = "CANDIDATE PROFILE:\n" + blocks[0] if blocks[0] else ""
         
-        return summary.strip()
+        return "\n\n".join(block for block in blocks if block)
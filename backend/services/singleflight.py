@@ -0,0 +1,57 @@
+"""Coalescing of identical concurrent calls into one in-flight call"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Lets concurrent callers with the same key share one in-flight call.
+
+    The first caller starts the call; anyone arriving with the same key while
+    it is running awaits the same task instead of starting another one. The
+    shared task is shielded, so one caller disconnecting doesn't cancel the
+    call for the others.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.calls: int = 0
+        self.coalesced: int = 0
+        self.coalesced_by_group: Dict[str, int] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]], group: str = "default") -> Any:
+        """
+        Run fn() once per key at a time and share its result.
+
+        Args:
+            key: Identity of the call, e.g. a hash of the prompt
+            fn: Zero-argument coroutine function that performs the call
+            group: Label the coalesced count is reported under
+        """
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            self.coalesced_by_group[group] = self.coalesced_by_group.get(group, 0) + 1
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(fn())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved when every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics"""
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'coalesced_by_call_site': dict(self.coalesced_by_group),
+            'in_flight': len(self._in_flight)
+        }
@@ -0,0 +1,289 @@
+"""Skill and technology matching against a versioned taxonomy, without the LLM"""
+import os
+import re
+import time
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+class SkillTaxonomyConfig:
+    # Match skills and technologies locally instead of asking the LLM for them
+    ENABLED = os.getenv("SKILL_TAXONOMY_ENABLED", "true").lower() == "true"
+
+    # Taxonomy file (see the header of the default file for its format)
+    PATH = os.getenv(
+        "SKILL_TAXONOMY_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "skill_taxonomy.txt")
+    )
+
+    # Categories reported as technologies ("programming languages and tools" in the
+    # analysis schema); every other category, frameworks and platforms included, is a skill
+    TECHNOLOGY_CATEGORIES = frozenset(["language", "devops", "tool"])
+
+    # Recent scan times kept for the stats
+    LATENCY_WINDOW = 500
+
+
+# Words, plus the punctuation that belongs inside technology names ("c++",
+# "c#", "node.js", ".net", "r&d"); hyphens, slashes and whitespace separate
+_TOKEN_RE = re.compile(r"\.?\w+(?:[+#]+|[.&]\w+)*")
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text)
+
+
+def parse_taxonomy(lines) -> Tuple[Optional[str], List[Tuple[str, str, List[str]]]]:
+    """
+    Parse taxonomy file lines, skipping comments and malformed entries.
+
+    Returns:
+        Tuple[Optional[str], List[Tuple[str, str, List[str]]]]: The version, and
+            (canonical name, category, aliases) for each entry
+    """
+    version = None
+    entries = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.lower().startswith("version:"):
+            version = line.split(":", 1)[1].strip()
+            continue
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) < 2 or not parts[0] or not parts[1]:
+            continue
+        aliases = [alias.strip() for alias in parts[2].split(",")] if len(parts) > 2 else []
+        entries.append((parts[0], parts[1].lower(), [alias for alias in aliases if alias]))
+    return version, entries
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over the taxonomy's names and aliases.
+
+    The taxonomy is compiled once into a trie over word tokens with failure
+    links, so a scan costs one regex tokenization plus one transition per
+    token no matter how many names there are. Several documents are scanned
+    in the same pass, and overlapping names resolve to the leftmost-longest
+    one ("Google Cloud Platform" rather than "Google Cloud").
+    """
+
+    def __init__(self, path: str = None, enabled: bool = None):
+        self.path = path or SkillTaxonomyConfig.PATH
+        self.enabled = SkillTaxonomyConfig.ENABLED if enabled is None else enabled
+        self.version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._compiled = False
+        # (canonical name, category) per taxonomy entry
+        self._entries: List[Tuple[str, str]] = []
+        # Trie: token transitions, failure link and the patterns ending at each node
+        self._goto: List[Dict[str, int]] = []
+        self._fail: List[int] = []
+        # (entry index, token count, exact-case tokens or None) per pattern ending at a node
+        self._out: List[List[Tuple[int, int, Optional[Tuple[str, ...]]]]] = []
+        self._patterns: int = 0
+        self._compile_ms: float = 0.0
+        self._scan_times = deque(maxlen=SkillTaxonomyConfig.LATENCY_WINDOW)
+        self.documents_scanned: int = 0
+        self.load_errors: int = 0
+
+    def load(self) -> bool:
+        """
+        Compile the taxonomy file, once.
+
+        Returns:
+            bool: Whether a taxonomy is compiled and matching is available
+        """
+        if not self.enabled:
+            return False
+        if self._compiled:
+            return True
+        with self._lock:
+            if self._compiled:
+                return True
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    version, entries = parse_taxonomy(file)
+            except OSError as e:
+                # Don't retry on every request; skills then come from the resume's skills section
+                self.load_errors += 1
+                self.enabled = False
+                print(f"Skill taxonomy not loaded from {self.path}, matching disabled: {e}")
+                return False
+            started = time.perf_counter()
+            self._build(entries)
+            self._compile_ms = (time.perf_counter() - started) * 1000
+            self.version = version
+            self._compiled = True
+            print(f"Skill taxonomy {version} compiled: {len(entries)} skills, "
+                  f"{self._patterns} patterns in {self._compile_ms:.1f} ms")
+            return True
+
+    def _build(self, entries: List[Tuple[str, str, List[str]]]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[Tuple[int, int, Optional[Tuple[str, ...]]]]] = [[]]
+        patterns = 0
+        for index, (name, category, aliases) in enumerate(entries):
+            self._entries.append((name, category))
+            variants = {}
+            for alias in aliases:
+                exact = alias.startswith("=")
+                tokens = tuple(_tokens(alias[1:] if exact else alias))
+                if tokens:
+                    variants.setdefault((tuple(t.lower() for t in tokens), tokens if exact else None), None)
+            # The canonical name matches in any case, unless it is listed as an exact-case alias
+            exact_names = {key for key, exact in variants if exact is not None}
+            name_key = tuple(t.lower() for t in _tokens(name))
+            if name_key and name_key not in exact_names:
+                variants.setdefault((name_key, None), None)
+
+            for key, exact in variants:
+                node = 0
+                for token in key:
+                    node = goto[node].setdefault(token, len(goto))
+                    if node == len(goto):
+                        goto.append({})
+                        out.append([])
+                out[node].append((index, len(key), exact))
+                patterns += 1
+
+        # Breadth-first failure links; each node also reports what its failure node reports
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and token not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(token, 0)
+                out[child] = out[child] + out[fail[child]]
+
+        self._goto, self._fail, self._out, self._patterns = goto, fail, out, patterns
+
+    def match_documents(self, documents: Dict[str, str]) -> Dict[str, List[Dict]]:
+        """
+        Find taxonomy skills in several documents in one pass.
+
+        Args:
+            documents: Text per document name (e.g. "resume" and "job_description")
+
+        Returns:
+            Dict[str, List[Dict]]: Per document, non-overlapping matches in text
+                order, each with the canonical "skill", its "category", and the
+                "start"/"end" character offsets of the matched text
+        """
+        results: Dict[str, List[Dict]] = {name: [] for name in documents}
+        if not self.load():
+            return results
+        started = time.perf_counter()
+        goto, fail, out, entries = self._goto, self._fail, self._out, self._entries
+        for name, text in documents.items():
+            if not text:
+                continue
+            tokens = list(_TOKEN_RE.finditer(text))
+            found = []
+            state = 0
+            for position, match in enumerate(tokens):
+                token = match.group().lower()
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+                for index, length, exact in out[state]:
+                    first = position - length + 1
+                    if exact is not None and tuple(m.group() for m in tokens[first:position + 1]) != exact:
+                        continue
+                    found.append((first, -length, index))
+
+            # Leftmost-longest, without overlaps
+            covered_to = -1
+            for first, negative_length, index in sorted(found):
+                if first <= covered_to:
+                    continue
+                last = first - negative_length - 1
+                covered_to = last
+                skill, category = entries[index]
+                results[name].append({
+                    "skill": skill,
+                    "category": category,
+                    "start": tokens[first].start(),
+                    "end": tokens[last].end()
+                })
+        self.documents_scanned += len(documents)
+        self._scan_times.append((time.perf_counter() - started) * 1000)
+        return results
+
+    def match(self, text: str) -> List[Dict]:
+        """Find taxonomy skills in one text (see match_documents)"""
+        return self.match_documents({"text": text})["text"]
+
+    @staticmethod
+    def canonical_skills(matches: List[Dict]) -> List[str]:
+        """Distinct canonical names in order of first mention"""
+        return list(dict.fromkeys(match["skill"] for match in matches))
+
+    @staticmethod
+    def split_categories(matches: List[Dict]) -> Tuple[List[str], List[str]]:
+        """
+        Split matches into the analysis' skills and technologies.
+
+        Returns:
+            Tuple[List[str], List[str]]: Distinct skills and technologies, in order of first mention
+        """
+        skills = SkillMatcher.canonical_skills(
+            [m for m in matches if m["category"] not in SkillTaxonomyConfig.TECHNOLOGY_CATEGORIES])
+        technologies = SkillMatcher.canonical_skills(
+            [m for m in matches if m["category"] in SkillTaxonomyConfig.TECHNOLOGY_CATEGORIES])
+        return skills, technologies
+
+    def keyword_overlap(self, resume_text: str, job_description: str) -> Dict:
+        """
+        Compare the skills a job description asks for with those on a resume.
+
+        Args:
+            resume_text: Resume text (or its AI summary)
+            job_description: InterviewSettings.job_description
+
+        Returns:
+            Dict: "matched" (in both), "missing" (job description only) and
+                "additional" (resume only) canonical skills, "coverage" (share of
+                the job description's skills on the resume, None without any)
+                and the taxonomy "version"
+        """
+        matches = self.match_documents({"resume": resume_text, "job_description": job_description})
+        resume_skills = self.canonical_skills(matches["resume"])
+        job_skills = self.canonical_skills(matches["job_description"])
+        on_resume = set(resume_skills)
+        wanted = set(job_skills)
+        matched = [skill for skill in job_skills if skill in on_resume]
+        return {
+            "matched": matched,
+            "missing": [skill for skill in job_skills if skill not in on_resume],
+            "additional": [skill for skill in resume_skills if skill not in wanted],
+            "coverage": round(len(matched) / len(job_skills), 3) if job_skills else None,
+            "version": self.version
+        }
+
+    def get_stats(self) -> Dict:
+        """Get taxonomy size, compile time and scan latency"""
+        times = sorted(self._scan_times)
+        return {
+            'enabled': self.enabled,
+            'compiled': self._compiled,
+            'version': self.version,
+            'skills': len(self._entries),
+            'patterns': self._patterns,
+            'trie_nodes': len(self._goto),
+            'compile_ms': round(self._compile_ms, 1),
+            'documents_scanned': self.documents_scanned,
+            'scan_p50_ms': round(times[len(times) // 2], 3) if times else None,
+            'scan_p95_ms': round(times[min(len(times) - 1, int(len(times) * 0.95))], 3) if times else None,
+            'load_errors': self.load_errors
+        }
+
+
+# Global skill matcher instance (compiled at startup)
+skill_matcher = SkillMatcher()
@@ -108,15 +108,14 @@ export default function UploadForm() {
       // Validate file type before processing
       const allowedTypes = [
         'application/pdf',
-        'application/vnd.openxmlformats-officedocument.wordprocessingml.document', // .docx
-        'application/msword' // .doc
+        'application/vnd.openxmlformats-officedocument.wordprocessingml.document' // .docx
       ];
-      const allowedExtensions = ['.pdf', '.doc', '.docx'];
+      const allowedExtensions = ['.pdf', '.docx'];
       const fileExtension = file.name.toLowerCase().substring(file.name.lastIndexOf('.'));
       
       // Check file extension and MIME type
       if (!allowedExtensions.includes(fileExtension) || !allowedTypes.includes(file.type)) {
-        alert('❌ Invalid file type!\n\nOnly PDF, DOC, and DOCX files are allowed.\n\nPlease select a valid resume file.');
+        alert('❌ Invalid file type!\n\nOnly PDF and DOCX files are allowed.\n\nPlease select a valid resume file.');
         e.target.value = ''; // Clear the file input
         return;
       }
@@ -230,15 +229,14 @@ export default function UploadForm() {
       // Validate file type before processing
       const allowedTypes = [
         'application/pdf',
-        'application/vnd.openxmlformats-officedocument.wordprocessingml.document', // .docx
-        'application/msword' // .doc
+        'application/vnd.openxmlformats-officedocument.wordprocessingml.document' // .docx
       ];
-      const allowedExtensions = ['.pdf', '.doc', '.docx'];
+      const allowedExtensions = ['.pdf', '.docx'];
       const fileExtension = file.name.toLowerCase().substring(file.name.lastIndexOf('.'));
       
       // Check file extension and MIME type
       if (!allowedExtensions.includes(fileExtension) || !allowedTypes.includes(file.type)) {
-        alert('❌ Invalid file type!\n\nOnly PDF, DOC, and DOCX files are allowed.\n\nPlease drop a valid resume file.');
+        alert('❌ Invalid file type!\n\nOnly PDF and DOCX files are allowed.\n\nPlease drop a valid resume file.');
         return;
       }
       
@@ -349,7 +347,7 @@ export default function UploadForm() {
                   <input
                     ref={fileInputRef}
                     type="file"
-                    accept=".pdf,.doc,.docx"
+                    accept=".pdf,.docx"
                     onChange={handleFileChange}
                     className="hidden"
                     id="resume-upload"
@@ -420,7 +418,7 @@ export default function UploadForm() {
                         <p className="text-lg font-semibold text-slate-900">
                           Drop your resume here or browse
                         </p>
-                        <p className="text-slate-600">PDF, DOC, or DOCX files up to 10MB</p>
+                        <p className="text-slate-600">PDF or DOCX files up to 10MB</p>
                       </div>
                     </div>
                   )}